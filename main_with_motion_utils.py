@@ -15,6 +15,9 @@ from PIL import Image, ImageTk
 # Import from our nutflix_common package
 from nutflix_common.config_loader import load_config
 from nutflix_common.motion_utils import MotionDetector, MotionConfig
+from nutflix_common.motion_engine import MultiprocessMotionEngine
+from nutflix_common.event_store import MotionEventStore
+from nutflix_common.clip_recorder import ClipRecorder
 from nutflix_common.logger import get_logger, configure_from_config
 from camera_manager import CameraManager
 
@@ -97,15 +100,58 @@ class NutflixLiteGUI:
             self.camera_manager = None
 
         # Initialize Motion Detector with config
-        motion_config = MotionConfig(
-            threshold=self.motion_config_dict.get('threshold', 500),
-            sensitivity=self.motion_config_dict.get('sensitivity', 25),
-            cooldown=self.motion_config_dict.get('cooldown', 2.0)
-        )
-        self.motion_detector = MotionDetector(motion_config)
+        motion_config = MotionConfig.from_dict(self.motion_config_dict)
+        
+        # Persist motion events to SQLite if configured
+        self.event_store = None
+        event_store_config = self.config.get('event_store', {})
+        if event_store_config.get('path'):
+            try:
+                self.event_store = MotionEventStore(
+                    event_store_config['path'],
+                    batch_size=event_store_config.get('batch_size', 100),
+                    flush_interval=event_store_config.get('flush_interval', 2.0)
+                )
+                self.log(f"Motion events stored in {event_store_config['path']}")
+            except Exception as e:
+                self.log(f"❌ Event store unavailable: {e}")
+                self.logger.error(f"Event store initialization failed: {e}")
+        
+        self.motion_detector = MotionDetector(motion_config, event_sink=self.event_store)
         self.log(f"Motion detector initialized: threshold={motion_config.threshold}, cooldown={motion_config.cooldown}s")
         self.logger.info(f"Motion detector configured: threshold={motion_config.threshold}, cooldown={motion_config.cooldown}s")
 
+        # Optionally run detection in one worker process per camera
+        self.motion_engine = None
+        self._engine_stats = {}
+        engine_config = self.config.get('motion_engine', {})
+        if engine_config.get('enabled'):
+            try:
+                self.motion_engine = MultiprocessMotionEngine(
+                    motion_config, slots_per_camera=engine_config.get('slots_per_camera', 2)
+                )
+                self.log("Motion detection running in per-camera worker processes")
+            except Exception as e:
+                self.log(f"❌ Multiprocess motion engine unavailable: {e}")
+                self.logger.error(f"Motion engine initialization failed: {e}")
+
+        # Optionally record motion clips with a few seconds of pre-roll
+        self.clip_recorder = None
+        recorder_config = self.config.get('clip_recorder', {})
+        if recorder_config.get('output_dir'):
+            try:
+                self.clip_recorder = ClipRecorder(
+                    recorder_config['output_dir'],
+                    pre_roll_seconds=recorder_config.get('pre_roll_seconds', 3.0),
+                    post_roll_seconds=recorder_config.get('post_roll_seconds', 5.0),
+                    fps=recorder_config.get('fps', 15.0)
+                )
+                self.motion_detector.subscribe(self.clip_recorder.on_motion_event, name="clip_recorder")
+                self.log(f"Motion clips saved to {recorder_config['output_dir']}")
+            except Exception as e:
+                self.log(f"❌ Clip recorder unavailable: {e}")
+                self.logger.error(f"Clip recorder initialization failed: {e}")
+
         self.running = True
         self.update_video()
 
@@ -149,26 +195,46 @@ class NutflixLiteGUI:
 
         # Get frames from both cameras
         frames = self.camera_manager.read_frames()
+        if self.clip_recorder:
+            self.clip_recorder.add_frames(frames)
         critter_frame = frames['critter_cam']
         nut_frame = frames['nut_cam']
 
+        # Run motion detection for both cameras in parallel
+        if self.motion_engine:
+            motion_results = self._poll_motion_engine(frames)
+        else:
+            motion_results = self.motion_detector.process_frames(frames)
+
         # Process CritterCam
         if critter_frame is not None:
-            motion_detected = self.motion_detector.process_frame(critter_frame, "critter_cam")
-            if motion_detected:
+            if motion_results['critter_cam']:
                 self.log_motion_event("CritterCam")
             self.display_frame(critter_frame, self.critter_canvas)
 
         # Process NutCam  
         if nut_frame is not None:
-            motion_detected = self.motion_detector.process_frame(nut_frame, "nut_cam")
-            if motion_detected:
+            if motion_results['nut_cam']:
                 self.log_motion_event("NutCam")
             self.display_frame(nut_frame, self.nut_canvas)
 
         if self.running:
             self.root.after(30, self.update_video)
 
+    def _poll_motion_engine(self, frames):
+        """Hand frames to the worker processes and collect whatever results are ready."""
+        self.motion_engine.submit_frames(frames)
+        motion_results = {camera_id: False for camera_id in frames}
+        for result in self.motion_engine.get_results():
+            if result.motion_detected:
+                motion_results[result.camera_id] = True
+                self._engine_stats[result.camera_id] = result.stats
+                if self.clip_recorder:
+                    self.clip_recorder.on_motion_event(result.event)
+                if self.event_store:
+                    self.event_store.write(result.event)
+        return motion_results
+
     def display_frame(self, frame, canvas):
         resized = cv2.resize(frame, (640, 360))
         rgb = cv2.cvtColor(resized, cv2.COLOR_BGR2RGB)
@@ -180,7 +246,10 @@ class NutflixLiteGUI:
     def log_motion_event(self, camera_name):
         """Log a motion detection event with additional stats."""
         camera_id = "critter_cam" if camera_name == "CritterCam" else "nut_cam"
-        stats = self.motion_detector.get_camera_stats(camera_id)
+        if self.motion_engine:
+            stats = self._engine_stats[camera_id]
+        else:
+            stats = self.motion_detector.get_camera_stats(camera_id)
         
         self.log(f"🔴 MOTION DETECTED in {camera_name}! "
                 f"(Events: {stats['motion_events_count']}, "
@@ -201,12 +270,22 @@ class NutflixLiteGUI:
         
         # Log final motion detection stats
         for camera_id in ["critter_cam", "nut_cam"]:
-            stats = self.motion_detector.get_camera_stats(camera_id)
-            if stats['frames_processed'] > 0:
+            if self.motion_engine:
+                stats = self.motion_engine.get_camera_stats(camera_id)
+            else:
+                stats = self.motion_detector.get_camera_stats(camera_id)
+            if stats.get('frames_processed', 0) > 0:
                 self.log(f"Final stats for {camera_id}: "
                         f"{stats['frames_processed']} frames, "
                         f"{stats['motion_events_count']} motion events")
         
+        self.motion_detector.close()
+        if self.motion_engine:
+            self.motion_engine.close()
+        if self.clip_recorder:
+            self.clip_recorder.close()
+        if self.event_store:
+            self.event_store.close()
         self.root.quit()
 
 if __name__ == "__main__":
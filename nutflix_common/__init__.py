@@ -10,7 +10,7 @@ __author__ = "Nutflix Team"
 from .config_loader import load_config
 from .motion_utils import MotionDetector, MotionConfig, create_motion_detector
 from .logger import get_logger, get_motion_logger, get_camera_logger, get_ai_logger
-from .ai_utils import ImageClassifier, load_model, classify_frame
+from .ai_utils import ImageClassifier, load_model, classify_frame, classify_batch, classify_regions
 
 __all__ = [
     'load_config', 
@@ -23,5 +23,7 @@ __all__ = [
     'get_ai_logger',
     'ImageClassifier',
     'load_model',
-    'classify_frame'
+    'classify_frame',
+    'classify_batch',
+    'classify_regions'
 ]
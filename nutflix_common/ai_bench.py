@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Classifier Benchmark for Nutflix Common
+Compares FP32 and INT8 MobileNetV2 latency and top-1 agreement on recorded clips,
+and the fused cv2/NumPy preprocessing against the torchvision PIL chain
+
+Example:
+    nutflix-ai-bench --clips sample_clips --frames 100 --calibration 64 --output ai_bench.json
+    nutflix-ai-bench --preprocess-only
+"""
+
+import argparse
+import json
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from .ai_utils import (IMAGENET_MEAN, IMAGENET_STD, INPUT_SIZE, TORCH_AVAILABLE, FramePreprocessor,
+                       ImageClassifier, load_calibration_frames)
+from .bench import environment_info, synthetic_frames
+from .logger import set_global_log_level
+
+
+def top1_agreement(a: Sequence[List[Tuple[str, float]]], b: Sequence[List[Tuple[str, float]]]) -> float:
+    """Fraction of items whose top-1 label is the same in both result lists."""
+    if not a:
+        return 0.0
+    return sum(x[0][0] == y[0][0] for x, y in zip(a, b)) / len(a)
+
+
+def _reference_chain() -> Tuple[Optional[Callable[[np.ndarray], np.ndarray]], Optional[str]]:
+    """
+    Build the per-frame PIL preprocessing the classifier used before FramePreprocessor.
+
+    Returns:
+        (function mapping a BGR frame to a (3, 224, 224) array, name), or (None, None) without Pillow
+    """
+    if TORCH_AVAILABLE:
+        import torchvision.transforms as transforms
+        chain = transforms.Compose([
+            transforms.ToPILImage(),
+            transforms.Resize(INPUT_SIZE),
+            transforms.CenterCrop(INPUT_SIZE),
+            transforms.ToTensor(),
+            transforms.Normalize(mean=IMAGENET_MEAN.tolist(), std=IMAGENET_STD.tolist())
+        ])
+        return lambda frame: chain(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)).numpy(), "torchvision"
+
+    try:
+        from PIL import Image
+    except ImportError:
+        return None, None
+
+    mean = IMAGENET_MEAN[:, None, None]
+    std = IMAGENET_STD[:, None, None]
+
+    def pillow_chain(frame: np.ndarray) -> np.ndarray:
+        # The same steps as the torchvision transforms, written with Pillow
+        image = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        width, height = image.size
+        if width <= height:
+            size = (INPUT_SIZE, int(INPUT_SIZE * height / width))
+        else:
+            size = (int(INPUT_SIZE * width / height), INPUT_SIZE)
+        image = image.resize(size, Image.BILINEAR)
+        left = int(round((size[0] - INPUT_SIZE) / 2.0))
+        top = int(round((size[1] - INPUT_SIZE) / 2.0))
+        image = image.crop((left, top, left + INPUT_SIZE, top + INPUT_SIZE))
+        tensor = np.asarray(image, dtype=np.float32).transpose(2, 0, 1) / 255.0
+        return (tensor - mean) / std
+
+    return pillow_chain, "pillow"
+
+
+def compare_preprocessing(frames: Sequence[np.ndarray], batch_size: int = 8,
+                          repeats: int = 3) -> Dict[str, Any]:
+    """
+    Time FramePreprocessor against the PIL chain on the same frames.
+
+    Args:
+        frames: BGR frames
+        batch_size: Frames per FramePreprocessor call
+        repeats: Passes over the frames; the fastest pass is reported
+
+    Returns:
+        Dictionary with ms per frame for each path, speedup and output differences
+    """
+    preprocessor = FramePreprocessor()
+    fused_seconds = []
+    for _ in range(repeats):
+        begin = time.perf_counter()
+        for start in range(0, len(frames), batch_size):
+            preprocessor(frames[start:start + batch_size])
+        fused_seconds.append(time.perf_counter() - begin)
+
+    report: Dict[str, Any] = {
+        'frames': len(frames),
+        'fused_ms_per_frame': round(1000 * min(fused_seconds) / len(frames), 4),
+    }
+
+    reference, name = _reference_chain()
+    if reference is None:
+        return report
+
+    reference_seconds = []
+    for _ in range(repeats):
+        begin = time.perf_counter()
+        for start in range(0, len(frames), batch_size):
+            np.stack([reference(frame) for frame in frames[start:start + batch_size]])
+        reference_seconds.append(time.perf_counter() - begin)
+
+    # Interpolation differs slightly; report how far the outputs drift in normalized units
+    differences = np.array([np.abs(preprocessor([frame])[0] - reference(frame)).mean() for frame in frames])
+    report.update({
+        'reference': name,
+        'reference_ms_per_frame': round(1000 * min(reference_seconds) / len(frames), 4),
+        'speedup': round(min(reference_seconds) / min(fused_seconds), 2),
+        'mean_abs_difference': round(float(differences.mean()), 4),
+        'max_abs_difference': round(float(differences.max()), 4),
+    })
+    return report
+
+
+def measure_classifier(classifier: ImageClassifier, frames: Sequence[np.ndarray], batch_size: int = 8,
+                       warmup: int = 3) -> Tuple[Dict[str, Any], List[List[Tuple[str, float]]]]:
+    """
+    Time single-frame and batched classification.
+
+    Args:
+        classifier: Loaded ImageClassifier
+        frames: BGR frames to classify
+        batch_size: Batch size for the batched pass
+        warmup: Untimed calls before measuring
+
+    Returns:
+        (metrics, per-frame top-1 results from the single-frame pass)
+    """
+    for frame in frames[:warmup]:
+        classifier.classify_frame(frame)
+
+    latencies = []
+    results = []
+    for frame in frames:
+        begin = time.perf_counter()
+        label, confidence = classifier.classify_frame(frame)
+        latencies.append(time.perf_counter() - begin)
+        results.append([(label, confidence)])
+
+    begin = time.perf_counter()
+    classifier.classify_batch(frames, batch_size=batch_size)
+    batch_seconds = time.perf_counter() - begin
+
+    latency_ms = np.array(latencies) * 1000
+    metrics = {
+        'frames': len(frames),
+        'latency_ms': {
+            'mean': round(float(latency_ms.mean()), 3),
+            'p50': round(float(np.percentile(latency_ms, 50)), 3),
+            'p95': round(float(np.percentile(latency_ms, 95)), 3),
+            'max': round(float(latency_ms.max()), 3),
+        },
+        'batched_ms_per_frame': round(1000 * batch_seconds / len(frames), 3),
+    }
+    return metrics, results
+
+
+def compare_precisions(frames: Sequence[np.ndarray], calibration_frames: Optional[Sequence[np.ndarray]] = None,
+                       cache_dir: Optional[str] = None, batch_size: int = 8) -> Dict[str, Any]:
+    """
+    Benchmark FP32 against INT8 on the same frames.
+
+    Args:
+        frames: Evaluation frames
+        calibration_frames: Frames for static INT8 calibration (dynamic quantization if None)
+        cache_dir: Quantized weight cache directory
+        batch_size: Batch size for the batched pass
+
+    Returns:
+        Dictionary with per-precision metrics, load times, speedup and top-1 agreement
+    """
+    report: Dict[str, Any] = {}
+    results = {}
+    for precision in ("fp32", "int8"):
+        begin = time.perf_counter()
+        classifier = ImageClassifier(model_type="torch", device="cpu", precision=precision,
+                                     calibration_frames=calibration_frames, cache_dir=cache_dir)
+        if not classifier.load_model():
+            raise RuntimeError(f"Failed to load {precision} model")
+        load_seconds = time.perf_counter() - begin
+        report[precision], results[precision] = measure_classifier(classifier, frames, batch_size)
+        report[precision]['load_seconds'] = round(load_seconds, 2)
+
+    report['speedup'] = round(report['fp32']['latency_ms']['mean'] / report['int8']['latency_ms']['mean'], 2)
+    report['top1_agreement'] = round(top1_agreement(results['fp32'], results['int8']), 4)
+    report['quantization'] = "static" if calibration_frames else "dynamic"
+    return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Compare FP32 and INT8 MobileNetV2 and preprocessing paths on CPU")
+    parser.add_argument("--clips", nargs="+", default=["sample_clips"],
+                        help="Video files or directories frames are sampled from")
+    parser.add_argument("--frames", type=int, default=100, help="Evaluation frames")
+    parser.add_argument("--calibration", type=int, default=64,
+                        help="Calibration frames for static INT8 (0 quantizes only the classifier head)")
+    parser.add_argument("--batch-size", type=int, default=8, help="Batch size for the batched pass")
+    parser.add_argument("--threads", type=int, default=None, help="torch.set_num_threads() value")
+    parser.add_argument("--cache-dir", help="Quantized weight cache directory")
+    parser.add_argument("--preprocess-only", action="store_true",
+                        help="Only compare preprocessing paths (no model or PyTorch needed)")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    set_global_log_level("WARNING")
+
+    if args.preprocess_only:
+        frames = load_calibration_frames(args.clips, args.frames)
+        source = "clips"
+        if len(frames) < args.frames:
+            frames = list(synthetic_frames(args.frames, 640, 480))
+            source = "synthetic"
+        report = {
+            'environment': environment_info(),
+            'source': source,
+            'preprocessing': compare_preprocessing(frames, args.batch_size),
+        }
+        return _write_report(report, args.output, lambda: _preprocessing_line(report['preprocessing']))
+
+    if not TORCH_AVAILABLE:
+        print("PyTorch and torchvision are required for the INT8 benchmark", file=sys.stderr)
+        return 1
+
+    import torch
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    # Calibration and evaluation frames alternate so the two sets never overlap
+    sampled = load_calibration_frames(args.clips, args.frames + args.calibration)
+    source = "clips"
+    if len(sampled) < args.frames + args.calibration:
+        sampled = list(synthetic_frames(args.frames + args.calibration, 640, 480))
+        source = "synthetic"
+    calibration = sampled[0:2 * args.calibration:2]
+    evaluation = (sampled[1:2 * args.calibration:2] + sampled[2 * args.calibration:])[:args.frames]
+
+    report = {
+        'environment': {**environment_info(), 'torch': torch.__version__,
+                        'threads': str(torch.get_num_threads())},
+        'source': source,
+        'preprocessing': compare_preprocessing(evaluation, args.batch_size),
+        'results': compare_precisions(evaluation, calibration or None, args.cache_dir, args.batch_size),
+    }
+    results = report['results']
+    return _write_report(report, args.output, lambda: (
+        f"INT8 {results['speedup']}x faster than FP32, top-1 agreement {results['top1_agreement']:.1%}; "
+        + _preprocessing_line(report['preprocessing'])))
+
+
+def _preprocessing_line(preprocessing: Dict[str, Any]) -> str:
+    """One-line summary of a compare_preprocessing() report."""
+    line = f"fused preprocessing {preprocessing['fused_ms_per_frame']} ms/frame"
+    if 'reference' in preprocessing:
+        line += (f" vs {preprocessing['reference_ms_per_frame']} ms/frame for the {preprocessing['reference']} "
+                 f"chain ({preprocessing['speedup']}x)")
+    return line
+
+
+def _write_report(report: Dict[str, Any], output: Optional[str], summary: Callable[[], str]) -> int:
+    """Write the JSON report to a file (printing a summary) or to stdout."""
+    text = json.dumps(report, indent=2)
+    if output:
+        with open(output, 'w', encoding='utf-8') as file:
+            file.write(text + "\n")
+        print(f"{summary()}, report written to {output}")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,29 +7,194 @@ designed to work with OpenCV BGR frames and integrate with the nutflix_common lo
 
 import cv2
 import numpy as np
-from typing import Tuple, Optional, Any
+from typing import Tuple, Optional, Any, List, Sequence
+import hashlib
+import importlib.util
 import os
+import platform
 import warnings
 
-try:
-    import torch
-    import torchvision.transforms as transforms
-    from torchvision import models
-    TORCH_AVAILABLE = True
-except ImportError:
-    TORCH_AVAILABLE = False
+# The ML frameworks take seconds to import on a Pi, so only check that they are
+# installed here and import them when a model of that type is loaded.
+TORCH_AVAILABLE = all(importlib.util.find_spec(name) is not None for name in ("torch", "torchvision"))
+TF_AVAILABLE = importlib.util.find_spec("tensorflow") is not None
+ONNXRUNTIME_AVAILABLE = importlib.util.find_spec("onnxruntime") is not None
 
-try:
-    import tensorflow as tf
-    TF_AVAILABLE = True
-except ImportError:
-    TF_AVAILABLE = False
+# Supported model precisions ("int8" is PyTorch on CPU only)
+PRECISIONS = ("fp32", "int8")
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "nutflix")
+
+torch = None
+transforms = None
+models = None
+tf = None
 
 from .logger import get_logger
+from .media_utils import find_clips
 
 # Get logger for AI subsystem
 logger = get_logger("ai")
 
+# ImageNet preprocessing used by the torchvision and ONNX MobileNetV2 models
+INPUT_SIZE = 224
+IMAGENET_MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+IMAGENET_STD = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+
+
+def _import_torch() -> None:
+    """Import PyTorch and torchvision on first use."""
+    global torch, transforms, models
+    if torch is None:
+        import torch as torch_module
+        import torchvision.transforms as transforms_module
+        from torchvision import models as models_module
+        torch, transforms, models = torch_module, transforms_module, models_module
+
+
+def _select_quantized_engine() -> str:
+    """Pick the PyTorch quantized kernel backend: qnnpack on ARM (Pi), x86/fbgemm otherwise."""
+    supported = [engine for engine in torch.backends.quantized.supported_engines if engine != "none"]
+    arm = platform.machine().lower() in ("aarch64", "arm64", "armv7l", "armv6l")
+    preferred = ("qnnpack",) if arm else ("x86", "fbgemm", "qnnpack")
+    for engine in preferred:
+        if engine in supported:
+            return engine
+    return supported[0]
+
+
+def calibration_key(frames: Sequence[np.ndarray]) -> str:
+    """
+    Identify a calibration set by its frame count and a digest of its pixels.
+    
+    Used in the INT8 cache filename, so a different calibration set builds a
+    new model instead of silently reusing the old one.
+    """
+    digest = hashlib.sha256()
+    for frame in frames:
+        digest.update(str(frame.shape).encode())
+        digest.update(np.ascontiguousarray(frame).data)
+    return f"{len(frames)}x{digest.hexdigest()[:12]}"
+
+
+def load_calibration_frames(paths: Sequence[str], count: int = 64) -> List[np.ndarray]:
+    """
+    Sample frames evenly from recorded clips, e.g. for INT8 calibration.
+    
+    Args:
+        paths: Video files or directories of clips
+        count: Total number of frames to return
+        
+    Returns:
+        List of BGR frames (fewer than count if the clips are short)
+    """
+    clips = find_clips(paths)
+    frames: List[np.ndarray] = []
+    for index, clip in enumerate(clips):
+        wanted = count // len(clips) + (1 if index < count % len(clips) else 0)
+        capture = cv2.VideoCapture(clip)
+        try:
+            total = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+            for position in np.linspace(0, max(total - 1, 0), wanted).astype(int):
+                capture.set(cv2.CAP_PROP_POS_FRAMES, int(position))
+                ok, frame = capture.read()
+                if ok:
+                    frames.append(frame)
+        finally:
+            capture.release()
+    logger.info(f"Loaded {len(frames)} calibration frames from {len(clips)} clips")
+    return frames
+
+
+class FramePreprocessor:
+    """
+    Fused BGR frame -> normalized float32 batch preprocessing with cv2 and NumPy.
+    
+    Replaces ToPILImage -> Resize -> CenterCrop -> ToTensor -> Normalize: the
+    centre square is taken from the frame as a view and resized once, then the
+    BGR->RGB swap, scaling and per-channel mean/std normalisation are written
+    straight into a preallocated batch buffer. The returned array is a view of
+    that buffer and is overwritten by the next call, so one preprocessor must
+    not be shared between threads.
+    """
+    
+    def __init__(self, size: int = INPUT_SIZE, mean: Sequence[float] = IMAGENET_MEAN,
+                 std: Sequence[float] = IMAGENET_STD, channels_first: bool = True, center_crop: bool = True):
+        """
+        Args:
+            size: Output height and width
+            mean: Per-channel RGB mean of the 0-1 scaled input
+            std: Per-channel RGB standard deviation of the 0-1 scaled input
+            channels_first: NCHW (PyTorch/ONNX) if True, NHWC (TensorFlow) otherwise
+            center_crop: Take the centre square like Resize + CenterCrop; if False the
+                whole frame is resized to size x size
+        """
+        self.size = size
+        self.channels_first = channels_first
+        self.center_crop = center_crop
+        
+        # (x / 255 - mean) / std folded into x * scale + bias, per RGB channel
+        std = np.asarray(std, dtype=np.float32)
+        self._scale = (1.0 / (255.0 * std)).astype(np.float32)
+        self._bias = (-np.asarray(mean, dtype=np.float32) / std).astype(np.float32)
+        
+        self._item_shape = (3, size, size) if channels_first else (size, size, 3)
+        self._resized = np.empty((size, size, 3), dtype=np.uint8)
+        self._buffer = np.empty((0,) + self._item_shape, dtype=np.float32)
+        
+    def __call__(self, frames: Sequence[np.ndarray]) -> np.ndarray:
+        """
+        Preprocess BGR frames into the batch buffer.
+        
+        Returns:
+            (N, 3, size, size) or (N, size, size, 3) float32 view of the buffer
+        """
+        if len(self._buffer) < len(frames):
+            self._buffer = np.empty((len(frames),) + self._item_shape, dtype=np.float32)
+        batch = self._buffer[:len(frames)]
+        for index, frame in enumerate(frames):
+            self._write(frame, batch[index])
+        return batch
+        
+    def _write(self, frame: np.ndarray, out: np.ndarray) -> None:
+        """Resize one frame and normalize it into out."""
+        if self.center_crop:
+            height, width = frame.shape[:2]
+            side = min(height, width)
+            top = (height - side) // 2
+            left = (width - side) // 2
+            frame = frame[top:top + side, left:left + side]
+            
+        # PIL's bilinear resize antialiases when shrinking. INTER_AREA matches it but is
+        # ~8x slower at non-integer ratios (480 -> 224), so area-average by a whole
+        # factor first and finish with INTER_LINEAR at a ratio below 2.
+        factor_y = frame.shape[0] // self.size
+        factor_x = frame.shape[1] // self.size
+        if factor_y >= 2 or factor_x >= 2:
+            factor_y, factor_x = max(factor_y, 1), max(factor_x, 1)
+            height = frame.shape[0] - frame.shape[0] % factor_y
+            width = frame.shape[1] - frame.shape[1] % factor_x
+            frame = cv2.resize(frame[:height, :width], (width // factor_x, height // factor_y),
+                               interpolation=cv2.INTER_AREA)
+        resized = cv2.resize(frame, (self.size, self.size), dst=self._resized, interpolation=cv2.INTER_LINEAR)
+        
+        # dtype=float32 keeps NumPy from picking a float16 loop for uint8 * float32
+        if self.channels_first:
+            for channel in range(3):
+                # RGB channel c is BGR channel 2 - c
+                np.multiply(resized[:, :, 2 - channel], self._scale[channel], out=out[channel], dtype=np.float32)
+                out[channel] += self._bias[channel]
+        else:
+            np.multiply(resized[:, :, ::-1], self._scale, out=out, dtype=np.float32)
+            out += self._bias
+
+
+def _import_tf() -> None:
+    """Import TensorFlow on first use."""
+    global tf
+    if tf is None:
+        import tensorflow as tf_module
+        tf = tf_module
+
 # ImageNet class labels (top 10 common classes for demo)
 IMAGENET_LABELS = {
     0: 'tench',
@@ -55,33 +220,103 @@ DEMO_LABELS = [
 ]
 
 
+def crop_square_region(frame: np.ndarray, box: Sequence[int], padding: float = 0.15,
+                       min_size: int = 32) -> np.ndarray:
+    """
+    Crop a square region around a bounding box.
+    
+    The square is centred on the box, grown by padding on each side and kept
+    inside the frame where possible; any part that still falls outside is
+    filled with black, so the crop is always square and the box is never cut.
+    
+    Args:
+        frame: OpenCV BGR frame
+        box: (x, y, width, height) in frame pixels, e.g. a MotionEvent box
+        padding: Context added on each side, as a fraction of the box's longer side
+        min_size: Smallest square side in pixels
+        
+    Returns:
+        Square BGR crop
+    """
+    x, y, w, h = (int(v) for v in box)
+    frame_h, frame_w = frame.shape[:2]
+    side = max(int(round(max(w, h) * (1 + 2 * padding))), min_size, 1)
+    
+    # Per axis: shift the square inside the frame, or take the whole axis and pad
+    bounds = []
+    for center, dim in ((x + w / 2.0, frame_w), (y + h / 2.0, frame_h)):
+        if side <= dim:
+            start = min(max(int(round(center - side / 2.0)), 0), dim - side)
+            bounds.append((start, start + side, 0, 0))
+        else:
+            extra = side - dim
+            bounds.append((0, dim, extra // 2, extra - extra // 2))
+    (x0, x1, left, right), (y0, y1, top, bottom) = bounds
+    
+    crop = frame[y0:y1, x0:x1]
+    if left or right or top or bottom:
+        crop = cv2.copyMakeBorder(crop, top, bottom, left, right, cv2.BORDER_CONSTANT, value=0)
+    return crop
+
+
 class ImageClassifier:
     """Lightweight image classifier for real-time camera applications."""
     
-    def __init__(self, model_type: str = "torch", device: str = "auto"):
+    def __init__(self, model_type: str = "torch", device: str = "auto", model_path: Optional[str] = None,
+                 onnx_backend: str = "auto", precision: str = "fp32",
+                 calibration_frames: Optional[Sequence[np.ndarray]] = None,
+                 cache_dir: Optional[str] = None):
         """
         Initialize the image classifier.
         
         Args:
-            model_type: "torch" for PyTorch MobileNet or "tf" for TensorFlow
+            model_type: "torch" for PyTorch MobileNet, "tf" for TensorFlow or
+                "onnx" for an exported MobileNetV2 ONNX file (no torch import)
             device: "cpu", "cuda", or "auto" for automatic selection
+            model_path: Local ONNX file for model_type "onnx" (see export_onnx_model)
+            onnx_backend: "onnxruntime", "opencv" (cv2.dnn) or "auto" to prefer
+                onnxruntime when it is installed
+            precision: "fp32", or "int8" for a quantized PyTorch model on CPU
+            calibration_frames: BGR frames for static INT8 calibration (see
+                load_calibration_frames); without them only the classifier head
+                is quantized (dynamic quantization), which is barely faster
+            cache_dir: Where quantized weights are cached (default ~/.cache/nutflix)
         """
         self.model = None
         self.model_type = model_type
+        self.model_path = model_path
+        self.onnx_backend = onnx_backend
+        self.precision = precision
+        self.calibration_frames = calibration_frames
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
         self.device = self._get_device(device)
         self.transform = None
+        self.preprocessor = None
         self.labels = IMAGENET_LABELS
+        self._onnx_input_name = None
+        self._onnx_max_batch = None  # Set when the ONNX model has a fixed batch size
         
-        logger.info(f"Initializing ImageClassifier with model_type='{model_type}', device='{self.device}'")
+        logger.info(f"Initializing ImageClassifier with model_type='{model_type}', device='{self.device}', "
+                    f"precision='{precision}'")
         
     def _get_device(self, device: str) -> str:
         """Determine the best device to use."""
+        if self.precision == "int8":
+            if device == "cuda":
+                logger.warning("INT8 models run on CPU only, ignoring device='cuda'")
+            return "cpu"
         if device == "auto":
-            if TORCH_AVAILABLE and torch.cuda.is_available():
-                return "cuda"
+            if self.model_type == "torch" and TORCH_AVAILABLE:
+                _import_torch()
+                if torch.cuda.is_available():
+                    return "cuda"
             return "cpu"
         return device
         
+    def _get_label(self, class_idx: int) -> str:
+        """Map a class index to its label, falling back to class_<index>."""
+        return self.labels.get(int(class_idx), f"class_{int(class_idx)}")
+        
     def load_model(self) -> bool:
         """
         Load the pretrained model.
@@ -90,10 +325,15 @@ class ImageClassifier:
             bool: True if model loaded successfully, False otherwise
         """
         try:
+            if self.precision not in PRECISIONS or (self.precision == "int8" and self.model_type != "torch"):
+                logger.error(f"Precision '{self.precision}' not supported for model type '{self.model_type}'")
+                return False
             if self.model_type == "torch" and TORCH_AVAILABLE:
                 return self._load_torch_model()
             elif self.model_type == "tf" and TF_AVAILABLE:
                 return self._load_tf_model()
+            elif self.model_type == "onnx":
+                return self._load_onnx_model()
             else:
                 logger.error(f"Model type '{self.model_type}' not supported or dependencies not available")
                 return False
@@ -106,18 +346,10 @@ class ImageClassifier:
         """Load PyTorch MobileNetV2 model."""
         try:
             logger.info("Loading PyTorch MobileNetV2 model...")
+            _import_torch()
             
-            # Suppress download warnings
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore")
-                self.model = models.mobilenet_v2(pretrained=True)
-            
-            self.model.eval()
-            
-            if self.device == "cuda":
-                self.model = self.model.cuda()
-                
-            # Define transforms for preprocessing
+            # Reference torchvision chain; classification uses the fused preprocessor
+            self.preprocessor = FramePreprocessor()
             self.transform = transforms.Compose([
                 transforms.ToPILImage(),
                 transforms.Resize(224),
@@ -126,17 +358,81 @@ class ImageClassifier:
                 transforms.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225])
             ])
             
-            logger.info("PyTorch MobileNetV2 model loaded successfully")
+            if self.precision == "int8":
+                self.model = self._load_quantized_torch_model()
+            else:
+                # Suppress download warnings
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore")
+                    self.model = models.mobilenet_v2(pretrained=True)
+                    
+            self.model.eval()
+            
+            if self.device == "cuda":
+                self.model = self.model.cuda()
+                
+            logger.info(f"PyTorch MobileNetV2 model loaded successfully ({self.precision})")
             return True
             
         except Exception as e:
             logger.error(f"Failed to load PyTorch model: {e}")
             return False
             
+    def _load_quantized_torch_model(self) -> Any:
+        """
+        Build an INT8 MobileNetV2, or load it from the cache.
+        
+        With calibration frames the whole network is statically quantized
+        (fused conv/bn/relu, activation ranges observed on the frames);
+        otherwise only the final Linear layer is dynamically quantized, which
+        leaves the convolutions in FP32 and gives little speedup. The result
+        is saved as TorchScript, keyed by the calibration set, so later starts
+        with the same frames skip calibration.
+        """
+        engine = _select_quantized_engine()
+        torch.backends.quantized.engine = engine
+        mode = f"static_{calibration_key(self.calibration_frames)}" if self.calibration_frames else "dynamic"
+        version = torch.__version__.split("+")[0]
+        cache_path = os.path.join(self.cache_dir, f"mobilenet_v2_int8_{mode}_{engine}_torch{version}.pt")
+        
+        if os.path.isfile(cache_path):
+            logger.info(f"Loading cached INT8 model from {cache_path}")
+            return torch.jit.load(cache_path, map_location="cpu")
+            
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            if self.calibration_frames:
+                logger.info(f"Calibrating INT8 model on {len(self.calibration_frames)} frames ({engine})...")
+                model = models.quantization.mobilenet_v2(pretrained=True, quantize=False).eval()
+                model.fuse_model()
+                model.qconfig = torch.ao.quantization.get_default_qconfig(engine)
+                torch.ao.quantization.prepare(model, inplace=True)
+                with torch.no_grad():
+                    for start in range(0, len(self.calibration_frames), 8):
+                        chunk = self.calibration_frames[start:start + 8]
+                        model(torch.from_numpy(self.preprocessor(chunk)))
+                torch.ao.quantization.convert(model, inplace=True)
+            else:
+                logger.warning("No calibration frames: dynamic INT8 only quantizes the classifier head, "
+                               "so expect little speedup. Pass calibration_frames for a static INT8 model.")
+                model = torch.ao.quantization.quantize_dynamic(
+                    models.mobilenet_v2(pretrained=True).eval(), {torch.nn.Linear}, dtype=torch.qint8)
+                    
+            with torch.no_grad():
+                scripted = torch.jit.trace(model, torch.zeros(1, 3, INPUT_SIZE, INPUT_SIZE))
+                
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temp_path = cache_path + ".tmp"
+        torch.jit.save(scripted, temp_path)
+        os.replace(temp_path, cache_path)
+        logger.info(f"Cached INT8 model at {cache_path}")
+        return scripted
+        
     def _load_tf_model(self) -> bool:
         """Load TensorFlow MobileNetV2 model."""
         try:
             logger.info("Loading TensorFlow MobileNetV2 model...")
+            _import_tf()
             
             self.model = tf.keras.applications.MobileNetV2(
                 weights='imagenet',
@@ -144,6 +440,10 @@ class ImageClassifier:
                 input_shape=(224, 224, 3)
             )
             
+            # Whole frame resized to 224x224 and scaled to 0-1, NHWC
+            self.preprocessor = FramePreprocessor(mean=(0.0, 0.0, 0.0), std=(1.0, 1.0, 1.0),
+                                                  channels_first=False, center_crop=False)
+            
             logger.info("TensorFlow MobileNetV2 model loaded successfully")
             return True
             
@@ -151,6 +451,46 @@ class ImageClassifier:
             logger.error(f"Failed to load TensorFlow model: {e}")
             return False
             
+    def _load_onnx_model(self) -> bool:
+        """Load an exported MobileNetV2 ONNX model from disk."""
+        try:
+            if not self.model_path or not os.path.isfile(self.model_path):
+                logger.error(f"ONNX model file not found: {self.model_path}")
+                return False
+                
+            backend = self.onnx_backend
+            if backend == "auto":
+                backend = "onnxruntime" if ONNXRUNTIME_AVAILABLE else "opencv"
+            logger.info(f"Loading ONNX model {self.model_path} with {backend}...")
+            
+            if backend == "onnxruntime":
+                import onnxruntime
+                providers = ["CPUExecutionProvider"]
+                if self.device == "cuda":
+                    providers.insert(0, "CUDAExecutionProvider")
+                self.model = onnxruntime.InferenceSession(self.model_path, providers=providers)
+                model_input = self.model.get_inputs()[0]
+                self._onnx_input_name = model_input.name
+                batch_dim = model_input.shape[0]
+                self._onnx_max_batch = batch_dim if isinstance(batch_dim, int) and batch_dim > 0 else None
+            elif backend == "opencv":
+                self.model = cv2.dnn.readNetFromONNX(self.model_path)
+                if self.device == "cuda":
+                    self.model.setPreferableBackend(cv2.dnn.DNN_BACKEND_CUDA)
+                    self.model.setPreferableTarget(cv2.dnn.DNN_TARGET_CUDA)
+            else:
+                logger.error(f"Unknown ONNX backend: {backend}")
+                return False
+                
+            self.onnx_backend = backend
+            self.preprocessor = FramePreprocessor()
+            logger.info("ONNX model loaded successfully")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to load ONNX model: {e}")
+            return False
+            
     def classify_frame(self, frame: np.ndarray) -> Tuple[str, float]:
         """
         Classify a single frame from OpenCV camera.
@@ -171,6 +511,8 @@ class ImageClassifier:
                 return self._classify_torch(frame)
             elif self.model_type == "tf":
                 return self._classify_tf(frame)
+            elif self.model_type == "onnx":
+                return self._classify_batch_onnx([frame], 1)[0][0]
             else:
                 logger.error(f"Unknown model type: {self.model_type}")
                 return "error", 0.0
@@ -181,11 +523,8 @@ class ImageClassifier:
             
     def _classify_torch(self, frame: np.ndarray) -> Tuple[str, float]:
         """Classify using PyTorch model."""
-        # Convert BGR to RGB
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        
-        # Apply transforms
-        input_tensor = self.transform(rgb_frame).unsqueeze(0)
+        # Preprocess into a (1, 3, 224, 224) tensor sharing the preprocessor's buffer
+        input_tensor = torch.from_numpy(self.preprocessor([frame]))
         
         if self.device == "cuda":
             input_tensor = input_tensor.cuda()
@@ -200,52 +539,191 @@ class ImageClassifier:
         confidence = top_prob.item()
         class_idx = top_class.item()
         
-        # Map to label (simplified mapping)
-        if class_idx < len(self.labels):
-            label = self.labels[class_idx]
-        else:
-            label = f"class_{class_idx}"
-            
-        return label, confidence
+        return self._get_label(class_idx), confidence
         
     def _classify_tf(self, frame: np.ndarray) -> Tuple[str, float]:
         """Classify using TensorFlow model."""
-        # Convert BGR to RGB and resize
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        resized = cv2.resize(rgb_frame, (224, 224))
-        
-        # Normalize and add batch dimension
-        normalized = tf.cast(resized, tf.float32) / 255.0
-        input_tensor = tf.expand_dims(normalized, 0)
-        
-        # Run inference
-        predictions = self.model(input_tensor)
+        # Run inference on a (1, 224, 224, 3) batch
+        predictions = self.model(self.preprocessor([frame]))
         
         # Get top prediction
         top_class = tf.argmax(predictions[0]).numpy()
         confidence = tf.reduce_max(predictions[0]).numpy()
         
-        # Map to label (simplified mapping)
-        if top_class < len(self.labels):
-            label = self.labels[top_class]
-        else:
-            label = f"class_{top_class}"
+        return self._get_label(top_class), float(confidence)
+        
+    def classify_batch(self, frames: Sequence[np.ndarray], top_k: int = 1,
+                       batch_size: int = 8) -> List[List[Tuple[str, float]]]:
+        """
+        Classify several frames or crops with one forward pass per batch.
+        
+        The preprocessed inputs are stacked into a single tensor, so e.g. both
+        cameras' frames or all crops from a track share the per-call overhead.
+        
+        Args:
+            frames: OpenCV BGR frames or crops (any sizes)
+            top_k: Number of predictions returned per frame
+            batch_size: Largest number of frames run through the model at once
             
-        return label, float(confidence)
+        Returns:
+            One list of (class_label, confidence_score) per frame, best first
+        """
+        if len(frames) == 0:
+            return []
+            
+        if self.model is None:
+            logger.warning("Model not loaded, attempting to load...")
+            if not self.load_model():
+                return [[("error", 0.0)] for _ in frames]
+                
+        try:
+            results: List[List[Tuple[str, float]]] = []
+            for start in range(0, len(frames), max(1, batch_size)):
+                chunk = frames[start:start + max(1, batch_size)]
+                if self.model_type == "torch":
+                    results.extend(self._classify_batch_torch(chunk, top_k))
+                elif self.model_type == "tf":
+                    results.extend(self._classify_batch_tf(chunk, top_k))
+                elif self.model_type == "onnx":
+                    results.extend(self._classify_batch_onnx(chunk, top_k))
+                else:
+                    logger.error(f"Unknown model type: {self.model_type}")
+                    return [[("error", 0.0)] for _ in frames]
+            return results
+            
+        except Exception as e:
+            logger.error(f"Batch classification failed: {e}")
+            return [[("error", 0.0)] for _ in frames]
+            
+    def classify_regions(self, frame: np.ndarray, boxes: Optional[np.ndarray], top_k: int = 1,
+                         padding: float = 0.15, max_regions: int = 4) -> List[List[Tuple[str, float]]]:
+        """
+        Classify only the motion regions of a frame.
+        
+        Each box is padded to a square crop (see crop_square_region) so the
+        model's resize and center crop keep the whole critter, and the crops
+        are classified in one batch instead of the mostly empty full frame.
+        
+        Args:
+            frame: OpenCV BGR frame
+            boxes: (N, 4) array of (x, y, width, height), e.g. MotionEvent.boxes
+            top_k: Number of predictions returned per region
+            padding: Context added around each box, as a fraction of its longer side
+            max_regions: Only the first max_regions boxes are classified
+                (MotionDetector reports boxes largest first)
+            
+        Returns:
+            One list of (class_label, confidence_score) per classified box
+        """
+        if boxes is None or len(boxes) == 0:
+            return []
+        boxes = np.asarray(boxes).reshape(-1, 4)[:max(0, max_regions)]
+        crops = [crop_square_region(frame, box, padding) for box in boxes]
+        return self.classify_batch(crops, top_k=top_k)
+        
+    def _classify_batch_torch(self, frames: Sequence[np.ndarray], top_k: int) -> List[List[Tuple[str, float]]]:
+        """Classify a batch using PyTorch model."""
+        # Preprocess all frames into one (N, 3, 224, 224) tensor
+        input_tensor = torch.from_numpy(self.preprocessor(frames))
+        
+        if self.device == "cuda":
+            input_tensor = input_tensor.cuda()
+            
+        # Run inference
+        with torch.no_grad():
+            outputs = self.model(input_tensor)
+            probabilities = torch.nn.functional.softmax(outputs, dim=1)
+            
+        top_probs, top_classes = torch.topk(probabilities, min(top_k, probabilities.shape[1]), dim=1)
+        return [[(self._get_label(class_idx), float(prob)) for prob, class_idx in zip(probs, classes)]
+                for probs, classes in zip(top_probs.cpu().tolist(), top_classes.cpu().tolist())]
+        
+    def _classify_batch_tf(self, frames: Sequence[np.ndarray], top_k: int) -> List[List[Tuple[str, float]]]:
+        """Classify a batch using TensorFlow model."""
+        # Run inference on an (N, 224, 224, 3) batch
+        predictions = self.model(self.preprocessor(frames), training=False)
+        
+        top = tf.math.top_k(predictions, k=min(top_k, int(predictions.shape[-1])))
+        return [[(self._get_label(class_idx), float(prob)) for prob, class_idx in zip(probs, classes)]
+                for probs, classes in zip(top.values.numpy().tolist(), top.indices.numpy().tolist())]
+        
+    def _run_onnx(self, batch: np.ndarray) -> np.ndarray:
+        """Run a preprocessed batch through the ONNX model. Returns (N, classes) outputs."""
+        if self.onnx_backend == "onnxruntime":
+            if self._onnx_max_batch is not None and len(batch) > self._onnx_max_batch:
+                step = self._onnx_max_batch
+                return np.concatenate([self._run_onnx(batch[i:i + step]) for i in range(0, len(batch), step)])
+            return self.model.run(None, {self._onnx_input_name: batch})[0]
+        self.model.setInput(batch)
+        return self.model.forward()
+        
+    def _classify_batch_onnx(self, frames: Sequence[np.ndarray], top_k: int) -> List[List[Tuple[str, float]]]:
+        """Classify a batch using the ONNX model."""
+        outputs = self._run_onnx(self.preprocessor(frames)).reshape(len(frames), -1).astype(np.float64)
+        
+        # torchvision exports produce logits; leave models that already output probabilities alone
+        if outputs.min() < 0 or not np.allclose(outputs.sum(axis=1), 1.0, atol=1e-3):
+            outputs = np.exp(outputs - outputs.max(axis=1, keepdims=True))
+            outputs /= outputs.sum(axis=1, keepdims=True)
+            
+        k = min(top_k, outputs.shape[1])
+        top_classes = np.argsort(-outputs, axis=1)[:, :k]
+        return [[(self._get_label(class_idx), float(probs[class_idx])) for class_idx in classes]
+                for probs, classes in zip(outputs, top_classes)]
 
 
-def load_model(model_type: str = "torch", device: str = "auto") -> Optional[ImageClassifier]:
+def export_onnx_model(path: str, opset: int = 13) -> bool:
+    """
+    Export the pretrained torchvision MobileNetV2 to ONNX for model_type "onnx".
+    
+    Run once on a machine with PyTorch installed, then copy the file to the
+    device. The batch dimension is dynamic so classify_batch() can stack inputs.
+    
+    Args:
+        path: Output .onnx file
+        opset: ONNX opset version
+        
+    Returns:
+        bool: True if the model was exported
+    """
+    if not TORCH_AVAILABLE:
+        logger.error("PyTorch is required to export the ONNX model")
+        return False
+        
+    try:
+        _import_torch()
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            model = models.mobilenet_v2(pretrained=True).eval()
+        torch.onnx.export(model, torch.randn(1, 3, INPUT_SIZE, INPUT_SIZE), path, opset_version=opset,
+                          input_names=["input"], output_names=["logits"],
+                          dynamic_axes={"input": {0: "batch"}, "logits": {0: "batch"}})
+        logger.info(f"Exported MobileNetV2 ONNX model to {path}")
+        return True
+        
+    except Exception as e:
+        logger.error(f"Failed to export ONNX model: {e}")
+        return False
+
+
+def load_model(model_type: str = "torch", device: str = "auto", model_path: Optional[str] = None,
+               precision: str = "fp32",
+               calibration_frames: Optional[Sequence[np.ndarray]] = None) -> Optional[ImageClassifier]:
     """
     Load and return an image classification model.
     
     Args:
-        model_type: "torch" or "tf"
+        model_type: "torch", "tf" or "onnx"
         device: "cpu", "cuda", or "auto"
+        model_path: Local model file for model_type "onnx"
+        precision: "fp32" or "int8" (torch only)
+        calibration_frames: Frames for static INT8 calibration
         
     Returns:
         ImageClassifier instance or None if loading failed
     """
-    classifier = ImageClassifier(model_type=model_type, device=device)
+    classifier = ImageClassifier(model_type=model_type, device=device, model_path=model_path,
+                                 precision=precision, calibration_frames=calibration_frames)
     
     if classifier.load_model():
         logger.info(f"Successfully loaded {model_type} classifier")
@@ -273,6 +751,47 @@ def classify_frame(model: ImageClassifier, frame: np.ndarray) -> Tuple[str, floa
     return model.classify_frame(frame)
 
 
+def classify_batch(model: ImageClassifier, frames: Sequence[np.ndarray],
+                   top_k: int = 1) -> List[List[Tuple[str, float]]]:
+    """
+    Classify several frames in batched forward passes using the provided model.
+    
+    Args:
+        model: Loaded ImageClassifier instance
+        frames: OpenCV BGR frames or crops
+        top_k: Number of predictions returned per frame
+        
+    Returns:
+        One list of (class_label, confidence_score) per frame, best first
+    """
+    if model is None:
+        logger.error("Model is None, cannot classify frames")
+        return [[("error", 0.0)] for _ in frames]
+        
+    return model.classify_batch(frames, top_k=top_k)
+
+
+def classify_regions(model: ImageClassifier, frame: np.ndarray, boxes: Optional[np.ndarray],
+                     top_k: int = 1) -> List[List[Tuple[str, float]]]:
+    """
+    Classify the motion regions of a frame using the provided model.
+    
+    Args:
+        model: Loaded ImageClassifier instance
+        frame: OpenCV BGR frame as numpy array
+        boxes: (N, 4) array of (x, y, width, height), e.g. MotionEvent.boxes
+        top_k: Number of predictions returned per region
+        
+    Returns:
+        One list of (class_label, confidence_score) per classified box
+    """
+    if model is None:
+        logger.error("Model is None, cannot classify regions")
+        return [[("error", 0.0)] for _ in (boxes if boxes is not None else [])]
+        
+    return model.classify_regions(frame, boxes, top_k=top_k)
+
+
 def main():
     """Test the AI utilities with a synthetic frame."""
     logger.info("Testing AI utilities...")
@@ -288,6 +807,10 @@ def main():
         if torch_classifier:
             label, confidence = classify_frame(torch_classifier, test_frame)
             logger.info(f"PyTorch classification: {label} (confidence: {confidence:.3f})")
+            batch_results = classify_batch(torch_classifier, [test_frame, test_frame[:240, :320]], top_k=3)
+            logger.info(f"PyTorch batch classification: {batch_results}")
+            region_results = classify_regions(torch_classifier, test_frame, np.array([[300, 200, 40, 30]]))
+            logger.info(f"PyTorch region classification: {region_results}")
     else:
         logger.info("PyTorch not available, skipping PyTorch test")
     
@@ -298,6 +821,8 @@ def main():
         if tf_classifier:
             label, confidence = classify_frame(tf_classifier, test_frame)
             logger.info(f"TensorFlow classification: {label} (confidence: {confidence:.3f})")
+            batch_results = classify_batch(tf_classifier, [test_frame, test_frame[:240, :320]], top_k=3)
+            logger.info(f"TensorFlow batch classification: {batch_results}")
     else:
         logger.info("TensorFlow not available, skipping TensorFlow test")
     
@@ -305,6 +830,7 @@ def main():
     logger.info("Dependency status:")
     logger.info(f"  PyTorch: {'✅' if TORCH_AVAILABLE else '❌'}")
     logger.info(f"  TensorFlow: {'✅' if TF_AVAILABLE else '❌'}")
+    logger.info(f"  onnxruntime: {'✅' if ONNXRUNTIME_AVAILABLE else '❌ (ONNX models use cv2.dnn)'}")
     
     logger.info("AI utilities test completed")
 
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Background Model Backends for Nutflix Common
+Pluggable background subtraction backends sharing the OpenCV BackgroundSubtractor interface
+"""
+
+import cv2
+import numpy as np
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Protocol, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .motion_utils import MotionConfig
+
+
+class BackgroundModel(Protocol):
+    """
+    Interface shared by all background model backends.
+
+    Matches cv2.BackgroundSubtractor so the OpenCV subtractors can be used directly.
+    """
+
+    def apply(self, image: np.ndarray, fgmask: Optional[np.ndarray] = None,
+              learningRate: float = -1) -> np.ndarray:
+        """Update the model with a grayscale frame and return its foreground mask."""
+        ...
+
+    def getBackgroundImage(self) -> Optional[np.ndarray]:
+        """Return the current background estimate."""
+        ...
+
+
+class RunningAverageSubtractor:
+    """
+    Frame differencer against a running-average background (cv2.accumulateWeighted).
+
+    Much cheaper than MOG2 and good enough for static cameras with stable lighting.
+    """
+
+    def __init__(self, alpha: float = 0.05, threshold: int = 25):
+        """
+        Args:
+            alpha: Background update rate per frame (used when learningRate < 0)
+            threshold: Minimum absolute pixel difference to count as foreground
+        """
+        self.alpha = alpha
+        self.threshold = threshold
+        self._background: Optional[np.ndarray] = None
+        self._background_u8: Optional[np.ndarray] = None
+        self._diff: Optional[np.ndarray] = None
+
+    def apply(self, image: np.ndarray, fgmask: Optional[np.ndarray] = None,
+              learningRate: float = -1) -> np.ndarray:
+        """Update the background and return the thresholded difference mask."""
+        if fgmask is None or fgmask.shape != image.shape:
+            fgmask = np.empty_like(image)
+
+        if self._background is None or self._background.shape != image.shape:
+            self._background = image.astype(np.float32)
+            self._background_u8 = image.copy()
+            self._diff = np.empty_like(image)
+            fgmask.fill(0)
+            return fgmask
+
+        cv2.absdiff(image, self._background_u8, dst=self._diff)
+        cv2.threshold(self._diff, self.threshold, 255, cv2.THRESH_BINARY, dst=fgmask)
+
+        alpha = self.alpha if learningRate < 0 else learningRate
+        cv2.accumulateWeighted(image, self._background, alpha)
+        cv2.convertScaleAbs(self._background, dst=self._background_u8)
+
+        return fgmask
+
+    def getBackgroundImage(self) -> Optional[np.ndarray]:
+        """Return the current background estimate as uint8."""
+        return None if self._background_u8 is None else self._background_u8.copy()
+
+
+class FixedPointSubtractor:
+    """
+    Integer-only frame differencer keeping the background in 24.8 fixed point.
+
+    The background moves towards each frame by delta >> shift, i.e. an
+    exponential average with rate 2**-shift, using only NumPy integer ops.
+    """
+
+    FRACTION_BITS = 8
+
+    def __init__(self, alpha: float = 0.05, threshold: int = 25):
+        """
+        Args:
+            alpha: Background update rate per frame, rounded to a power of two
+            threshold: Minimum absolute pixel difference to count as foreground
+        """
+        self.shift = self._rate_to_shift(alpha)
+        self.threshold = threshold
+        self._background: Optional[np.ndarray] = None
+        self._delta: Optional[np.ndarray] = None
+
+    @staticmethod
+    def _rate_to_shift(rate: float) -> int:
+        """Convert a learning rate to the nearest power-of-two shift."""
+        if rate >= 1.0:
+            return 0
+        return int(min(15, max(0, round(-np.log2(max(rate, 1e-6))))))
+
+    def apply(self, image: np.ndarray, fgmask: Optional[np.ndarray] = None,
+              learningRate: float = -1) -> np.ndarray:
+        """Update the background and return the thresholded difference mask."""
+        if fgmask is None or fgmask.shape != image.shape:
+            fgmask = np.empty_like(image)
+
+        if self._background is None or self._background.shape != image.shape:
+            self._background = image.astype(np.int32) << self.FRACTION_BITS
+            self._delta = np.empty_like(self._background)
+            fgmask.fill(0)
+            return fgmask
+
+        # delta = (frame << 8) - background
+        delta = self._delta
+        np.copyto(delta, image)
+        delta <<= self.FRACTION_BITS
+        delta -= self._background
+
+        # Foreground where |delta| exceeds the threshold (in fixed point)
+        limit = self.threshold << self.FRACTION_BITS
+        np.greater(np.abs(delta), limit, out=fgmask, casting='unsafe')
+        fgmask *= 255
+
+        shift = self.shift if learningRate < 0 else self._rate_to_shift(learningRate)
+        delta >>= shift
+        self._background += delta
+
+        return fgmask
+
+    def getBackgroundImage(self) -> Optional[np.ndarray]:
+        """Return the current background estimate as uint8."""
+        if self._background is None:
+            return None
+        return (self._background >> self.FRACTION_BITS).astype(np.uint8)
+
+
+@dataclass
+class BackgroundBackend:
+    """A registered background model backend."""
+    factory: Callable[['MotionConfig'], BackgroundModel]
+    learning_rate: Callable[['MotionConfig'], float]  # Per-frame rate the backend uses by default
+
+
+def _history_rate(config: 'MotionConfig') -> float:
+    """Steady-state learning rate of the history-based OpenCV subtractors."""
+    return 1.0 / max(1, config.mog2_history)
+
+
+def _alpha_rate(config: 'MotionConfig') -> float:
+    """Learning rate of the frame-differencing backends."""
+    return config.background_alpha
+
+
+_BACKENDS: Dict[str, BackgroundBackend] = {}
+
+
+def register_background_backend(name: str, factory: Callable[['MotionConfig'], BackgroundModel],
+                                learning_rate: Optional[Callable[['MotionConfig'], float]] = None) -> None:
+    """
+    Register a background model backend.
+
+    Args:
+        name: Backend name used in MotionConfig.background_backend / camera_backends
+        factory: Callable building a new model from a MotionConfig
+        learning_rate: Callable returning the backend's default per-frame
+            learning rate (defaults to 1 / mog2_history)
+    """
+    _BACKENDS[name] = BackgroundBackend(factory, learning_rate or _history_rate)
+
+
+def available_backends() -> List[str]:
+    """Get the names of all registered background backends."""
+    return sorted(_BACKENDS)
+
+
+def get_background_backend(name: str) -> BackgroundBackend:
+    """
+    Look up a registered backend.
+
+    Raises:
+        ValueError: If no backend with that name is registered
+    """
+    if name not in _BACKENDS:
+        raise ValueError(f"Unknown background backend '{name}'. Available: {available_backends()}")
+    return _BACKENDS[name]
+
+
+def create_background_model(name: str, config: 'MotionConfig') -> BackgroundModel:
+    """
+    Create a background model with the named backend.
+
+    Raises:
+        ValueError: If no backend with that name is registered
+    """
+    return get_background_backend(name).factory(config)
+
+
+register_background_backend(
+    "mog2",
+    lambda config: cv2.createBackgroundSubtractorMOG2(
+        history=config.mog2_history,
+        varThreshold=config.mog2_var_threshold,
+        detectShadows=config.mog2_detect_shadows
+    )
+)
+register_background_backend(
+    "knn",
+    lambda config: cv2.createBackgroundSubtractorKNN(
+        history=config.mog2_history,
+        dist2Threshold=config.knn_dist2_threshold,
+        detectShadows=config.mog2_detect_shadows
+    )
+)
+register_background_backend(
+    "running_average",
+    lambda config: RunningAverageSubtractor(config.background_alpha, config.sensitivity),
+    _alpha_rate
+)
+register_background_backend(
+    "fixed_point",
+    lambda config: FixedPointSubtractor(config.background_alpha, config.sensitivity),
+    _alpha_rate
+)
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Detection Pipeline Benchmark for Nutflix Common
+Streams video files or synthetic frames through MotionDetector and reports JSON metrics
+
+Example:
+    nutflix-bench --synthetic 600 --cameras 2 --output bench.json
+    nutflix-bench --video sample_clips/camera1.mp4 --config config.yaml
+    nutflix-bench --synthetic 300 --compare-buffers
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, replace
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from . import __version__
+from .config_loader import load_config
+from .logger import set_global_log_level
+from .media_utils import find_clips
+from .motion_utils import MotionConfig, MotionDetector
+from .param_sweep import parse_param
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# A frame stream: (camera_id, frames, nominal fps)
+Stream = Tuple[str, Iterator[np.ndarray], float]
+
+
+def synthetic_frames(count: int, width: int, height: int, seed: int = 0) -> Iterator[np.ndarray]:
+    """
+    Generate repeatable BGR frames: sensor-like noise with a square crossing the scene.
+
+    The square is only present in some stretches so the detector sees both
+    quiet and active periods.
+    """
+    rng = np.random.default_rng(seed)
+    background = cv2.GaussianBlur(rng.integers(0, 200, (height, width, 3), dtype=np.uint8), (21, 21), 0)
+    size = max(8, min(width, height) // 6)
+    for i in range(count):
+        frame = cv2.add(background, rng.integers(0, 6, (height, width, 3), dtype=np.uint8))
+        if (i // 60) % 2 == 1:
+            x = (i * 9) % max(1, width - size)
+            y = height // 2 - size // 2
+            frame[y:y + size, x:x + size] = 230
+        yield frame
+
+
+def video_frames(path: str, max_frames: Optional[int] = None) -> Iterator[np.ndarray]:
+    """Decode frames from a video file."""
+    capture = cv2.VideoCapture(path)
+    try:
+        count = 0
+        while max_frames is None or count < max_frames:
+            ok, frame = capture.read()
+            if not ok:
+                break
+            count += 1
+            yield frame
+    finally:
+        capture.release()
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB, if the platform reports it."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_benchmark(config: MotionConfig, streams: List[Stream], warmup: int = 30) -> Dict[str, Any]:
+    """
+    Interleave the streams frame by frame through one MotionDetector.
+
+    Frames are stamped with their nominal capture time (index / fps), so
+    cooldowns behave as they would live however fast the benchmark runs.
+    Frames returned early by the cooldown or the idle skip take microseconds,
+    so latency and detect_fps only count frames that ran the pipeline.
+
+    Args:
+        config: Detector configuration
+        streams: Camera streams to replay
+        warmup: Frames per camera excluded from the latency statistics
+
+    Returns:
+        Dictionary of benchmark metrics
+    """
+    detector = MotionDetector(config)
+    latencies: List[float] = []
+    frames_per_camera = {camera_id: 0 for camera_id, _, _ in streams}
+    start_time = time.time()
+
+    active = list(streams)
+    wall_start = time.perf_counter()
+    while active:
+        for stream in list(active):
+            camera_id, frames, fps = stream
+            frame = next(frames, None)
+            if frame is None:
+                active.remove(stream)
+                continue
+            index = frames_per_camera[camera_id]
+            analyzed = detector._frames_analyzed.get(camera_id, 0)
+            begin = time.perf_counter()
+            detector.process_frame(frame, camera_id, timestamp=start_time + index / fps)
+            elapsed = time.perf_counter() - begin
+            if index >= warmup and detector._frames_analyzed.get(camera_id, 0) > analyzed:
+                latencies.append(elapsed)
+            frames_per_camera[camera_id] = index + 1
+    wall_seconds = time.perf_counter() - wall_start
+    detector.close()
+
+    total_frames = sum(frames_per_camera.values())
+    cameras = {}
+    for camera_id in frames_per_camera:
+        stats = detector.get_camera_stats(camera_id)
+        cameras[camera_id] = {
+            'frames': frames_per_camera[camera_id],
+            'frames_analyzed': stats['frames_analyzed'],  # Excludes cooldown and idle-skipped frames
+            'motion_events': stats['motion_events_total'],
+            'lighting_changes': stats['lighting_changes'],
+            'stage_timing': stats['timing'],
+        }
+
+    latency_ms = np.array(latencies) * 1000
+    return {
+        'frames': total_frames,
+        'analyzed_frames': sum(camera['frames_analyzed'] for camera in cameras.values()),
+        'measured_frames': len(latencies),  # Analysed frames after the warmup
+        'detect_fps': round(len(latencies) / (latency_ms.sum() / 1000), 2) if len(latencies) else None,
+        'wall_fps': round(total_frames / wall_seconds, 2) if wall_seconds > 0 else None,
+        'latency_ms': {
+            'mean': round(float(latency_ms.mean()), 3),
+            'p50': round(float(np.percentile(latency_ms, 50)), 3),
+            'p95': round(float(np.percentile(latency_ms, 95)), 3),
+            'p99': round(float(np.percentile(latency_ms, 99)), 3),
+            'max': round(float(latency_ms.max()), 3),
+        } if len(latencies) else None,
+        'peak_rss_mb': peak_rss_mb(),
+        'motion_events': sum(camera['motion_events'] for camera in cameras.values()),
+        'cameras': cameras,
+    }
+
+
+def compare_buffer_reuse(config: MotionConfig, frames: Sequence[np.ndarray], warmup: int = 10) -> Dict[str, Any]:
+    """
+    Measure per-frame latency and transient allocations with and without reuse_buffers.
+
+    Args:
+        config: Detector configuration (cooldown is disabled so every frame is analysed)
+        frames: BGR frames of one camera
+        warmup: Frames processed before measuring, so background models and buffers exist
+
+    Returns:
+        Dictionary with 'fresh' and 'reused' metrics
+    """
+    report: Dict[str, Any] = {'frames': max(0, len(frames) - warmup)}
+    for name, reuse in (("fresh", False), ("reused", True)):
+        detector = MotionDetector(replace(config, reuse_buffers=reuse, cooldown=0.0))
+        for frame in frames[:warmup]:
+            detector.process_frame(frame, "bench")
+
+        transient_bytes = []
+        tracemalloc.start()
+        try:
+            for frame in frames[warmup:]:
+                tracemalloc.reset_peak()
+                baseline = tracemalloc.get_traced_memory()[0]
+                detector.process_frame(frame, "bench")
+                transient_bytes.append(tracemalloc.get_traced_memory()[1] - baseline)
+        finally:
+            tracemalloc.stop()
+
+        # tracemalloc slows every allocation down, so time a second pass without it
+        latencies = []
+        for frame in frames[warmup:]:
+            begin = time.perf_counter()
+            detector.process_frame(frame, "bench")
+            latencies.append(time.perf_counter() - begin)
+        detector.close()
+
+        latency_ms = np.array(latencies) * 1000
+        report[name] = {
+            'mean_ms': round(float(latency_ms.mean()), 3) if len(latencies) else None,
+            'p95_ms': round(float(np.percentile(latency_ms, 95)), 3) if len(latencies) else None,
+            'transient_alloc_kb_per_frame': round(float(np.mean(transient_bytes)) / 1024, 1)
+                                            if transient_bytes else None,
+        }
+    return report
+
+
+def environment_info() -> Dict[str, str]:
+    """Versions and platform details that affect the numbers."""
+    return {
+        'nutflix_common': __version__,
+        'python': platform.python_version(),
+        'opencv': cv2.__version__,
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'platform': platform.platform(),
+        'cpu_count': str(os.cpu_count()),
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark the MotionDetector pipeline without a GUI")
+    parser.add_argument("--video", nargs="+", default=[],
+                        help="Video files or directories to replay (one camera per file)")
+    parser.add_argument("--synthetic", type=int, default=None, metavar="FRAMES",
+                        help="Generate this many synthetic frames per camera (default: 600 without --video)")
+    parser.add_argument("--cameras", type=int, default=1, help="Synthetic camera streams (default: 1)")
+    parser.add_argument("--width", type=int, default=640, help="Synthetic frame width")
+    parser.add_argument("--height", type=int, default=480, help="Synthetic frame height")
+    parser.add_argument("--fps", type=float, default=30.0, help="Nominal synthetic frame rate for timestamps")
+    parser.add_argument("--max-frames", type=int, default=None, help="Only replay the first N frames of each video")
+    parser.add_argument("--warmup", type=int, default=30, help="Frames per camera excluded from latency stats")
+    parser.add_argument("--config", help="Config file whose motion_detection section is used")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE",
+                        help="Override a MotionConfig field, e.g. analysis_mode=components (repeatable)")
+    parser.add_argument("--compare-buffers", action="store_true",
+                        help="Compare latency and allocations with and without reuse_buffers on the first stream")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    set_global_log_level("WARNING")
+
+    config_dict = load_config(args.config).get('motion_detection', {}) if args.config else {}
+    # Never prime from or overwrite the deployment's reference frames, and keep
+    # runs cold so they are comparable; --set warm_start_dir=... opts back in
+    config_dict['warm_start_dir'] = None
+    try:
+        for spec in args.set:
+            name, values = parse_param(spec)
+            config_dict[name] = values[0] if len(values) == 1 else values
+    except ValueError as e:
+        parser.error(str(e))
+    config = MotionConfig.from_dict(config_dict)
+
+    streams: List[Stream] = []
+    videos = find_clips(args.video)
+    if args.video and not videos:
+        parser.error(f"No video files found in {args.video}")
+    for path in videos:
+        capture = cv2.VideoCapture(path)
+        fps = capture.get(cv2.CAP_PROP_FPS) or 30.0
+        capture.release()
+        streams.append((os.path.basename(path), video_frames(path, args.max_frames), fps))
+    synthetic = args.synthetic if args.synthetic is not None else (0 if videos else 600)
+    for camera in range(args.cameras if synthetic else 0):
+        streams.append((f"synthetic_{camera}",
+                        synthetic_frames(synthetic, args.width, args.height, seed=camera), args.fps))
+    if args.compare_buffers and not streams:
+        parser.error("--compare-buffers needs a stream: pass --video or a non-zero --synthetic")
+
+    report = {
+        'environment': environment_info(),
+        'source': {
+            'videos': videos,
+            'synthetic_frames': synthetic,
+            'synthetic_cameras': args.cameras if synthetic else 0,
+            'synthetic_size': [args.width, args.height] if synthetic else None,
+        },
+        'config': asdict(config),
+    }
+    if args.compare_buffers:
+        report['buffer_reuse'] = compare_buffer_reuse(config, list(streams[0][1]), args.warmup)
+    else:
+        report['results'] = run_benchmark(config, streams, args.warmup)
+    text = json.dumps(report, indent=2, default=str)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(text + "\n")
+        if args.compare_buffers:
+            fresh, reused = report['buffer_reuse']['fresh'], report['buffer_reuse']['reused']
+            print(f"fresh arrays {fresh['mean_ms']} ms and {fresh['transient_alloc_kb_per_frame']} KB/frame, "
+                  f"reused buffers {reused['mean_ms']} ms and {reused['transient_alloc_kb_per_frame']} KB/frame, "
+                  f"report written to {args.output}")
+        else:
+            results = report['results']
+            print(f"{results['frames']} frames at {results['detect_fps']} fps "
+                  f"(p95 {results['latency_ms']['p95'] if results['latency_ms'] else '-'} ms), "
+                  f"report written to {args.output}")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
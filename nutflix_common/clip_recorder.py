@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Motion Clip Recorder for Nutflix Common
+Records motion-triggered clips that include a JPEG-compressed pre-roll
+"""
+
+import os
+import queue
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .logger import get_logger
+from .motion_utils import MotionEvent
+
+# Get logger for this module
+logger = get_logger("recorder")
+
+
+@dataclass
+class _CameraState:
+    """Encoder-thread state for one camera."""
+    pre_roll: Deque[Tuple[float, bytes]] = field(default_factory=deque)  # (timestamp, JPEG)
+    pre_roll_bytes: int = 0
+    last_accepted: float = float("-inf")   # Timestamp of the last frame taken for encoding
+    clip_id: Optional[int] = None          # Clip currently being recorded
+    clip_start: float = 0.0
+    clip_end: float = 0.0                  # Record frames up to this timestamp
+    frames_dropped: int = 0
+    clips_saved: int = 0
+    last_clip_path: Optional[str] = None
+
+
+class ClipRecorder:
+    """
+    Motion-triggered clip recorder.
+
+    add_frame() only queues the frame. An encoder thread JPEG-encodes it into a
+    per-camera pre-roll ring bounded by pre_roll_seconds and max_pre_roll_bytes,
+    about 50 KB per 640x480 frame instead of 900 KB raw. When a MotionEvent
+    arrives (on_motion_event() can be a MotionDetector subscriber), the pre-roll
+    and the following post_roll_seconds of frames are handed to a writer thread
+    that decodes them into a cv2.VideoWriter. Both hand-offs are bounded queues
+    and frames are offered to them without blocking, so memory stays fixed and a
+    slow disk drops (and counts) frames instead of stalling the encoder or capture.
+    Only the small clip open/close messages wait for queue space.
+    """
+
+    def __init__(self, output_dir: str, pre_roll_seconds: float = 3.0, post_roll_seconds: float = 5.0,
+                 fps: float = 15.0, jpeg_quality: int = 80, max_pre_roll_bytes: int = 8 * 1024 * 1024,
+                 max_clip_seconds: float = 60.0, max_pending_frames: int = 16, fourcc: str = "MJPG",
+                 extension: str = ".avi", on_clip_saved: Optional[Callable[[str, str], None]] = None):
+        """
+        Create the recorder and start its encoder and writer threads.
+
+        Args:
+            output_dir: Directory clips are written to (one subdirectory per camera)
+            pre_roll_seconds: Seconds of video kept from before the trigger
+            post_roll_seconds: Seconds recorded after the last motion event
+            fps: Frame rate clips are sampled and written at
+            jpeg_quality: JPEG quality (0-100) of the buffered frames
+            max_pre_roll_bytes: Upper bound on each camera's pre-roll memory
+            max_clip_seconds: Longest clip before it is closed even if motion continues
+            max_pending_frames: Raw frames waiting for the encoder before new ones are dropped
+            fourcc: VideoWriter codec
+            extension: Clip file extension matching the codec's container
+            on_clip_saved: Called with (camera_id, path) when a clip is finished
+        """
+        self.output_dir = output_dir
+        self.pre_roll_seconds = pre_roll_seconds
+        self.post_roll_seconds = post_roll_seconds
+        self.fps = fps
+        self.max_pre_roll_bytes = max_pre_roll_bytes
+        self.max_clip_seconds = max_clip_seconds
+        self.fourcc = fourcc
+        self.extension = extension
+        self.on_clip_saved = on_clip_saved
+        self._encode_params = [int(cv2.IMWRITE_JPEG_QUALITY), int(jpeg_quality)]
+
+        self._cameras: Dict[str, _CameraState] = {}
+        self._triggers: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._next_clip_id = 1
+        self._closed = False
+
+        self._frames: "queue.Queue" = queue.Queue(maxsize=max(1, max_pending_frames))
+        # Room for a full pre-roll plus two seconds of live frames
+        self._clips: "queue.Queue" = queue.Queue(maxsize=max(16, int((pre_roll_seconds + 2.0) * fps)))
+        self._encoder = threading.Thread(target=self._encoder_loop, name="nutflix-clip-encoder", daemon=True)
+        self._writer = threading.Thread(target=self._writer_loop, name="nutflix-clip-writer", daemon=True)
+        self._encoder.start()
+        self._writer.start()
+
+        logger.info(f"Clip recorder writing to {output_dir} ({pre_roll_seconds}s pre-roll, "
+                    f"{post_roll_seconds}s post-roll at {fps} fps)")
+
+    def _get_camera(self, camera_id: str) -> _CameraState:
+        """Get or create a camera's state."""
+        with self._lock:
+            state = self._cameras.get(camera_id)
+            if state is None:
+                state = self._cameras[camera_id] = _CameraState()
+            return state
+
+    def add_frame(self, camera_id: str, frame: Optional[np.ndarray], timestamp: Optional[float] = None) -> bool:
+        """
+        Offer a frame to the recorder without blocking.
+
+        Frames arriving faster than fps are skipped. The frame is encoded later
+        on the encoder thread, so it must not be modified after this call.
+
+        Returns:
+            True if the frame was queued for encoding
+        """
+        if self._closed or frame is None:
+            return False
+        timestamp = time.time() if timestamp is None else timestamp
+        state = self._get_camera(camera_id)
+        # 1 ms slack so e.g. every third 30 fps frame is taken for a 10 fps clip
+        if timestamp - state.last_accepted < 1.0 / self.fps - 0.001:
+            return False
+        try:
+            self._frames.put_nowait((camera_id, frame, timestamp))
+        except queue.Full:
+            state.frames_dropped += 1
+            return False
+        state.last_accepted = timestamp
+        return True
+
+    def add_frames(self, frames: Dict[str, Optional[np.ndarray]], timestamp: Optional[float] = None) -> None:
+        """Offer one frame per camera, e.g. the output of CameraManager.read_frames()."""
+        timestamp = time.time() if timestamp is None else timestamp
+        for camera_id, frame in frames.items():
+            self.add_frame(camera_id, frame, timestamp)
+
+    def on_motion_event(self, event: MotionEvent) -> None:
+        """
+        Start a clip for the event's camera, or extend the one being recorded.
+
+        Safe to call from any thread, e.g. as a MotionDetector subscriber.
+        """
+        with self._lock:
+            self._triggers[event.camera_id] = max(event.timestamp, self._triggers.get(event.camera_id, 0.0))
+
+    def _encoder_loop(self) -> None:
+        """Encoder thread: JPEG-encode frames into the pre-roll and any active clip."""
+        while True:
+            item = self._frames.get()
+            if item is None:
+                break
+            camera_id, frame, timestamp = item
+            ok, encoded = cv2.imencode(".jpg", frame, self._encode_params)
+            if not ok:
+                logger.warning(f"Failed to encode frame from {camera_id}")
+                continue
+            self._handle_encoded(camera_id, timestamp, encoded.tobytes())
+
+        # Close clips still recording at shutdown
+        for camera_id, state in self._cameras.items():
+            if state.clip_id is not None:
+                self._finish_clip(camera_id, state)
+        self._clips.put(None)
+
+    def _handle_encoded(self, camera_id: str, timestamp: float, jpeg: bytes) -> None:
+        """Add an encoded frame to the pre-roll and route it to the active clip."""
+        state = self._get_camera(camera_id)
+        with self._lock:
+            trigger = self._triggers.pop(camera_id, None)
+
+        if state.clip_id is not None:
+            if trigger is not None:
+                state.clip_end = max(state.clip_end, trigger + self.post_roll_seconds)
+            if timestamp > state.clip_end or timestamp - state.clip_start > self.max_clip_seconds:
+                self._finish_clip(camera_id, state)
+            else:
+                self._queue_clip_frame(state, jpeg)
+
+        if state.clip_id is None and trigger is not None:
+            self._start_clip(camera_id, state, trigger)
+            self._queue_clip_frame(state, jpeg)
+
+        # The pre-roll keeps the last pre_roll_seconds, within its byte budget
+        state.pre_roll.append((timestamp, jpeg))
+        state.pre_roll_bytes += len(jpeg)
+        while state.pre_roll and (state.pre_roll[0][0] < timestamp - self.pre_roll_seconds
+                                  or state.pre_roll_bytes > self.max_pre_roll_bytes):
+            state.pre_roll_bytes -= len(state.pre_roll.popleft()[1])
+
+    def _start_clip(self, camera_id: str, state: _CameraState, trigger: float) -> None:
+        """Open a clip and queue the camera's pre-roll into it."""
+        with self._lock:
+            clip_id = self._next_clip_id
+            self._next_clip_id += 1
+        state.clip_id = clip_id
+        state.clip_start = trigger
+        state.clip_end = trigger + self.post_roll_seconds
+
+        safe_id = re.sub(r'[^A-Za-z0-9_.-]', '_', camera_id)
+        name = time.strftime("%Y%m%d-%H%M%S", time.localtime(trigger)) + f"-{clip_id}{self.extension}"
+        path = os.path.join(self.output_dir, safe_id, name)
+        self._clips.put(("open", clip_id, (camera_id, path)))
+        for _, jpeg in state.pre_roll:
+            self._queue_clip_frame(state, jpeg)
+        state.last_clip_path = path
+        logger.info(f"Recording motion clip for {camera_id}: {path}")
+
+    def _queue_clip_frame(self, state: _CameraState, jpeg: bytes) -> None:
+        """Hand a frame of the current clip to the writer, dropping it if the writer is behind."""
+        try:
+            self._clips.put_nowait(("frame", state.clip_id, jpeg))
+        except queue.Full:
+            state.frames_dropped += 1
+
+    def _finish_clip(self, camera_id: str, state: _CameraState) -> None:
+        """Queue the end of the camera's current clip."""
+        self._clips.put(("close", state.clip_id, None))
+        state.clip_id = None
+
+    def _writer_loop(self) -> None:
+        """Writer thread: decode queued JPEGs into VideoWriters."""
+        writers: Dict[int, Any] = {}
+        paths: Dict[int, Tuple[str, str]] = {}
+        while True:
+            item = self._clips.get()
+            if item is None:
+                break
+            kind, clip_id, payload = item
+            if kind == "open":
+                paths[clip_id] = payload
+            elif kind == "frame":
+                try:
+                    frame = cv2.imdecode(np.frombuffer(payload, dtype=np.uint8), cv2.IMREAD_COLOR)
+                    if frame is None:
+                        logger.warning(f"Skipping undecodable frame in clip {clip_id}")
+                        continue
+                    writer = writers.get(clip_id)
+                    if writer is None and clip_id in paths:
+                        writer = self._open_writer(paths[clip_id][1], frame.shape)
+                        if writer is None:
+                            # Skip the rest of the clip rather than writing into a dead writer
+                            paths.pop(clip_id)
+                            continue
+                        writers[clip_id] = writer
+                    if writer is not None:
+                        writer.write(frame)
+                except Exception as e:
+                    logger.error(f"Failed to write frame to clip {clip_id}: {e}")
+            elif kind == "close":
+                writer = writers.pop(clip_id, None)
+                camera_id, path = paths.pop(clip_id, (None, None))
+                if writer is not None:
+                    try:
+                        writer.release()
+                    except Exception as e:
+                        logger.error(f"Failed to finish clip {path}: {e}")
+                        continue
+                    with self._lock:
+                        state = self._cameras.get(camera_id)
+                    if state is not None:
+                        state.clips_saved += 1
+                    logger.info(f"Saved motion clip {path}")
+                    if self.on_clip_saved is not None:
+                        try:
+                            self.on_clip_saved(camera_id, path)
+                        except Exception as e:
+                            logger.error(f"Clip callback failed for {path}: {e}")
+
+        for writer in writers.values():
+            writer.release()
+
+    def _open_writer(self, path: str, shape: Tuple[int, ...]) -> Optional[Any]:
+        """Create the VideoWriter for a clip, or None if it could not be opened."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*self.fourcc), self.fps, (shape[1], shape[0]))
+        if not writer.isOpened():
+            logger.error(f"Could not open video writer for {path}, skipping clip")
+            writer.release()
+            return None
+        return writer
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-camera recorder statistics."""
+        with self._lock:
+            cameras = dict(self._cameras)
+        return {
+            camera_id: {
+                'pre_roll_frames': len(state.pre_roll),
+                'pre_roll_bytes': state.pre_roll_bytes,
+                'recording': state.clip_id is not None,
+                'frames_dropped': state.frames_dropped,
+                'clips_saved': state.clips_saved,
+                'last_clip_path': state.last_clip_path,
+            }
+            for camera_id, state in cameras.items()
+        }
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """Encode queued frames, finish open clips and stop the threads."""
+        if self._closed:
+            return
+        self._closed = True
+        self._frames.put(None)
+        self._encoder.join(timeout)
+        self._writer.join(timeout)
+        logger.info("Clip recorder closed")
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit - finish clips and stop threads."""
+        self.close()
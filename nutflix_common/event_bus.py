@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Motion Event Bus for Nutflix Common
+Delivers motion events to subscribers through bounded per-subscriber queues
+"""
+
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .logger import get_logger
+from .motion_utils import MotionEvent
+
+# Get logger for this module
+logger = get_logger("events")
+
+# Backpressure policies for a full subscriber queue
+DROP_OLDEST = "drop_oldest"   # Discard the oldest queued event to make room
+DROP_NEWEST = "drop_newest"   # Discard the event being published
+_POLICIES = (DROP_OLDEST, DROP_NEWEST)
+
+
+class Subscription:
+    """
+    A subscriber's queue and dispatcher thread.
+
+    Each subscription drains its own bounded queue, so a slow subscriber only
+    ever drops its own events and never delays the publisher or other subscribers.
+    """
+
+    def __init__(self, callback: Callable[[MotionEvent], Any], name: str, max_queue: int,
+                 policy: str, camera_ids: Optional[Iterable[str]] = None):
+        if policy not in _POLICIES:
+            raise ValueError(f"Unknown backpressure policy '{policy}'. Available: {list(_POLICIES)}")
+        self.callback = callback
+        self.name = name
+        self.max_queue = max(1, max_queue)
+        self.policy = policy
+        self.camera_ids = frozenset(camera_ids) if camera_ids is not None else None
+
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+
+        self._queue: deque = deque()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._dispatch_loop, name=f"nutflix-bus-{name}", daemon=True)
+        self._thread.start()
+
+    def offer(self, event: MotionEvent) -> bool:
+        """
+        Queue an event without blocking, applying the backpressure policy.
+
+        Returns:
+            True if the event was queued
+        """
+        if self.camera_ids is not None and event.camera_id not in self.camera_ids:
+            return False
+        with self._condition:
+            if self._closed:
+                return False
+            if len(self._queue) >= self.max_queue:
+                self.dropped += 1
+                if self.dropped % 100 == 1:
+                    logger.warning(f"Subscriber '{self.name}' is falling behind, "
+                                   f"{self.dropped} events dropped so far")
+                if self.policy == DROP_NEWEST:
+                    return False
+                self._queue.popleft()
+            self._queue.append(event)
+            self._condition.notify()
+        return True
+
+    def _dispatch_loop(self) -> None:
+        """Dispatcher thread: hand queued events to the callback one by one."""
+        while True:
+            with self._condition:
+                while not self._queue and not self._closed:
+                    self._condition.wait()
+                if not self._queue:
+                    return
+                event = self._queue.popleft()
+            try:
+                self.callback(event)
+                self.delivered += 1
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Subscriber '{self.name}' failed on event from {event.camera_id}: {e}")
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Deliver the events already queued, then stop the dispatcher thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get delivery statistics for this subscriber."""
+        return {
+            'delivered': self.delivered,
+            'dropped': self.dropped,
+            'errors': self.errors,
+            'queued': len(self._queue),
+            'policy': self.policy,
+        }
+
+
+class MotionEventBus:
+    """
+    Publish/subscribe hub for MotionEvents.
+
+    publish() only appends to each subscriber's bounded queue and returns
+    immediately, so it is safe to call from the capture/detect loop.
+    """
+
+    def __init__(self):
+        """Initialize an empty bus."""
+        self._subscriptions: List[Subscription] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def subscribe(self, callback: Callable[[MotionEvent], Any], name: Optional[str] = None,
+                  max_queue: int = 100, policy: str = DROP_OLDEST,
+                  camera_ids: Optional[Iterable[str]] = None) -> Subscription:
+        """
+        Register a subscriber.
+
+        Args:
+            callback: Called with each MotionEvent on the subscriber's own thread
+            name: Name used in stats and logs (defaults to the callback's name)
+            max_queue: Events queued for this subscriber before the policy applies
+            policy: "drop_oldest" or "drop_newest" when the queue is full
+            camera_ids: Only deliver events from these cameras (all if None)
+
+        Returns:
+            The Subscription, for unsubscribe() and per-subscriber stats
+
+        Raises:
+            ValueError: If the policy is unknown or the bus is closed
+        """
+        if self._closed:
+            raise ValueError("Cannot subscribe to a closed event bus")
+        name = name or getattr(callback, "__name__", "subscriber")
+        subscription = Subscription(callback, name, max_queue, policy, camera_ids)
+        with self._lock:
+            self._subscriptions = self._subscriptions + [subscription]
+        logger.info(f"Subscriber '{name}' registered (queue={subscription.max_queue}, policy={policy})")
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription, timeout: Optional[float] = 5.0) -> None:
+        """Remove a subscriber after delivering its queued events."""
+        with self._lock:
+            self._subscriptions = [s for s in self._subscriptions if s is not subscription]
+        subscription.close(timeout)
+
+    def publish(self, event: MotionEvent) -> int:
+        """
+        Offer an event to every subscriber without blocking.
+
+        Returns:
+            Number of subscribers the event was queued for
+        """
+        # Copy-on-write list: iterate without holding the lock
+        return sum(subscription.offer(event) for subscription in self._subscriptions)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get delivery statistics per subscriber name."""
+        return {subscription.name: subscription.get_stats() for subscription in self._subscriptions}
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Deliver queued events and stop all subscriber threads."""
+        if self._closed:
+            return
+        self._closed = True
+        with self._lock:
+            subscriptions, self._subscriptions = self._subscriptions, []
+        for subscription in subscriptions:
+            subscription.close(timeout)
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit - drain and stop subscribers."""
+        self.close()
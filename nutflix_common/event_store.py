@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Motion Event Store for Nutflix Common
+Durable SQLite storage for motion events with batched background writes
+"""
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .logger import get_logger
+from .motion_utils import MotionEvent
+
+# Get logger for this module
+logger = get_logger("events")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS motion_events (
+    id INTEGER PRIMARY KEY,
+    camera_id TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    contour_count INTEGER NOT NULL,
+    largest_contour_area REAL NOT NULL,
+    frame_width INTEGER NOT NULL,
+    frame_height INTEGER NOT NULL,
+    boxes TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_motion_events_camera_time
+    ON motion_events (camera_id, timestamp);
+"""
+
+_INSERT = """
+INSERT INTO motion_events
+    (camera_id, timestamp, contour_count, largest_contour_area, frame_width, frame_height, boxes)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+class MotionEventStore:
+    """
+    SQLite-backed motion event sink.
+
+    write() only enqueues the event; a background thread inserts queued events
+    in batches, committing when batch_size events are pending or flush_interval
+    seconds have passed. The database runs in WAL mode with synchronous=NORMAL,
+    so there is no fsync per event and readers never block the writer.
+    """
+
+    def __init__(self, db_path: str, batch_size: int = 100, flush_interval: float = 2.0,
+                 max_queue: int = 10000):
+        """
+        Open (or create) the event database and start the writer thread.
+
+        Args:
+            db_path: Path to the SQLite database file
+            batch_size: Commit once this many events are pending
+            flush_interval: Maximum seconds an event waits before being committed
+            max_queue: Maximum queued events; further writes are dropped
+        """
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._dropped = 0
+        self._written = 0
+        self._closed = False
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        # Create the schema up front so queries work before the first flush
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+        self._writer = threading.Thread(target=self._writer_loop, name="nutflix-event-store", daemon=True)
+        self._writer.start()
+
+        logger.info(f"Motion event store opened at {db_path} (batch={batch_size}, "
+                    f"flush every {flush_interval}s)")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with the store's pragmas applied."""
+        conn = sqlite3.connect(self.db_path, timeout=10.0)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def write(self, event: MotionEvent) -> bool:
+        """
+        Queue an event for storage without blocking.
+
+        Returns:
+            True if the event was queued, False if it was dropped
+        """
+        if self._closed:
+            return False
+        try:
+            self._queue.put_nowait(event)
+            return True
+        except queue.Full:
+            self._dropped += 1
+            if self._dropped % 100 == 1:
+                logger.warning(f"Event store queue full, {self._dropped} events dropped so far")
+            return False
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Commit all events queued so far.
+
+        Args:
+            timeout: Maximum seconds to wait, including for room in a full queue (None = no limit)
+
+        Returns:
+            True if the writer confirmed the flush within the timeout, False if
+            it timed out or the writer thread is no longer running
+        """
+        if self._closed:
+            return True
+        if not self._writer.is_alive():
+            logger.error("Event store writer thread is not running, cannot flush")
+            return False
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+
+        # Wait in slices so a writer that dies after the marker was queued cannot hang the caller
+        while not done.wait(0.5 if deadline is None else max(0.0, min(0.5, deadline - time.monotonic()))):
+            if not self._writer.is_alive() or (deadline is not None and time.monotonic() >= deadline):
+                return done.is_set()
+        return True
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """Flush pending events and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._writer.is_alive():
+            try:
+                self._queue.put(None, timeout=timeout)
+                self._writer.join(timeout)
+            except queue.Full:
+                logger.error("Event store queue still full, writer thread not stopped")
+        logger.info(f"Motion event store closed ({self._written} written, {self._dropped} dropped)")
+
+    def _writer_loop(self) -> None:
+        """Background thread: batch queued events into transactions."""
+        conn = self._connect()
+        batch: List[tuple] = []
+        waiters: List[threading.Event] = []
+        deadline = time.monotonic() + self.flush_interval
+        running = True
+
+        while running:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                if item is None:
+                    running = False
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(self._to_row(item))
+            except queue.Empty:
+                pass
+
+            if (not running or waiters or len(batch) >= self.batch_size
+                    or time.monotonic() >= deadline):
+                if batch:
+                    try:
+                        with conn:
+                            conn.executemany(_INSERT, batch)
+                        self._written += len(batch)
+                    except sqlite3.Error as e:
+                        logger.error(f"Failed to write {len(batch)} motion events: {e}")
+                    batch = []
+                for waiter in waiters:
+                    waiter.set()
+                waiters = []
+                deadline = time.monotonic() + self.flush_interval
+
+        conn.close()
+
+    @staticmethod
+    def _to_row(event: MotionEvent) -> tuple:
+        """Convert a MotionEvent to an insert row."""
+        boxes = json.dumps(event.boxes.tolist()) if event.boxes is not None else None
+        return (event.camera_id, event.timestamp, event.contour_count, event.largest_contour_area,
+                event.frame_shape[0], event.frame_shape[1], boxes)
+
+    @staticmethod
+    def _from_row(row: tuple) -> MotionEvent:
+        """Convert a query row back to a MotionEvent."""
+        camera_id, timestamp, count, area, width, height, boxes = row
+        return MotionEvent(
+            camera_id=camera_id,
+            timestamp=timestamp,
+            contour_count=count,
+            largest_contour_area=area,
+            frame_shape=(width, height),
+            boxes=np.array(json.loads(boxes), dtype=np.int32).reshape(-1, 4) if boxes else None
+        )
+
+    def query_events(self, camera_id: Optional[str] = None, start: Optional[float] = None,
+                     end: Optional[float] = None, limit: Optional[int] = None) -> List[MotionEvent]:
+        """
+        Get stored events in a time range, oldest first.
+
+        Only committed events are visible; call flush() first to include
+        events that are still queued.
+
+        Args:
+            camera_id: Only return events for this camera (optional)
+            start: Earliest timestamp to include (optional)
+            end: Latest timestamp to include (optional)
+            limit: Maximum number of events to return (optional)
+
+        Returns:
+            List of MotionEvent objects
+        """
+        sql = ("SELECT camera_id, timestamp, contour_count, largest_contour_area, "
+               "frame_width, frame_height, boxes FROM motion_events")
+        clauses, params = self._range_clauses(camera_id, start, end)
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY timestamp"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with closing(self._connect()) as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def count_events(self, start: Optional[float] = None,
+                     end: Optional[float] = None) -> Dict[str, int]:
+        """
+        Count stored events per camera in a time range.
+
+        Returns:
+            Dictionary mapping camera_id to event count
+        """
+        sql = "SELECT camera_id, COUNT(*) FROM motion_events"
+        clauses, params = self._range_clauses(None, start, end)
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " GROUP BY camera_id"
+
+        with closing(self._connect()) as conn:
+            return dict(conn.execute(sql, params).fetchall())
+
+    @staticmethod
+    def _range_clauses(camera_id: Optional[str], start: Optional[float],
+                       end: Optional[float]) -> tuple:
+        """Build WHERE clauses for an optional camera and time range."""
+        clauses, params = [], []
+        if camera_id is not None:
+            clauses.append("camera_id = ?")
+            params.append(camera_id)
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("timestamp <= ?")
+            params.append(end)
+        return clauses, params
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get writer statistics."""
+        return {
+            'written': self._written,
+            'dropped': self._dropped,
+            'queued': self._queue.qsize(),
+        }
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit - flush and stop the writer."""
+        self.close()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Latency Histograms for Nutflix Common
+Fixed-bucket latency histograms cheap enough to record every frame
+"""
+
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence
+
+# Bucket upper bounds in seconds: 10 per decade (~26% apart) from 10 us to 10 s
+_BUCKET_BOUNDS: List[float] = [10 ** (exponent / 10) for exponent in range(-50, 11)]
+
+
+class LatencyHistogram:
+    """
+    Latency histogram with fixed logarithmic buckets.
+
+    record() is a bisect plus a list increment, so it can run on every frame.
+    Percentiles are reported as the upper bound of the bucket they fall in
+    (capped at the largest sample), i.e. accurate to about one bucket width.
+    """
+
+    def __init__(self, bounds: Optional[Sequence[float]] = None):
+        """
+        Args:
+            bounds: Ascending bucket upper bounds in seconds (defaults to 10 us - 10 s,
+                10 buckets per decade). Slower samples go to an overflow bucket.
+        """
+        self.bounds = list(bounds) if bounds is not None else _BUCKET_BOUNDS
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Add one latency sample."""
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Get the latency below which a fraction q of the samples fall.
+
+        Args:
+            q: Fraction between 0 and 1 (e.g. 0.95)
+
+        Returns:
+            Latency in seconds, or None if there are no samples
+        """
+        if self.count == 0:
+            return None
+        rank = max(1, q * self.count)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                bound = self.bounds[index] if index < len(self.bounds) else self.max
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        """Get count, mean, p50/p95/p99 and max in milliseconds."""
+        def to_ms(seconds: Optional[float]) -> Optional[float]:
+            return None if seconds is None else round(1000 * seconds, 3)
+
+        return {
+            'count': self.count,
+            'mean_ms': to_ms(self.total / self.count) if self.count else None,
+            'p50_ms': to_ms(self.percentile(0.50)),
+            'p95_ms': to_ms(self.percentile(0.95)),
+            'p99_ms': to_ms(self.percentile(0.99)),
+            'max_ms': to_ms(self.max) if self.count else None,
+        }
+
+    def reset(self) -> None:
+        """Discard all samples."""
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+
+class StageTimings:
+    """
+    Per-stage latency histograms for one pipeline, timed with perf_counter.
+
+    Call start() when a frame enters the pipeline, lap(stage) as each stage
+    finishes and finish() when the frame is done; lap() charges the time
+    since the previous mark to the stage.
+    """
+
+    def __init__(self, stages: Sequence[str]):
+        """
+        Args:
+            stages: Names of the timed stages, in pipeline order
+        """
+        self.histograms: Dict[str, LatencyHistogram] = {stage: LatencyHistogram() for stage in stages}
+        self.histograms['total'] = LatencyHistogram()
+        self.frames = 0
+        self._first_frame: Optional[float] = None
+        self._last_frame: Optional[float] = None
+        self._start = 0.0
+        self._mark = 0.0
+
+    def start(self) -> None:
+        """Mark the start of a frame."""
+        self._start = self._mark = time.perf_counter()
+        if self._first_frame is None:
+            self._first_frame = self._start
+        self._last_frame = self._start
+        self.frames += 1
+
+    def lap(self, stage: str) -> None:
+        """Charge the time since the last mark to a stage."""
+        now = time.perf_counter()
+        self.histograms[stage].record(now - self._mark)
+        self._mark = now
+
+    def finish(self) -> None:
+        """Record the frame's total pipeline time."""
+        self.histograms['total'].record(time.perf_counter() - self._start)
+
+    def throughput(self) -> Optional[float]:
+        """Frames started per second of wall-clock time, or None before two frames."""
+        if self.frames < 2 or self._last_frame == self._first_frame:
+            return None
+        return (self.frames - 1) / (self._last_frame - self._first_frame)
+
+    def summary(self) -> Dict[str, object]:
+        """Get the per-stage summaries plus throughput_fps."""
+        stats: Dict[str, object] = {stage: histogram.summary()
+                                    for stage, histogram in self.histograms.items()}
+        throughput = self.throughput()
+        stats['throughput_fps'] = round(throughput, 2) if throughput is not None else None
+        return stats
+
+
+class _DisabledTimings:
+    """Stand-in for StageTimings when timing collection is switched off."""
+
+    def start(self) -> None:
+        pass
+
+    def lap(self, stage: str) -> None:
+        pass
+
+    def finish(self) -> None:
+        pass
+
+
+# Shared no-op timings object, so instrumented code needs no branches
+DISABLED_TIMINGS = _DisabledTimings()
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+Media Utilities for Nutflix Common
+Locating recorded clips for the offline tools (param_sweep, bench, INT8 calibration)
+"""
+
+import glob
+import os
+from typing import List, Sequence
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv')
+
+
+def find_clips(paths: Sequence[str]) -> List[str]:
+    """Expand files and directories into a sorted list of video files."""
+    clips = []
+    for path in paths:
+        if os.path.isdir(path):
+            for extension in VIDEO_EXTENSIONS:
+                clips.extend(glob.glob(os.path.join(path, f"*{extension}")))
+        elif os.path.exists(path):
+            clips.append(path)
+    return sorted(set(clips))
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Multiprocess Motion Engine for Nutflix Common
+Runs one MotionDetector per camera in its own process, fed through shared-memory frame slots
+"""
+
+import itertools
+import multiprocessing as mp
+import queue
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .logger import get_motion_logger
+from .motion_utils import MotionConfig, MotionDetector, MotionEvent
+
+# Get logger for this module
+logger = get_motion_logger()
+
+
+@dataclass
+class MotionResult:
+    """Result of processing one submitted frame in a camera worker."""
+    camera_id: str
+    sequence: int                          # Per-camera submission number
+    timestamp: float
+    motion_detected: bool
+    event: Optional[MotionEvent] = None    # Recorded event when motion was detected
+    stats: Optional[Dict[str, Any]] = None  # Camera stats when motion was detected
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """Attach to the engine's shared memory block from a worker process."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # Workers share the parent's resource tracker, so re-registering the
+    # block here is a no-op and the parent's unlink() stays the only cleanup
+    return shared_memory.SharedMemory(name=name)
+
+
+def _camera_worker(camera_id: str, config: MotionConfig, shm_name: str,
+                   frame_shape: Tuple[int, ...], slots: int,
+                   requests: "mp.Queue", results: "mp.Queue") -> None:
+    """
+    Worker process: run a MotionDetector over frames placed in shared memory.
+
+    Requests are (slot, sequence, timestamp, generation) tuples, the string
+    "stats", or None to stop. Replies are ("result", MotionResult, slot, generation)
+    or ("stats", camera_id, dict).
+    """
+    shm = _attach_shared_memory(shm_name)
+    frames = np.ndarray((slots,) + tuple(frame_shape), dtype=np.uint8, buffer=shm.buf)
+    detector = MotionDetector(config)
+
+    try:
+        while True:
+            request = requests.get()
+            if request is None:
+                break
+            if request == "stats":
+                results.put(("stats", camera_id, detector.get_camera_stats(camera_id)))
+                continue
+
+            slot, sequence, timestamp, generation = request
+            motion = detector.process_frame(frames[slot], camera_id, timestamp)
+            result = MotionResult(camera_id, sequence, timestamp, motion)
+            if motion:
+                result.event = detector.get_motion_events(camera_id)[-1]
+                result.stats = detector.get_camera_stats(camera_id)
+            results.put(("result", result, slot, generation))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        del frames
+        detector.close()
+        shm.close()
+
+
+class _CameraChannel:
+    """Parent-side state for one camera worker: shared frame slots, queue and process."""
+
+    # Every worker start gets a new generation, unique across channels, so
+    # results still queued from a replaced worker can be told apart
+    _generations = itertools.count(1)
+
+    def __init__(self, ctx, camera_id: str, config: MotionConfig,
+                 frame_shape: Tuple[int, ...], slots: int, results: "mp.Queue"):
+        self.camera_id = camera_id
+        self.frame_shape = frame_shape
+        self.slots = slots
+        self.shm = shared_memory.SharedMemory(create=True, size=slots * int(np.prod(frame_shape)))
+        self.frames = np.ndarray((slots,) + tuple(frame_shape), dtype=np.uint8, buffer=self.shm.buf)
+        self.free_slots = deque(range(slots))
+        self.generation = 0
+        self.sequence = 0
+        self.restarts = 0
+        self._ctx = ctx
+        self._config = config
+        self._results = results
+        self.requests: "mp.Queue" = None
+        self.process = None
+        self.start()
+
+    def start(self) -> None:
+        """Start (or restart) the worker process; all slots become free."""
+        self.requests = self._ctx.Queue()
+        self.free_slots = deque(range(self.slots))
+        self.generation = next(self._generations)
+        self.process = self._ctx.Process(
+            target=_camera_worker,
+            args=(self.camera_id, self._config, self.shm.name, self.frame_shape,
+                  self.slots, self.requests, self._results),
+            name=f"nutflix-motion-{self.camera_id}",
+            daemon=True
+        )
+        self.process.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Stop the worker and release the shared memory."""
+        if self.process is not None and self.process.is_alive():
+            self.requests.put(None)
+            self.process.join(timeout)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join(timeout)
+        del self.frames
+        self.shm.close()
+        self.shm.unlink()
+
+
+class MultiprocessMotionEngine:
+    """
+    Motion detection with one worker process per camera.
+
+    Frames are copied into per-camera shared-memory slots instead of being
+    pickled; only slot numbers go to the workers and only small MotionResult
+    objects come back. Each camera runs in its own process, so detection uses
+    all cores and a crashing pipeline is restarted without affecting the others.
+
+    Use submit_frames() from the capture loop and drain get_results() without
+    blocking, or call process_frames() for a synchronous round trip.
+    """
+
+    def __init__(self, config: Optional[MotionConfig] = None, slots_per_camera: int = 2,
+                 start_method: str = "spawn"):
+        """
+        Initialize the engine. Workers start lazily on each camera's first frame.
+
+        Args:
+            config: Motion detection configuration for every worker. Uses defaults if None.
+            slots_per_camera: Frames that may be in flight per camera; further
+                frames are dropped until a worker catches up
+            start_method: multiprocessing start method ("spawn" is safe with threads and Tk)
+        """
+        self.config = config or MotionConfig()
+        self.slots_per_camera = max(1, slots_per_camera)
+        self._ctx = mp.get_context(start_method)
+        self._results: "mp.Queue" = self._ctx.Queue()
+        self._channels: Dict[str, _CameraChannel] = {}
+        self._pending: List[MotionResult] = []
+        self._latest_stats: Dict[str, Dict[str, Any]] = {}
+        self._dropped: Dict[str, int] = {}
+        self._closed = False
+
+        logger.info(f"MultiprocessMotionEngine initialized ({self.slots_per_camera} slots per camera, "
+                    f"start method '{start_method}')")
+
+    def _get_channel(self, camera_id: str, frame_shape: Tuple[int, ...]) -> _CameraChannel:
+        """Get the camera's worker channel, (re)creating it for a new frame shape."""
+        channel = self._channels.get(camera_id)
+        if channel is not None and channel.frame_shape != frame_shape:
+            logger.info(f"Frame shape for {camera_id} changed to {frame_shape}, restarting worker")
+            channel.stop()
+            channel = None
+        if channel is None:
+            channel = _CameraChannel(self._ctx, camera_id, self.config, frame_shape,
+                                     self.slots_per_camera, self._results)
+            self._channels[camera_id] = channel
+            logger.info(f"Started motion worker for {camera_id} (pid {channel.process.pid})")
+        return channel
+
+    def submit(self, camera_id: str, frame: np.ndarray, timestamp: Optional[float] = None) -> bool:
+        """
+        Hand a frame to the camera's worker without waiting for the result.
+
+        Args:
+            camera_id: Unique identifier for the camera
+            frame: OpenCV frame (BGR format, uint8)
+            timestamp: Capture time of the frame (defaults to time.time())
+
+        Returns:
+            True if the frame was queued, False if it was dropped because all
+            of the camera's slots are still in flight
+        """
+        if self._closed or frame is None:
+            return False
+
+        channel = self._get_channel(camera_id, frame.shape)
+        self._check_worker(channel)
+        if not channel.free_slots:
+            self._dropped[camera_id] = self._dropped.get(camera_id, 0) + 1
+            return False
+
+        slot = channel.free_slots.popleft()
+        np.copyto(channel.frames[slot], frame)
+        channel.sequence += 1
+        channel.requests.put((slot, channel.sequence, time.time() if timestamp is None else timestamp,
+                              channel.generation))
+        return True
+
+    def submit_frames(self, frames: Dict[str, Optional[np.ndarray]],
+                      timestamp: Optional[float] = None) -> Dict[str, bool]:
+        """
+        Submit one frame per camera, e.g. the output of CameraManager.read_frames().
+
+        Returns:
+            Mapping of camera_id to whether the frame was queued
+        """
+        return {camera_id: self.submit(camera_id, frame, timestamp)
+                for camera_id, frame in frames.items()}
+
+    def get_results(self, timeout: float = 0.0) -> List[MotionResult]:
+        """
+        Collect finished results.
+
+        Args:
+            timeout: Seconds to wait for the first result (0 = don't block)
+
+        Returns:
+            List of MotionResult objects in completion order
+        """
+        results, self._pending = self._pending, []
+        block = timeout > 0 and not results
+        while True:
+            try:
+                message = self._results.get(timeout=timeout) if block else self._results.get_nowait()
+            except queue.Empty:
+                break
+            block = False
+            if message[0] == "stats":
+                self._latest_stats[message[1]] = message[2]
+            else:
+                result = self._complete(*message[1:])
+                if result is not None:
+                    results.append(result)
+
+        for channel in self._channels.values():
+            self._check_worker(channel)
+        return results
+
+    def _complete(self, result: MotionResult, slot: int, generation: int) -> Optional[MotionResult]:
+        """
+        Free the slot a result was computed from.
+
+        Returns:
+            The result, or None if it came from a worker that has since been
+            replaced (its slot number refers to the old shared memory)
+        """
+        channel = self._channels.get(result.camera_id)
+        if channel is None or channel.generation != generation:
+            logger.debug(f"Dropping stale result {result.sequence} from a replaced "
+                         f"{result.camera_id} worker")
+            return None
+        if slot not in channel.free_slots:
+            channel.free_slots.append(slot)
+        if result.stats is not None:
+            self._latest_stats[result.camera_id] = result.stats
+        return result
+
+    def process_frames(self, frames: Dict[str, Optional[np.ndarray]],
+                       timestamp: Optional[float] = None, timeout: float = 5.0) -> Dict[str, bool]:
+        """
+        Submit one frame per camera and wait for their results.
+
+        Returns:
+            Mapping of camera_id to True if motion was detected, False otherwise
+        """
+        submitted = self.submit_frames(frames, timestamp)
+        waiting = {camera_id: self._channels[camera_id].sequence
+                   for camera_id, queued in submitted.items() if queued}
+        motion = {camera_id: False for camera_id in frames}
+
+        deadline = time.monotonic() + timeout
+        while waiting and time.monotonic() < deadline:
+            for result in self.get_results(timeout=max(0.001, deadline - time.monotonic())):
+                if waiting.get(result.camera_id) == result.sequence:
+                    motion[result.camera_id] = result.motion_detected
+                    del waiting[result.camera_id]
+                else:
+                    self._pending.append(result)
+
+        if waiting:
+            logger.warning(f"Timed out waiting for motion results from: {sorted(waiting)}")
+        return motion
+
+    def _check_worker(self, channel: _CameraChannel) -> None:
+        """Restart a camera worker that died; other cameras keep running."""
+        if self._closed or channel.process.is_alive():
+            return
+        channel.restarts += 1
+        logger.error(f"Motion worker for {channel.camera_id} exited with code "
+                     f"{channel.process.exitcode}, restarting (restart #{channel.restarts})")
+        channel.start()
+
+    def get_camera_stats(self, camera_id: str, timeout: float = 1.0) -> Dict[str, Any]:
+        """
+        Get statistics for a camera from its worker.
+
+        Falls back to the most recently reported stats if the worker does not
+        answer within the timeout.
+        """
+        channel = self._channels.get(camera_id)
+        if channel is not None and channel.process.is_alive():
+            self._latest_stats.pop(camera_id, None)
+            channel.requests.put("stats")
+            deadline = time.monotonic() + timeout
+            while camera_id not in self._latest_stats and time.monotonic() < deadline:
+                self._pending.extend(self.get_results(timeout=max(0.001, deadline - time.monotonic())))
+
+        stats = dict(self._latest_stats.get(camera_id, {'camera_id': camera_id}))
+        stats['frames_dropped'] = self._dropped.get(camera_id, 0)
+        stats['worker_restarts'] = channel.restarts if channel is not None else 0
+        return stats
+
+    def close(self) -> None:
+        """Stop all workers and release their shared memory."""
+        if self._closed:
+            return
+        self._closed = True
+        for channel in self._channels.values():
+            channel.stop()
+        self._channels.clear()
+        logger.info("MultiprocessMotionEngine closed")
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit - stop workers."""
+        self.close()
@@ -6,12 +6,19 @@ Handles motion detection logic using OpenCV background subtraction
 
 import cv2
 import numpy as np
+import glob
+import os
+import re
 import time
-from typing import Dict, Tuple, Optional, Any
-from dataclasses import dataclass, field
+from collections.abc import Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Tuple, Optional, Any, Callable, Union
+from dataclasses import dataclass, field, fields
 
 # Use nutflix_common logger
 from .logger import get_motion_logger
+from .background_models import BackgroundModel, create_background_model, get_background_backend
+from .latency import DISABLED_TIMINGS, StageTimings
 
 # Get logger for this module
 logger = get_motion_logger()
@@ -25,21 +32,288 @@ class MotionEvent:
     contour_count: int
     largest_contour_area: float
     frame_shape: Tuple[int, int]
+    boxes: Optional[np.ndarray] = None  # (N, 4) int32 x, y, width, height in capture pixels, largest first
+
+
+# Empty (0, 4) box array returned when no blob qualifies
+_NO_BOXES = np.empty((0, 4), dtype=np.int32)
+
+# Timed stages of the process_frame pipeline
+_TIMED_STAGES = ('preprocess', 'background', 'analysis', 'record')
+
+# Illumination check: width of the tiny comparison frame, histogram bins and
+# update rate of its slowly-adapting reference
+_LIGHTING_CHECK_WIDTH = 32
+_LIGHTING_HIST_BINS = 16
+_LIGHTING_REFERENCE_ALPHA = 0.05
+
+# Minimum background updates when priming a model from reference frames;
+# MOG2 needs several before its per-pixel variances are tight enough to detect
+_WARM_START_UPDATES = 10
+
+
+def _event_dtype(max_boxes: int) -> np.dtype:
+    """Structured dtype for a MotionEvent record holding up to max_boxes boxes."""
+    return np.dtype([
+        ('timestamp', 'f8'),
+        ('contour_count', 'i4'),
+        ('largest_contour_area', 'f8'),
+        ('frame_width', 'i4'),
+        ('frame_height', 'i4'),
+        ('box_count', 'i4'),
+        ('boxes', 'i4', (max_boxes, 4)),
+    ])
+
+
+class MotionEventView(Sequence):
+    """
+    Read-only sequence of MotionEvents backed by a structured record array.
+    
+    MotionEvent objects are only built when an item is accessed.
+    """
+    
+    def __init__(self, camera_id: str, records: np.ndarray):
+        self.camera_id = camera_id
+        self.records = records
+    
+    def __len__(self) -> int:
+        return len(self.records)
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union[MotionEvent, 'MotionEventView']:
+        if isinstance(index, slice):
+            return MotionEventView(self.camera_id, self.records[index])
+        record = self.records[index]
+        return MotionEvent(
+            camera_id=self.camera_id,
+            timestamp=float(record['timestamp']),
+            contour_count=int(record['contour_count']),
+            largest_contour_area=float(record['largest_contour_area']),
+            frame_shape=(int(record['frame_width']), int(record['frame_height'])),
+            boxes=record['boxes'][:record['box_count']].copy()
+        )
+    
+    def __repr__(self) -> str:
+        return f"MotionEventView(camera_id={self.camera_id!r}, events={len(self)})"
+
+
+class MotionEventBuffer:
+    """
+    Fixed-capacity ring buffer of motion events for one camera.
+    
+    Events are stored in a preallocated structured array; once full, the oldest
+    event is overwritten. Events must be appended in timestamp order, which
+    lets time-range queries use binary search.
+    """
+    
+    def __init__(self, camera_id: str, capacity: int = 100, max_boxes: int = 8):
+        """
+        Args:
+            camera_id: Camera the events belong to
+            capacity: Maximum number of events kept
+            max_boxes: Maximum number of boxes stored per event (largest first)
+        """
+        self.camera_id = camera_id
+        self.capacity = max(1, capacity)
+        self.max_boxes = max_boxes
+        self._records = np.zeros(self.capacity, dtype=_event_dtype(max_boxes))
+        self._next = 0      # Slot the next event is written to
+        self._count = 0     # Number of valid slots
+        self.total = 0      # Events appended over the buffer's lifetime
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def append(self, event: MotionEvent) -> None:
+        """Store an event, overwriting the oldest one when full."""
+        record = self._records[self._next]
+        record['timestamp'] = event.timestamp
+        record['contour_count'] = event.contour_count
+        record['largest_contour_area'] = event.largest_contour_area
+        record['frame_width'], record['frame_height'] = event.frame_shape
+        
+        boxes = event.boxes[:self.max_boxes] if event.boxes is not None else _NO_BOXES
+        record['box_count'] = len(boxes)
+        record['boxes'][:len(boxes)] = boxes
+        
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+        self.total += 1
+    
+    def _segments(self) -> List[np.ndarray]:
+        """Valid records as chronologically ordered array views."""
+        if self._count < self.capacity:
+            return [self._records[:self._count]]
+        return [self._records[self._next:], self._records[:self._next]]
+    
+    def query(self, start: Optional[float] = None, end: Optional[float] = None) -> MotionEventView:
+        """
+        Get events with start <= timestamp <= end using binary search.
+        
+        Args:
+            start: Earliest timestamp to include (optional)
+            end: Latest timestamp to include (optional)
+            
+        Returns:
+            MotionEventView over a snapshot of the matching events, oldest first
+        """
+        parts = []
+        for segment in self._segments():
+            timestamps = segment['timestamp']
+            lo = 0 if start is None else np.searchsorted(timestamps, start, side='left')
+            hi = len(segment) if end is None else np.searchsorted(timestamps, end, side='right')
+            if hi > lo:
+                parts.append(segment[lo:hi])
+        
+        records = np.concatenate(parts) if parts else self._records[:0].copy()
+        return MotionEventView(self.camera_id, records)
+    
+    def last_timestamp(self) -> Optional[float]:
+        """Timestamp of the newest event, or None if empty."""
+        if self._count == 0:
+            return None
+        return float(self._records[self._next - 1]['timestamp'])
 
 
 @dataclass
 class MotionConfig:
     """Configuration for motion detection parameters."""
     threshold: int = 500              # Minimum contour area to consider as motion
-    sensitivity: int = 25             # Threshold for frame difference (unused in MOG2 but kept for compatibility)
+    sensitivity: int = 25             # Pixel difference threshold for the frame-differencing backends
     cooldown: float = 2.0            # Seconds between motion logs for same camera
     gaussian_blur_kernel: Tuple[int, int] = (21, 21)  # Gaussian blur kernel size
     gaussian_blur_sigma: int = 0      # Gaussian blur sigma
     mog2_detect_shadows: bool = True  # Whether to detect shadows in MOG2
     mog2_history: int = 500          # Number of frames in MOG2 history
     mog2_var_threshold: float = 16.0  # MOG2 variance threshold
+    background_backend: str = "mog2"  # "mog2", "knn", "running_average" or "fixed_point"
+    camera_backends: Dict[str, str] = field(default_factory=dict)  # Per-camera backend overrides
+    knn_dist2_threshold: float = 400.0  # KNN squared distance threshold
+    background_alpha: float = 0.05    # Update rate for the running-average and fixed-point backends
     min_contour_area: int = 100      # Minimum contour area to consider
     max_contours_to_check: int = 50   # Maximum number of contours to process
+    analysis_mode: str = "contours"   # "contours", "components" (connectedComponentsWithStats) or "grid"
+    grid_size: Tuple[int, int] = (6, 8)  # Grid mode (rows, cols) over the analysed area
+    grid_cell_threshold: float = 0.05  # Grid mode: foreground fraction for a cell to count as active
+    max_workers: Optional[int] = None  # Thread pool size for process_frames (None = CPU count)
+    event_history_size: int = 100     # Motion events kept in memory per camera
+    processing_width: Optional[int] = None  # Downscale frames to this width for detection (None = full resolution)
+    reuse_buffers: bool = True        # Keep per-camera work buffers instead of allocating per frame
+    adaptive_sampling: bool = False   # Analyse only every Nth frame once a camera has been quiet
+    idle_after: float = 30.0          # Seconds without foreground activity before a camera counts as idle
+    idle_sample_interval: int = 5     # Analyse every Nth frame while idle
+    heatmap_enabled: bool = False     # Accumulate a per-camera motion heatmap
+    heatmap_width: int = 64           # Heatmap width in cells (height follows the frame aspect ratio)
+    heatmap_decay: float = 0.01       # Weight of each new foreground mask in the heatmap average
+    lighting_check: bool = False      # Treat frame-wide brightness changes as lighting, not motion (opt-in)
+    lighting_min_delta: float = 10.0  # Gray-level change for a cell of the tiny check frame to count as changed
+    lighting_change_fraction: float = 0.6  # Fraction of cells that must change for a lighting change
+    lighting_hist_distance: float = 0.3  # Bhattacharyya histogram distance that also counts as a shift
+    lighting_adapt_frames: int = 10   # Frames re-adapting (not analysed) after a lighting change
+    lighting_learning_rate: float = 0.3  # Background learning rate while re-adapting
+    collect_timings: bool = True      # Keep per-stage latency histograms (reported by get_camera_stats)
+    warm_start_dir: Optional[str] = None  # Directory for reference background frames (None = no warm start)
+    warm_start_frames: int = 5        # Reference frames kept on disk per camera
+    warm_start_interval: float = 60.0  # Seconds between saved reference frames (written on a background thread)
+    warm_start_learning_rate: float = 0.5  # Learning rate used when replaying reference frames
+    # Per-camera regions of interest: camera_id -> polygon [[x, y], ...], list of
+    # polygons, mask image path or mask array (non-zero = analysed), in capture pixels
+    regions_of_interest: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, config: Dict[str, Any]) -> 'MotionConfig':
+        """
+        Build a MotionConfig from a config-file section (e.g. 'motion_detection').
+        
+        Unknown keys are ignored so the section can carry app-level settings too.
+        """
+        known = {f.name for f in fields(cls)}
+        values = {key: value for key, value in config.items() if key in known}
+        for key in ('gaussian_blur_kernel', 'grid_size'):
+            if key in values:
+                values[key] = tuple(values[key])
+        return cls(**values)
+
+
+@dataclass
+class _RegionOfInterest:
+    """Precomputed crop rectangle and mask for a camera's region of interest."""
+    x: int
+    y: int
+    width: int
+    height: int
+    mask: np.ndarray                                  # Mask of the crop at capture resolution
+    analysis_mask: Optional[np.ndarray] = None        # Mask resized to the analysis resolution
+    
+    def crop(self, frame: np.ndarray) -> np.ndarray:
+        """Crop a frame to the bounding rectangle of the region."""
+        return frame[self.y:self.y + self.height, self.x:self.x + self.width]
+    
+    def get_analysis_mask(self, shape: Tuple[int, ...]) -> np.ndarray:
+        """Get the mask at the given analysis resolution, resizing it once per shape."""
+        if self.analysis_mask is None or self.analysis_mask.shape != shape[:2]:
+            self.analysis_mask = cv2.resize(
+                self.mask, (shape[1], shape[0]), interpolation=cv2.INTER_NEAREST
+            )
+        return self.analysis_mask
+
+
+@dataclass
+class _FrameBuffers:
+    """Preallocated per-camera work buffers for the detection pipeline."""
+    frame_shape: Tuple[int, ...]                      # Shape of the (cropped) input frames
+    scale: float                                      # Analysis scale the buffers were sized for
+    gray: np.ndarray                                  # Grayscale frame at capture resolution
+    small: Optional[np.ndarray]                       # Downscaled grayscale (None at full resolution)
+    blurred: np.ndarray                               # Blurred analysis frame
+    fg_mask: np.ndarray                               # Foreground mask from the background model
+    labels: np.ndarray                                # Connected-component labels
+    
+    @classmethod
+    def allocate(cls, frame_shape: Tuple[int, ...], analysis_size: Tuple[int, int],
+                 scale: float) -> '_FrameBuffers':
+        """Allocate buffers for frames of the given shape and (width, height) analysis size."""
+        height, width = frame_shape[:2]
+        analysis_shape = (analysis_size[1], analysis_size[0])
+        return cls(
+            frame_shape=frame_shape,
+            scale=scale,
+            gray=np.empty((height, width), dtype=np.uint8),
+            small=np.empty(analysis_shape, dtype=np.uint8) if scale < 1.0 else None,
+            blurred=np.empty(analysis_shape, dtype=np.uint8),
+            fg_mask=np.empty(analysis_shape, dtype=np.uint8),
+            labels=np.empty(analysis_shape, dtype=np.int32)
+        )
+
+
+def _build_roi_mask(spec: Any, frame_shape: Tuple[int, ...]) -> np.ndarray:
+    """
+    Rasterize a region-of-interest spec into a full-frame uint8 mask.
+    
+    Args:
+        spec: Polygon ([[x, y], ...]), list of polygons, mask image path or mask array
+        frame_shape: Shape of the frames the mask applies to
+        
+    Raises:
+        ValueError: If the spec cannot be interpreted
+    """
+    height, width = frame_shape[:2]
+    
+    if isinstance(spec, str):
+        mask = cv2.imread(spec, cv2.IMREAD_GRAYSCALE)
+        if mask is None:
+            raise ValueError(f"Cannot read ROI mask image: {spec}")
+    elif isinstance(spec, np.ndarray):
+        mask = spec if spec.ndim == 2 else cv2.cvtColor(spec, cv2.COLOR_BGR2GRAY)
+    else:
+        # A single polygon is a list of points; wrap it so we always fill a list of polygons
+        polygons: List[Any] = [spec] if np.ndim(spec[0]) == 1 else list(spec)
+        mask = np.zeros((height, width), dtype=np.uint8)
+        cv2.fillPoly(mask, [np.asarray(p, dtype=np.int32).reshape(-1, 2) for p in polygons], 255)
+        return mask
+    
+    if mask.shape[:2] != (height, width):
+        mask = cv2.resize(mask, (width, height), interpolation=cv2.INTER_NEAREST)
+    return np.where(mask > 0, 255, 0).astype(np.uint8)
 
 
 class MotionDetector:
@@ -48,50 +322,103 @@ class MotionDetector:
     Supports multiple cameras with independent motion tracking and cooldown.
     """
     
-    def __init__(self, config: Optional[MotionConfig] = None):
+    def __init__(self, config: Optional[MotionConfig] = None, event_sink: Optional[Any] = None,
+                 event_bus: Optional[Any] = None):
         """
         Initialize the motion detector.
         
         Args:
             config: Motion detection configuration. Uses defaults if None.
+            event_sink: Optional object with a non-blocking write(event) method
+                (e.g. MotionEventStore) that receives every recorded MotionEvent.
+            event_bus: Optional MotionEventBus that every recorded MotionEvent is
+                published to. Created on the first subscribe() call if None.
         """
         self.config = config or MotionConfig()
+        self.event_sink = event_sink
+        self.event_bus = event_bus
+        self._owns_event_bus = False
         
-        # Background subtractors for each camera
-        self._bg_subtractors: Dict[str, cv2.BackgroundSubtractor] = {}
+        # Background models for each camera
+        self._bg_subtractors: Dict[str, BackgroundModel] = {}
+        self._bg_backends: Dict[str, str] = {}
         
         # Motion tracking per camera
         self._last_motion_times: Dict[str, float] = {}
-        self._motion_events: Dict[str, list] = {}
+        self._motion_events: Dict[str, MotionEventBuffer] = {}
         
         # Frame processing stats
         self._frame_counts: Dict[str, int] = {}
+        self._frames_analyzed: Dict[str, int] = {}
+        
+        # Adaptive sampling state per camera
+        self._sample_intervals: Dict[str, int] = {}
+        self._frames_since_analysis: Dict[str, int] = {}
+        self._frames_skipped_idle: Dict[str, int] = {}
+        self._last_activity_times: Dict[str, float] = {}
+        
+        # Latest grid-mode motion grid per camera
+        self._motion_grids: Dict[str, np.ndarray] = {}
+        
+        # Reusable work buffers per camera
+        self._buffers: Dict[str, _FrameBuffers] = {}
+        
+        # Motion heatmaps per camera (float32, heatmap resolution)
+        self._heatmaps: Dict[str, np.ndarray] = {}
+        
+        # Regions of interest per camera: camera_id -> (frame_shape, roi)
+        self._rois: Dict[str, Tuple[Tuple[int, ...], Optional[_RegionOfInterest]]] = {}
+        
+        # Illumination check state per camera: tiny reference frame, frames left
+        # re-adapting after a lighting change, change counts and last change time
+        self._lighting_refs: Dict[str, np.ndarray] = {}
+        self._lighting_adapt_remaining: Dict[str, int] = {}
+        self._lighting_changes: Dict[str, int] = {}
+        self._last_lighting_changes: Dict[str, float] = {}
+        
+        # Per-stage latency histograms per camera
+        self._timings: Dict[str, StageTimings] = {}
+        
+        # Warm start state: cameras already primed, last reference save times,
+        # latest queued reference write per camera and the thread doing the writes
+        self._warm_started: Dict[str, bool] = {}
+        self._last_reference_saves: Dict[str, float] = {}
+        self._reference_saves: Dict[str, Future] = {}
+        self._reference_writer: Optional[ThreadPoolExecutor] = None
+        
+        # Thread pool for multi-camera batches (created on first use)
+        self._executor: Optional[ThreadPoolExecutor] = None
         
         logger.info(f"MotionDetector initialized with threshold={self.config.threshold}, "
                    f"cooldown={self.config.cooldown}s")
     
-    def _get_or_create_bg_subtractor(self, camera_id: str) -> cv2.BackgroundSubtractor:
+    def _get_or_create_bg_subtractor(self, camera_id: str) -> BackgroundModel:
         """Get or create a background subtractor for the given camera."""
         if camera_id not in self._bg_subtractors:
-            self._bg_subtractors[camera_id] = cv2.createBackgroundSubtractorMOG2(
-                history=self.config.mog2_history,
-                varThreshold=self.config.mog2_var_threshold,
-                detectShadows=self.config.mog2_detect_shadows
-            )
+            backend = self.config.camera_backends.get(camera_id, self.config.background_backend)
+            try:
+                self._bg_subtractors[camera_id] = create_background_model(backend, self.config)
+            except ValueError as e:
+                logger.error(f"{e}; falling back to mog2 for camera {camera_id}")
+                backend = "mog2"
+                self._bg_subtractors[camera_id] = create_background_model(backend, self.config)
+            self._bg_backends[camera_id] = backend
             self._last_motion_times[camera_id] = 0
-            self._motion_events[camera_id] = []
+            self._motion_events[camera_id] = MotionEventBuffer(camera_id, self.config.event_history_size)
             self._frame_counts[camera_id] = 0
-            logger.info(f"Created background subtractor for camera: {camera_id}")
+            logger.info(f"Created {backend} background subtractor for camera: {camera_id}")
         
         return self._bg_subtractors[camera_id]
     
-    def process_frame(self, frame: np.ndarray, camera_id: str) -> bool:
+    def process_frame(self, frame: np.ndarray, camera_id: str,
+                      timestamp: Optional[float] = None) -> bool:
         """
         Process a frame for motion detection.
         
         Args:
             frame: OpenCV frame (BGR format)
             camera_id: Unique identifier for the camera
+            timestamp: Capture time of the frame (defaults to time.time())
             
         Returns:
             True if motion was detected, False otherwise
@@ -100,57 +427,519 @@ class MotionDetector:
             logger.warning(f"Received None frame for camera {camera_id}")
             return False
         
-        current_time = time.time()
+        current_time = time.time() if timestamp is None else timestamp
         self._frame_counts[camera_id] = self._frame_counts.get(camera_id, 0) + 1
         
         # Check cooldown period
         if self._is_in_cooldown(camera_id, current_time):
             return False
         
+        timings = None
         try:
             # Get background subtractor for this camera
             bg_subtractor = self._get_or_create_bg_subtractor(camera_id)
             
-            # Preprocess frame
-            processed_frame = self._preprocess_frame(frame)
+            # Skip frames while the camera is idle
+            if not self._should_analyze(camera_id, current_time):
+                return False
+            
+            timings = self._get_timings(camera_id)
+            timings.start()
+            
+            # Crop to the camera's region of interest before any per-pixel work
+            roi = self._get_roi(camera_id, frame.shape)
+            analysis_frame = roi.crop(frame) if roi is not None else frame
+            
+            # Preprocess frame (possibly at reduced analysis resolution)
+            buffers = self._get_frame_buffers(camera_id, analysis_frame.shape)
+            processed_frame, scale = self._preprocess_frame(analysis_frame, buffers)
+            
+            # Prime a new background model from saved reference frames
+            if self.config.warm_start_dir and camera_id not in self._warm_started:
+                self._warm_started[camera_id] = self._warm_start(camera_id, bg_subtractor,
+                                                                 processed_frame.shape)
+            
+            # Frame-wide brightness changes re-adapt the background instead of being analysed
+            adapting = self.config.lighting_check and self._check_lighting(camera_id, processed_frame,
+                                                                           current_time)
+            timings.lap('preprocess')
             
             # Apply background subtraction
-            fg_mask = bg_subtractor.apply(processed_frame)
+            fg_mask = bg_subtractor.apply(
+                processed_frame,
+                fgmask=buffers.fg_mask if buffers is not None else None,
+                learningRate=self._get_learning_rate(camera_id)
+            )
+            
+            # Drop foreground outside the region of interest
+            if roi is not None:
+                cv2.bitwise_and(fg_mask, roi.get_analysis_mask(fg_mask.shape), dst=fg_mask)
+            timings.lap('background')
+            
+            if adapting:
+                return False
+            
+            if self.config.warm_start_dir:
+                self._update_reference_frames(camera_id, current_time)
+            
+            if self.config.heatmap_enabled:
+                self._update_heatmap(camera_id, fg_mask, frame.shape, roi)
+            
+            # Find and analyze foreground blobs, reporting areas in full-resolution pixels
+            motion_detected, contour_info = self._analyze_foreground(
+                fg_mask, area_scale=1.0 / (scale * scale),
+                labels=buffers.labels if buffers is not None else None
+            )
             
-            # Find and analyze contours
-            motion_detected, contour_info = self._analyze_contours(fg_mask)
+            if 'grid' in contour_info:
+                self._motion_grids[camera_id] = contour_info['grid']
+            
+            # Adjust the sampling rate based on foreground activity
+            self._update_sampling(camera_id, current_time, contour_info['count'] > 0)
+            timings.lap('analysis')
             
             # Log motion event if detected
             if motion_detected:
+                contour_info['boxes'] = self._to_capture_boxes(contour_info['boxes'], scale, roi)
                 self._record_motion_event(camera_id, current_time, contour_info, frame.shape)
                 logger.info(f"Motion detected in {camera_id}: {contour_info['count']} contours, "
                            f"largest area: {contour_info['largest_area']:.1f}")
-                return True
+                timings.lap('record')
             
-            return False
+            return motion_detected
             
         except Exception as e:
             logger.error(f"Error processing frame for camera {camera_id}: {e}")
             return False
+        
+        finally:
+            # Close the frame on every path so an error never leaves its stage times without a total
+            if timings is not None:
+                timings.finish()
     
-    def _preprocess_frame(self, frame: np.ndarray) -> np.ndarray:
-        """Preprocess frame for motion detection."""
+    def process_frames(self, frames: Dict[str, Optional[np.ndarray]],
+                       timestamp: Optional[float] = None) -> Dict[str, bool]:
+        """
+        Process one frame from each of several cameras concurrently.
+        
+        Each camera's pipeline runs on a worker thread; OpenCV releases the
+        GIL while it works, so cameras are processed in parallel.
+        
+        Args:
+            frames: Mapping of camera_id to OpenCV frame (BGR format), as
+                returned by CameraManager.read_frames(). None frames are skipped.
+            timestamp: Capture time of the frames (defaults to time.time())
+            
+        Returns:
+            Mapping of camera_id to True if motion was detected, False otherwise
+        """
+        results = {camera_id: False for camera_id in frames}
+        pending = {camera_id: frame for camera_id, frame in frames.items() if frame is not None}
+        
+        # Not worth a thread hop for a single camera
+        if len(pending) <= 1:
+            for camera_id, frame in pending.items():
+                results[camera_id] = self.process_frame(frame, camera_id, timestamp)
+            return results
+        
+        # Create per-camera state up front so workers never race on setup
+        for camera_id in pending:
+            self._get_or_create_bg_subtractor(camera_id)
+        
+        executor = self._get_executor()
+        futures = {
+            camera_id: executor.submit(self.process_frame, frame, camera_id, timestamp)
+            for camera_id, frame in pending.items()
+        }
+        for camera_id, future in futures.items():
+            results[camera_id] = future.result()
+        
+        return results
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get or create the thread pool used by process_frames."""
+        if self._executor is None:
+            max_workers = self.config.max_workers or os.cpu_count() or 1
+            self._executor = ThreadPoolExecutor(
+                max_workers=max_workers,
+                thread_name_prefix="nutflix-motion"
+            )
+            logger.info(f"Created motion worker pool with {max_workers} threads")
+        
+        return self._executor
+    
+    def _get_roi(self, camera_id: str, frame_shape: Tuple[int, ...]) -> Optional[_RegionOfInterest]:
+        """Get the region of interest for a camera, rebuilding it if the frame shape changed."""
+        cached = self._rois.get(camera_id)
+        if cached is not None and cached[0] == frame_shape:
+            return cached[1]
+        
+        roi = None
+        spec = self.config.regions_of_interest.get(camera_id)
+        if spec is not None:
+            try:
+                mask = _build_roi_mask(spec, frame_shape)
+                x, y, width, height = cv2.boundingRect(mask)
+                if width > 0 and height > 0:
+                    roi = _RegionOfInterest(x, y, width, height, mask[y:y + height, x:x + width].copy())
+                    logger.info(f"ROI for {camera_id}: {width}x{height} at ({x}, {y}), "
+                               f"{100.0 * width * height / (frame_shape[0] * frame_shape[1]):.0f}% of frame")
+                else:
+                    logger.warning(f"ROI for {camera_id} is empty, analysing the full frame")
+            except Exception as e:
+                logger.error(f"Invalid ROI for {camera_id}, analysing the full frame: {e}")
+        
+        self._rois[camera_id] = (frame_shape, roi)
+        return roi
+    
+    def _update_heatmap(self, camera_id: str, fg_mask: np.ndarray, frame_shape: Tuple[int, ...],
+                        roi: Optional[_RegionOfInterest]) -> None:
+        """Fold a foreground mask into the camera's decaying low-resolution heatmap."""
+        frame_height, frame_width = frame_shape[:2]
+        width = max(1, self.config.heatmap_width)
+        height = max(1, round(width * frame_height / frame_width))
+        
+        heatmap = self._heatmaps.get(camera_id)
+        if heatmap is None or heatmap.shape != (height, width):
+            heatmap = np.zeros((height, width), dtype=np.float32)
+            self._heatmaps[camera_id] = heatmap
+        
+        # With an ROI only the cells under its bounding rectangle are updated
+        region = heatmap
+        if roi is not None:
+            x0 = roi.x * width // frame_width
+            y0 = roi.y * height // frame_height
+            x1 = max(x0 + 1, -(-(roi.x + roi.width) * width // frame_width))
+            y1 = max(y0 + 1, -(-(roi.y + roi.height) * height // frame_height))
+            region = heatmap[y0:y1, x0:x1]
+        
+        small = cv2.resize(fg_mask, (region.shape[1], region.shape[0]), interpolation=cv2.INTER_AREA)
+        cv2.accumulateWeighted(small, region, self.config.heatmap_decay)
+    
+    def get_heatmap(self, camera_id: str, size: Optional[Tuple[int, int]] = None,
+                    colormap: Optional[int] = None) -> Optional[np.ndarray]:
+        """
+        Get the camera's motion heatmap as a normalized image.
+        
+        Args:
+            camera_id: Camera identifier
+            size: Optional (width, height) to resize the heatmap to
+            colormap: Optional OpenCV colormap (e.g. cv2.COLORMAP_JET) for a BGR image
+            
+        Returns:
+            uint8 image scaled so the hottest cell is 255, or None if no
+            heatmap has been accumulated for the camera
+        """
+        heatmap = self._heatmaps.get(camera_id)
+        if heatmap is None:
+            return None
+        
+        image = cv2.normalize(heatmap, None, alpha=255, norm_type=cv2.NORM_INF, dtype=cv2.CV_8U)
+        if size is not None:
+            image = cv2.resize(image, size, interpolation=cv2.INTER_LINEAR)
+        if colormap is not None:
+            image = cv2.applyColorMap(image, colormap)
+        return image
+    
+    def _should_analyze(self, camera_id: str, current_time: float) -> bool:
+        """Decide whether this frame should run through the pipeline under adaptive sampling."""
+        self._last_activity_times.setdefault(camera_id, current_time)
+        
+        interval = self._sample_intervals.get(camera_id, 1)
+        since_analysis = self._frames_since_analysis.get(camera_id, 0) + 1
+        if since_analysis < interval:
+            self._frames_since_analysis[camera_id] = since_analysis
+            self._frames_skipped_idle[camera_id] = self._frames_skipped_idle.get(camera_id, 0) + 1
+            return False
+        
+        self._frames_since_analysis[camera_id] = 0
+        self._frames_analyzed[camera_id] = self._frames_analyzed.get(camera_id, 0) + 1
+        return True
+    
+    def _update_sampling(self, camera_id: str, current_time: float, activity: bool) -> None:
+        """Switch a camera between full-rate and idle sampling."""
+        if not self.config.adaptive_sampling:
+            return
+        
+        interval = self._sample_intervals.get(camera_id, 1)
+        if activity:
+            self._last_activity_times[camera_id] = current_time
+            if interval > 1:
+                self._sample_intervals[camera_id] = 1
+                logger.info(f"Activity in {camera_id}, resuming full-rate analysis")
+        elif interval == 1 and self.config.idle_sample_interval > 1:
+            if current_time - self._last_activity_times[camera_id] >= self.config.idle_after:
+                self._sample_intervals[camera_id] = self.config.idle_sample_interval
+                logger.info(f"{camera_id} idle for {self.config.idle_after:.0f}s, analysing "
+                           f"every {self.config.idle_sample_interval} frames")
+    
+    def _get_learning_rate(self, camera_id: str) -> float:
+        """
+        Get the background learning rate for the camera's current sampling interval.
+        
+        At full rate the subtractor picks its own rate (-1). While sampling every
+        Nth frame the backend's per-frame rate is scaled by N so the model adapts
+        at the same wall-clock speed as it would at full rate.
+        """
+        if self._lighting_adapt_remaining.get(camera_id, 0) > 0:
+            return self.config.lighting_learning_rate
+        
+        interval = self._sample_intervals.get(camera_id, 1)
+        if interval <= 1:
+            return -1
+        backend = get_background_backend(self._bg_backends.get(camera_id, self.config.background_backend))
+        return min(1.0, interval * backend.learning_rate(self.config))
+    
+    def _check_lighting(self, camera_id: str, processed_frame: np.ndarray, current_time: float) -> bool:
+        """
+        Detect frame-wide illumination changes on a tiny copy of the frame.
+        
+        A lighting change is when at least lighting_change_fraction of the tiny
+        frame differs from its slowly-adapting reference and the mean or the
+        histogram has shifted. Localized motion leaves the rest of the frame
+        unchanged and does not trigger it, but an animal close enough to fill
+        most of the view can, and is then absorbed into the background; the
+        check is therefore off unless lighting_check is set.
+        
+        Returns:
+            True while the camera is re-adapting after a lighting change (the
+            frame should update the background but not be analysed)
+        """
+        height, width = processed_frame.shape[:2]
+        tiny_size = (_LIGHTING_CHECK_WIDTH, max(1, round(_LIGHTING_CHECK_WIDTH * height / width)))
+        # The processed frame is already blurred, so point sampling is enough
+        # (INTER_AREA costs ~20x more for this reduction)
+        tiny = cv2.resize(processed_frame, tiny_size, interpolation=cv2.INTER_LINEAR).astype(np.float32)
+        
+        reference = self._lighting_refs.get(camera_id)
+        if reference is None or reference.shape != tiny.shape:
+            self._lighting_refs[camera_id] = tiny
+            return False
+        
+        remaining = self._lighting_adapt_remaining.get(camera_id, 0)
+        if remaining > 0:
+            # Follow the new lighting quickly while the background re-adapts
+            cv2.accumulateWeighted(tiny, reference, self.config.lighting_learning_rate)
+            self._lighting_adapt_remaining[camera_id] = remaining - 1
+            return True
+        
+        delta = tiny - reference
+        changed = np.count_nonzero(np.abs(delta) >= self.config.lighting_min_delta) / delta.size
+        lighting_change = False
+        if changed >= self.config.lighting_change_fraction:
+            mean_shift = abs(float(delta.mean()))
+            histograms = [cv2.calcHist([image], [0], None, [_LIGHTING_HIST_BINS], [0, 256])
+                          for image in (tiny, reference)]
+            distance = cv2.compareHist(histograms[0], histograms[1], cv2.HISTCMP_BHATTACHARYYA)
+            lighting_change = (mean_shift >= self.config.lighting_min_delta
+                               or distance >= self.config.lighting_hist_distance)
+        
+        if not lighting_change:
+            cv2.accumulateWeighted(tiny, reference, _LIGHTING_REFERENCE_ALPHA)
+            return False
+        
+        self._lighting_refs[camera_id] = tiny
+        self._lighting_adapt_remaining[camera_id] = max(0, self.config.lighting_adapt_frames)
+        self._lighting_changes[camera_id] = self._lighting_changes.get(camera_id, 0) + 1
+        self._last_lighting_changes[camera_id] = current_time
+        logger.info(f"Lighting change in {camera_id} ({changed:.0%} of frame changed), "
+                    f"re-adapting background for {self.config.lighting_adapt_frames} frames")
+        return True
+    
+    def _get_reference_dir(self, camera_id: str) -> str:
+        """Directory holding a camera's reference background frames."""
+        return os.path.join(self.config.warm_start_dir, re.sub(r'[^A-Za-z0-9_.-]', '_', camera_id))
+    
+    def _warm_start(self, camera_id: str, bg_subtractor: BackgroundModel,
+                    shape: Tuple[int, ...]) -> bool:
+        """
+        Prime a new background model with the camera's saved reference frames.
+        
+        Frames are replayed oldest first at warm_start_learning_rate. Frames saved
+        at a different analysis resolution (or ROI) are ignored.
+        
+        Returns:
+            True if the model was primed
+        """
+        paths = sorted(glob.glob(os.path.join(self._get_reference_dir(camera_id), "reference_*.png")),
+                       key=os.path.getmtime)
+        references = []
+        for path in paths:
+            image = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+            if image is not None and image.shape == shape[:2]:
+                references.append(image)
+        if not references:
+            logger.info(f"No usable reference frames for {camera_id}, background model starts cold")
+            return False
+        
+        updates = max(len(references), _WARM_START_UPDATES)
+        for i in range(updates):
+            bg_subtractor.apply(references[i * len(references) // updates],
+                                learningRate=self.config.warm_start_learning_rate)
+        logger.info(f"Warm-started {camera_id} background model from {len(references)} reference frames")
+        return True
+    
+    def _update_reference_frames(self, camera_id: str, current_time: float) -> None:
+        """Queue a reference background frame every warm_start_interval seconds."""
+        last_save = self._last_reference_saves.setdefault(camera_id, current_time)
+        if current_time - last_save < self.config.warm_start_interval:
+            return
+        pending = self._reference_saves.get(camera_id)
+        if pending is not None and not pending.done():
+            return  # The previous write is still on disk; try again on the next frame
+        self._last_reference_saves[camera_id] = current_time
+        self._queue_reference_frame(camera_id)
+    
+    def _queue_reference_frame(self, camera_id: str) -> Optional[Future]:
+        """
+        Copy the camera's background image and hand the PNG write to the writer thread.
+        
+        Returns:
+            Future resolving to True once the frame is written, or None without a background
+        """
+        bg_subtractor = self._bg_subtractors.get(camera_id)
+        background = bg_subtractor.getBackgroundImage() if bg_subtractor is not None else None
+        if background is None:
+            return None
+        
+        if self._reference_writer is None:
+            # One thread serializes the writes, so two saves never pick the same file
+            self._reference_writer = ThreadPoolExecutor(max_workers=1,
+                                                        thread_name_prefix="nutflix-reference")
+        future = self._reference_writer.submit(self._write_reference_frame, camera_id, background)
+        self._reference_saves[camera_id] = future
+        return future
+    
+    def _write_reference_frame(self, camera_id: str, background: np.ndarray) -> bool:
+        """Write a background image over the camera's oldest reference frame (writer thread)."""
+        directory = self._get_reference_dir(camera_id)
+        paths = [os.path.join(directory, f"reference_{i:02d}.png")
+                 for i in range(max(1, self.config.warm_start_frames))]
+        path = min(paths, key=lambda p: os.path.getmtime(p) if os.path.exists(p) else -1.0)
+        temp_path = os.path.join(directory, ".tmp_" + os.path.basename(path))
+        try:
+            os.makedirs(directory, exist_ok=True)
+            if not cv2.imwrite(temp_path, background):
+                raise OSError(f"could not write {temp_path}")
+            # Replace atomically so a crash never leaves a truncated reference frame
+            os.replace(temp_path, path)
+        except (OSError, cv2.error) as e:
+            logger.warning(f"Failed to save reference frame for {camera_id}: {e}")
+            return False
+        return True
+    
+    def save_reference_frames(self, camera_id: Optional[str] = None) -> int:
+        """
+        Save the current background of one or all cameras for the next warm start.
+        
+        Args:
+            camera_id: Camera to save (all cameras if None)
+            
+        Returns:
+            Number of reference frames written
+        """
+        if not self.config.warm_start_dir:
+            return 0
+        camera_ids = [camera_id] if camera_id is not None else list(self._bg_subtractors)
+        futures = [self._queue_reference_frame(cam) for cam in camera_ids]
+        return sum(future.result() for future in futures if future is not None)
+    
+    def _get_timings(self, camera_id: str) -> Union[StageTimings, Any]:
+        """Get the camera's stage timings (a no-op recorder when collect_timings is off)."""
+        if not self.config.collect_timings:
+            return DISABLED_TIMINGS
+        timings = self._timings.get(camera_id)
+        if timings is None:
+            timings = self._timings[camera_id] = StageTimings(_TIMED_STAGES)
+        return timings
+    
+    def _get_frame_buffers(self, camera_id: str, frame_shape: Tuple[int, ...]) -> Optional[_FrameBuffers]:
+        """Get the camera's work buffers, reallocating them only when the frame shape changes."""
+        if not self.config.reuse_buffers:
+            return None
+        
+        scale = self._get_processing_scale(frame_shape[1])
+        buffers = self._buffers.get(camera_id)
+        if buffers is None or buffers.frame_shape != frame_shape or buffers.scale != scale:
+            buffers = _FrameBuffers.allocate(frame_shape, self._get_analysis_size(frame_shape, scale), scale)
+            self._buffers[camera_id] = buffers
+            logger.debug(f"Allocated work buffers for {camera_id}: {frame_shape[1]}x{frame_shape[0]}")
+        
+        return buffers
+    
+    def _preprocess_frame(self, frame: np.ndarray,
+                          buffers: Optional[_FrameBuffers] = None) -> Tuple[np.ndarray, float]:
+        """
+        Preprocess frame for motion detection.
+        
+        Args:
+            frame: OpenCV frame (BGR format)
+            buffers: Work buffers to write into instead of allocating new arrays
+        
+        Returns:
+            Tuple of (processed_frame, scale) where scale is the ratio of the
+            analysis resolution to the capture resolution
+        """
         # Convert to grayscale
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=buffers.gray if buffers else None)
+        
+        # Downscale to the analysis resolution if configured
+        scale = self._get_processing_scale(gray.shape[1])
+        if scale < 1.0:
+            gray = cv2.resize(
+                gray, self._get_analysis_size(gray.shape, scale),
+                dst=buffers.small if buffers else None,
+                interpolation=cv2.INTER_AREA
+            )
         
         # Apply Gaussian blur to reduce noise
         blurred = cv2.GaussianBlur(
             gray, 
-            self.config.gaussian_blur_kernel, 
-            self.config.gaussian_blur_sigma
+            self._get_blur_kernel(scale), 
+            self.config.gaussian_blur_sigma,
+            dst=buffers.blurred if buffers else None
         )
         
-        return blurred
+        return blurred, scale
     
-    def _analyze_contours(self, fg_mask: np.ndarray) -> Tuple[bool, Dict[str, Any]]:
+    @staticmethod
+    def _get_analysis_size(frame_shape: Tuple[int, ...], scale: float) -> Tuple[int, int]:
+        """Get the (width, height) a frame is processed at."""
+        if scale >= 1.0:
+            return frame_shape[1], frame_shape[0]
+        return max(1, round(frame_shape[1] * scale)), max(1, round(frame_shape[0] * scale))
+    
+    def _get_processing_scale(self, frame_width: int) -> float:
+        """Get the downscale factor for a frame of the given width."""
+        target_width = self.config.processing_width
+        if not target_width or target_width >= frame_width:
+            return 1.0
+        return target_width / frame_width
+    
+    def _get_blur_kernel(self, scale: float) -> Tuple[int, int]:
+        """Scale the configured blur kernel so it covers the same area at analysis resolution."""
+        if scale >= 1.0:
+            return self.config.gaussian_blur_kernel
+        # GaussianBlur requires odd, positive kernel dimensions
+        return tuple(int(k * scale) | 1 for k in self.config.gaussian_blur_kernel)
+    
+    def _analyze_foreground(self, fg_mask: np.ndarray, area_scale: float = 1.0,
+                            labels: Optional[np.ndarray] = None) -> Tuple[bool, Dict[str, Any]]:
+        """Analyze the foreground mask using the configured analysis mode."""
+        if self.config.analysis_mode == "components":
+            return self._analyze_components(fg_mask, area_scale, labels)
+        if self.config.analysis_mode == "grid":
+            return self._analyze_grid(fg_mask, area_scale)
+        return self._analyze_contours(fg_mask, area_scale)
+    
+    def _analyze_contours(self, fg_mask: np.ndarray, area_scale: float = 1.0) -> Tuple[bool, Dict[str, Any]]:
         """
         Analyze contours in the foreground mask.
         
+        Args:
+            fg_mask: Foreground mask from background subtraction
+            area_scale: Factor converting mask pixel areas to full-resolution areas
+        
         Returns:
             Tuple of (motion_detected, contour_info_dict)
         """
@@ -162,7 +951,7 @@ class MotionDetector:
         )
         
         if not contours:
-            return False, {'count': 0, 'largest_area': 0}
+            return False, {'count': 0, 'largest_area': 0, 'boxes': _NO_BOXES}
         
         # Limit number of contours to process for performance
         contours = contours[:self.config.max_contours_to_check]
@@ -172,27 +961,162 @@ class MotionDetector:
         areas = []
         
         for contour in contours:
-            area = cv2.contourArea(contour)
+            area = cv2.contourArea(contour) * area_scale
             if area >= self.config.min_contour_area:
                 valid_contours.append(contour)
                 areas.append(area)
         
         if not valid_contours:
-            return False, {'count': 0, 'largest_area': 0}
+            return False, {'count': 0, 'largest_area': 0, 'boxes': _NO_BOXES}
         
         # Check if any contour exceeds the motion threshold
         largest_area = max(areas)
         motion_detected = largest_area >= self.config.threshold
         
+        # Bounding boxes of the valid contours, largest first
+        order = np.argsort(areas)[::-1]
+        boxes = np.array([cv2.boundingRect(valid_contours[i]) for i in order], dtype=np.int32)
+        
         contour_info = {
             'count': len(valid_contours),
             'largest_area': largest_area,
             'total_area': sum(areas),
-            'average_area': sum(areas) / len(areas) if areas else 0
+            'average_area': sum(areas) / len(areas) if areas else 0,
+            'boxes': boxes
         }
         
         return motion_detected, contour_info
     
+    def _analyze_components(self, fg_mask: np.ndarray, area_scale: float = 1.0,
+                            labels: Optional[np.ndarray] = None) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Analyze connected components in the foreground mask.
+        
+        Filtering and selection of the max_contours_to_check largest blobs are
+        done on NumPy arrays, so cost does not grow with per-blob Python work.
+        
+        Args:
+            fg_mask: Foreground mask from background subtraction
+            area_scale: Factor converting mask pixel areas to full-resolution areas
+            labels: Optional int32 buffer for the label image
+        
+        Returns:
+            Tuple of (motion_detected, contour_info_dict)
+        """
+        _, _, stats, centroids = cv2.connectedComponentsWithStats(fg_mask, labels=labels, connectivity=8)
+        
+        # Label 0 is the background
+        stats = stats[1:]
+        centroids = centroids[1:]
+        areas = stats[:, cv2.CC_STAT_AREA] * area_scale
+        
+        valid = np.flatnonzero(areas >= self.config.min_contour_area)
+        if valid.size == 0:
+            return False, {'count': 0, 'largest_area': 0, 'boxes': _NO_BOXES}
+        
+        valid_areas = areas[valid]
+        
+        # Keep the largest components, ordered largest first (stable on ties)
+        top_k = max(1, self.config.max_contours_to_check)
+        selected = valid
+        if selected.size > top_k:
+            selected = selected[np.argpartition(-valid_areas, top_k - 1)[:top_k]]
+        selected = selected[np.argsort(-areas[selected], kind='stable')]
+        largest_area = float(areas[selected[0]])
+        
+        contour_info = {
+            'count': int(valid.size),
+            'largest_area': largest_area,
+            'total_area': float(valid_areas.sum()),
+            'average_area': float(valid_areas.mean()),
+            'boxes': stats[selected, :4].astype(np.int32),
+            'centroids': centroids[selected]
+        }
+        
+        return largest_area >= self.config.threshold, contour_info
+    
+    def _analyze_grid(self, fg_mask: np.ndarray, area_scale: float = 1.0) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Compute the foreground fraction of each cell of a coarse grid.
+        
+        INTER_AREA resizing averages the mask over each cell, so no contours
+        are extracted. A cell is active when its fraction reaches
+        grid_cell_threshold, and motion is detected when the foreground area
+        of the most active cell reaches threshold.
+        
+        Args:
+            fg_mask: Foreground mask from background subtraction (modified in place)
+            area_scale: Factor converting mask pixel areas to full-resolution areas
+        
+        Returns:
+            Tuple of (motion_detected, contour_info_dict) where contour_info['grid']
+            is a float32 (rows, cols) array of foreground fractions
+        """
+        rows, cols = self.config.grid_size
+        height, width = fg_mask.shape[:2]
+        
+        # Count shadow pixels as foreground, like the contour modes do
+        cv2.threshold(fg_mask, 0, 255, cv2.THRESH_BINARY, dst=fg_mask)
+        grid = cv2.resize(fg_mask, (cols, rows), interpolation=cv2.INTER_AREA).astype(np.float32)
+        grid *= 1.0 / 255
+        
+        active = np.flatnonzero(grid >= self.config.grid_cell_threshold)
+        if active.size == 0:
+            return False, {'count': 0, 'largest_area': 0, 'boxes': _NO_BOXES, 'grid': grid}
+        
+        # Active cells as boxes, most active first
+        fractions = grid.ravel()[active]
+        order = np.argsort(-fractions, kind='stable')
+        active = active[order][:max(1, self.config.max_contours_to_check)]
+        cell_rows, cell_cols = np.divmod(active, cols)
+        x0 = cell_cols * width // cols
+        y0 = cell_rows * height // rows
+        x1 = (cell_cols + 1) * width // cols
+        y1 = (cell_rows + 1) * height // rows
+        boxes = np.stack([x0, y0, x1 - x0, y1 - y0], axis=1).astype(np.int32)
+        
+        cell_area = (width / cols) * (height / rows) * area_scale
+        largest_area = float(fractions[order[0]]) * cell_area
+        
+        contour_info = {
+            'count': int(fractions.size),
+            'largest_area': largest_area,
+            'total_area': float(fractions.sum()) * cell_area,
+            'average_area': float(fractions.mean()) * cell_area,
+            'boxes': boxes,
+            'grid': grid
+        }
+        
+        return largest_area >= self.config.threshold, contour_info
+    
+    def get_motion_grid(self, camera_id: str) -> Optional[np.ndarray]:
+        """
+        Get the most recent grid-mode motion grid for a camera.
+        
+        Args:
+            camera_id: Camera identifier
+            
+        Returns:
+            float32 (rows, cols) array of per-cell foreground fractions over the
+            analysed area (the ROI bounding rectangle if one is set), or None if
+            the camera has not been analysed in grid mode
+        """
+        grid = self._motion_grids.get(camera_id)
+        return None if grid is None else grid.copy()
+    
+    def _to_capture_boxes(self, boxes: np.ndarray, scale: float,
+                          roi: Optional[_RegionOfInterest]) -> np.ndarray:
+        """Convert boxes from analysis coordinates to capture-frame pixels."""
+        if boxes.size == 0:
+            return boxes
+        boxes = boxes.astype(np.float64)
+        if scale < 1.0:
+            boxes /= scale
+        if roi is not None:
+            boxes[:, 0] += roi.x
+            boxes[:, 1] += roi.y
+        return np.round(boxes).astype(np.int32)
+    
     def _is_in_cooldown(self, camera_id: str, current_time: float) -> bool:
         """Check if camera is in cooldown period."""
         last_motion_time = self._last_motion_times.get(camera_id, 0)
@@ -206,15 +1130,36 @@ class MotionDetector:
             timestamp=timestamp,
             contour_count=contour_info['count'],
             largest_contour_area=contour_info['largest_area'],
-            frame_shape=(frame_shape[1], frame_shape[0])  # (width, height)
+            frame_shape=(frame_shape[1], frame_shape[0]),  # (width, height)
+            boxes=contour_info.get('boxes')
         )
         
+        # Ring buffer keeps the most recent event_history_size events
         self._motion_events[camera_id].append(event)
         self._last_motion_times[camera_id] = timestamp
         
-        # Keep only recent events (last 100 per camera)
-        if len(self._motion_events[camera_id]) > 100:
-            self._motion_events[camera_id] = self._motion_events[camera_id][-100:]
+        if self.event_sink is not None:
+            self.event_sink.write(event)
+        if self.event_bus is not None:
+            self.event_bus.publish(event)
+    
+    def subscribe(self, callback: Callable[[MotionEvent], Any], **kwargs) -> Any:
+        """
+        Register a callback for motion events, delivered on its own thread.
+        
+        Args:
+            callback: Called with each recorded MotionEvent
+            **kwargs: Subscription options for MotionEventBus.subscribe()
+                (name, max_queue, policy, camera_ids)
+            
+        Returns:
+            The Subscription, with per-subscriber drop and delivery counters
+        """
+        if self.event_bus is None:
+            from .event_bus import MotionEventBus
+            self.event_bus = MotionEventBus()
+            self._owns_event_bus = True
+        return self.event_bus.subscribe(callback, **kwargs)
     
     def was_motion_detected(self, camera_id: str, within_seconds: float = 5.0) -> bool:
         """
@@ -230,23 +1175,24 @@ class MotionDetector:
         last_motion_time = self._last_motion_times.get(camera_id, 0)
         return (time.time() - last_motion_time) <= within_seconds
     
-    def get_motion_events(self, camera_id: str, since_timestamp: Optional[float] = None) -> list:
+    def get_motion_events(self, camera_id: str, since_timestamp: Optional[float] = None,
+                          until_timestamp: Optional[float] = None) -> MotionEventView:
         """
         Get motion events for a camera.
         
         Args:
             camera_id: Camera identifier
-            since_timestamp: Only return events after this timestamp (optional)
+            since_timestamp: Only return events at or after this timestamp (optional)
+            until_timestamp: Only return events at or before this timestamp (optional)
             
         Returns:
-            List of MotionEvent objects
+            Sequence of MotionEvent objects, oldest first
         """
-        events = self._motion_events.get(camera_id, [])
-        
-        if since_timestamp is not None:
-            events = [event for event in events if event.timestamp >= since_timestamp]
+        events = self._motion_events.get(camera_id)
+        if events is None:
+            return MotionEventView(camera_id, np.zeros(0, dtype=_event_dtype(0)))
         
-        return events
+        return events.query(since_timestamp, until_timestamp)
     
     def get_camera_stats(self, camera_id: str) -> Dict[str, Any]:
         """
@@ -265,10 +1211,19 @@ class MotionDetector:
         return {
             'camera_id': camera_id,
             'frames_processed': frame_count,
+            'frames_analyzed': self._frames_analyzed.get(camera_id, 0),
+            'frames_skipped_idle': self._frames_skipped_idle.get(camera_id, 0),
+            'sampling_interval': self._sample_intervals.get(camera_id, 1),
             'motion_events_count': len(events),
+            'motion_events_total': events.total if events else 0,
             'last_motion_timestamp': last_motion,
             'last_motion_ago_seconds': time.time() - last_motion if last_motion > 0 else None,
             'has_background_subtractor': camera_id in self._bg_subtractors,
+            'background_backend': self._bg_backends.get(camera_id),
+            'warm_started': self._warm_started.get(camera_id, False),
+            'lighting_changes': self._lighting_changes.get(camera_id, 0),
+            'last_lighting_change_timestamp': self._last_lighting_changes.get(camera_id),
+            'timing': self._timings[camera_id].summary() if camera_id in self._timings else None,
             'is_in_cooldown': self._is_in_cooldown(camera_id, time.time())
         }
     
@@ -276,19 +1231,55 @@ class MotionDetector:
         """Reset motion detection state for a camera."""
         if camera_id in self._bg_subtractors:
             del self._bg_subtractors[camera_id]
+        self._bg_backends.pop(camera_id, None)
         
         self._last_motion_times.pop(camera_id, None)
         self._motion_events.pop(camera_id, None)
         self._frame_counts.pop(camera_id, None)
+        self._frames_analyzed.pop(camera_id, None)
+        self._sample_intervals.pop(camera_id, None)
+        self._frames_since_analysis.pop(camera_id, None)
+        self._frames_skipped_idle.pop(camera_id, None)
+        self._last_activity_times.pop(camera_id, None)
+        self._rois.pop(camera_id, None)
+        self._heatmaps.pop(camera_id, None)
+        self._buffers.pop(camera_id, None)
+        self._motion_grids.pop(camera_id, None)
+        self._warm_started.pop(camera_id, None)
+        self._last_reference_saves.pop(camera_id, None)
+        self._reference_saves.pop(camera_id, None)
+        self._timings.pop(camera_id, None)
+        self._lighting_refs.pop(camera_id, None)
+        self._lighting_adapt_remaining.pop(camera_id, None)
+        self._lighting_changes.pop(camera_id, None)
+        self._last_lighting_changes.pop(camera_id, None)
         
         logger.info(f"Reset motion detection state for camera: {camera_id}")
     
     def reset_all(self) -> None:
         """Reset motion detection state for all cameras."""
         self._bg_subtractors.clear()
+        self._bg_backends.clear()
         self._last_motion_times.clear()
         self._motion_events.clear()
         self._frame_counts.clear()
+        self._frames_analyzed.clear()
+        self._sample_intervals.clear()
+        self._frames_since_analysis.clear()
+        self._frames_skipped_idle.clear()
+        self._last_activity_times.clear()
+        self._rois.clear()
+        self._heatmaps.clear()
+        self._buffers.clear()
+        self._motion_grids.clear()
+        self._warm_started.clear()
+        self._last_reference_saves.clear()
+        self._reference_saves.clear()
+        self._timings.clear()
+        self._lighting_refs.clear()
+        self._lighting_adapt_remaining.clear()
+        self._lighting_changes.clear()
+        self._last_lighting_changes.clear()
         
         logger.info("Reset motion detection state for all cameras")
     
@@ -298,10 +1289,26 @@ class MotionDetector:
         Note: Existing background subtractors will need to be recreated.
         """
         self.config = new_config
-        # Clear existing subtractors so they get recreated with new config
+        # Clear existing subtractors and ROIs so they get recreated with new config
         self._bg_subtractors.clear()
+        self._rois.clear()
+        self._warm_started.clear()
         logger.info(f"Updated motion detection config: threshold={self.config.threshold}, "
                    f"cooldown={self.config.cooldown}s")
+    
+    def close(self) -> None:
+        """Save reference frames for the next warm start and shut down worker threads."""
+        self.save_reference_frames()
+        if self._reference_writer is not None:
+            self._reference_writer.shutdown(wait=True)
+            self._reference_writer = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._owns_event_bus:
+            self.event_bus.close()
+            self.event_bus = None
+            self._owns_event_bus = False
 
 
 # Convenience functions for simple use cases
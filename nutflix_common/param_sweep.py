@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Motion Parameter Sweep for Nutflix Common
+Replays recorded clips through many MotionConfig variants in parallel and compares the results
+
+Example:
+    python -m nutflix_common.param_sweep --clips sample_clips \
+        --param threshold=[300,500,800] --param mog2_var_threshold=[16,32] \
+        --ground-truth sample_clips/ground_truth.json --workers 4
+
+The optional ground-truth file maps clip file names to motion intervals in
+seconds from the start of the clip: {"camera1.mp4": [[3.0, 7.5], [20.0, 24.0]]}
+"""
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, fields
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+import yaml
+
+from .config_loader import load_config
+from .logger import set_global_log_level
+from .media_utils import find_clips
+from .motion_utils import MotionConfig, MotionDetector
+
+
+@dataclass
+class ClipResult:
+    """Outcome of replaying one clip through one configuration."""
+    clip: str
+    frames: int
+    event_times: List[float]           # Motion event times in seconds from the clip start
+    latencies_ms: List[float]          # process_frame latency per frame
+
+
+@dataclass
+class SweepResult:
+    """Aggregated outcome of one configuration over all clips."""
+    params: Dict[str, Any]             # Swept parameter values for this variant
+    frames: int = 0
+    events: int = 0
+    mean_latency_ms: float = 0.0
+    p95_latency_ms: float = 0.0
+    precision: Optional[float] = None  # Fraction of events inside a ground-truth interval
+    recall: Optional[float] = None     # Fraction of ground-truth intervals with at least one event
+    events_per_clip: Dict[str, int] = field(default_factory=dict)
+
+
+def parse_param(spec: str) -> Tuple[str, List[Any]]:
+    """
+    Parse a NAME=VALUES sweep argument.
+
+    VALUES is YAML: a list sweeps over its items, a scalar is a single value,
+    e.g. threshold=[300,500] or gaussian_blur_kernel=[[11,11],[21,21]].
+
+    Raises:
+        ValueError: If the spec is malformed or names an unknown MotionConfig field
+    """
+    name, sep, values = spec.partition("=")
+    if not sep or not name.strip():
+        raise ValueError(f"Expected NAME=VALUES, got '{spec}'")
+    return _grid_entry(name.strip(), yaml.safe_load(values))
+
+
+def _grid_entry(name: str, values: Any) -> Tuple[str, List[Any]]:
+    """Validate a swept parameter name and wrap single values in a list."""
+    if name not in {f.name for f in fields(MotionConfig)}:
+        raise ValueError(f"Unknown MotionConfig field '{name}'")
+    return name, values if isinstance(values, list) else [values]
+
+
+def build_variants(base: Dict[str, Any], grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """
+    Expand a parameter grid into the cartesian product of config dictionaries.
+
+    Args:
+        base: Baseline motion_detection settings every variant starts from
+        grid: Mapping of MotionConfig field name to the values to try
+
+    Returns:
+        List of config dictionaries, one per combination
+    """
+    names = list(grid)
+    variants = []
+    for combination in itertools.product(*(grid[name] for name in names)):
+        variant = dict(base)
+        variant.update(zip(names, combination))
+        variants.append(variant)
+    return variants
+
+
+def run_clip(config_dict: Dict[str, Any], clip_path: str, max_frames: Optional[int] = None) -> ClipResult:
+    """
+    Replay one clip through a fresh MotionDetector.
+
+    Frames are stamped with their position in the clip (frame index / fps), so
+    cooldowns and adaptive sampling behave as they would in real time.
+    """
+    config = MotionConfig.from_dict(config_dict)
+    detector = MotionDetector(config)
+    capture = cv2.VideoCapture(clip_path)
+    fps = capture.get(cv2.CAP_PROP_FPS) or 30.0
+    # Offset so the detector's initial cooldown does not swallow the clip start
+    start_time = time.time()
+
+    event_times, latencies = [], []
+    frames = 0
+    try:
+        while max_frames is None or frames < max_frames:
+            ok, frame = capture.read()
+            if not ok:
+                break
+            offset = frames / fps
+            begin = time.perf_counter()
+            motion = detector.process_frame(frame, "sweep", timestamp=start_time + offset)
+            latencies.append(1000 * (time.perf_counter() - begin))
+            if motion:
+                event_times.append(offset)
+            frames += 1
+    finally:
+        capture.release()
+        detector.close()
+
+    return ClipResult(os.path.basename(clip_path), frames, event_times, latencies)
+
+
+def score_events(event_times: Sequence[float], intervals: Sequence[Sequence[float]],
+                 tolerance: float = 0.0) -> Tuple[int, int]:
+    """
+    Match events against ground-truth intervals.
+
+    Returns:
+        (events inside an interval, intervals containing at least one event)
+    """
+    if not len(intervals):
+        return 0, 0
+    bounds = np.asarray(intervals, dtype=np.float64).reshape(-1, 2)
+    times = np.asarray(event_times, dtype=np.float64).reshape(-1, 1)
+    hits = (times >= bounds[:, 0] - tolerance) & (times <= bounds[:, 1] + tolerance)
+    return int(hits.any(axis=1).sum()), int(hits.any(axis=0).sum())
+
+
+def _run_task(task: Tuple[int, Dict[str, Any], str, Optional[int]]) -> Tuple[int, ClipResult]:
+    """Process-pool entry point: replay one (variant, clip) pair."""
+    index, config_dict, clip_path, max_frames = task
+    return index, run_clip(config_dict, clip_path, max_frames)
+
+
+def _init_worker(log_level: str) -> None:
+    """Quiet the per-frame detector logging in pool workers."""
+    set_global_log_level(log_level)
+
+
+def run_sweep(variants: List[Dict[str, Any]], clips: List[str], swept: Sequence[str],
+              ground_truth: Optional[Dict[str, List[List[float]]]] = None,
+              tolerance: float = 0.0, workers: Optional[int] = None,
+              max_frames: Optional[int] = None, log_level: str = "WARNING") -> List[SweepResult]:
+    """
+    Replay every clip through every variant using a process pool.
+
+    Args:
+        variants: Config dictionaries from build_variants()
+        clips: Video files to replay
+        swept: Names of the swept parameters (reported per result)
+        ground_truth: Optional mapping of clip file name to motion intervals
+        tolerance: Seconds an event may fall outside an interval and still match
+        workers: Pool size (None = CPU count)
+        max_frames: Only replay the first N frames of each clip
+        log_level: Log level for the pool workers
+
+    Returns:
+        One SweepResult per variant, in variant order
+    """
+    results = [SweepResult(params={name: variant[name] for name in swept}) for variant in variants]
+    latencies: List[List[float]] = [[] for _ in variants]
+    true_events = [0] * len(variants)
+    matched_intervals = [0] * len(variants)
+    total_intervals = sum(len(ground_truth.get(os.path.basename(clip), [])) for clip in clips) \
+        if ground_truth is not None else 0
+
+    tasks = [(index, variant, clip, max_frames)
+             for index, variant in enumerate(variants) for clip in clips]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(log_level,)) as pool:
+        for index, clip_result in pool.map(_run_task, tasks):
+            result = results[index]
+            result.frames += clip_result.frames
+            result.events += len(clip_result.event_times)
+            result.events_per_clip[clip_result.clip] = len(clip_result.event_times)
+            latencies[index].extend(clip_result.latencies_ms)
+            if ground_truth is not None:
+                inside, matched = score_events(clip_result.event_times,
+                                               ground_truth.get(clip_result.clip, []), tolerance)
+                true_events[index] += inside
+                matched_intervals[index] += matched
+
+    for index, result in enumerate(results):
+        if latencies[index]:
+            result.mean_latency_ms = float(np.mean(latencies[index]))
+            result.p95_latency_ms = float(np.percentile(latencies[index], 95))
+        if ground_truth is not None:
+            result.precision = true_events[index] / result.events if result.events else None
+            result.recall = matched_intervals[index] / total_intervals if total_intervals else None
+
+    return results
+
+
+def pick_cheapest(results: List[SweepResult], min_recall: float) -> Optional[SweepResult]:
+    """Get the lowest-latency result whose recall reaches min_recall."""
+    candidates = [r for r in results if r.recall is not None and r.recall >= min_recall]
+    return min(candidates, key=lambda r: r.mean_latency_ms) if candidates else None
+
+
+def _format_metric(value: Optional[float]) -> str:
+    """Format an optional ratio for the results table."""
+    return "   -" if value is None else f"{value:.2f}"
+
+
+def print_results(results: List[SweepResult]) -> None:
+    """Print a results table, best recall first, then fastest."""
+    ordered = sorted(results, key=lambda r: (-(r.recall or 0.0), r.mean_latency_ms))
+    print(f"{'events':>7} {'mean ms':>8} {'p95 ms':>8} {'prec':>5} {'recall':>6}  params")
+    for result in ordered:
+        print(f"{result.events:>7} {result.mean_latency_ms:>8.2f} {result.p95_latency_ms:>8.2f} "
+              f"{_format_metric(result.precision):>5} {_format_metric(result.recall):>6}  {result.params}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Sweep MotionConfig parameters over recorded clips")
+    parser.add_argument("--clips", nargs="+", default=["sample_clips"],
+                        help="Video files or directories of clips (default: sample_clips)")
+    parser.add_argument("--config", help="Config file whose motion_detection section is the baseline")
+    parser.add_argument("--param", action="append", default=[], metavar="NAME=VALUES",
+                        help="Parameter to sweep, e.g. threshold=[300,500,800] (repeatable)")
+    parser.add_argument("--grid", help="YAML/JSON file mapping parameter names to lists of values")
+    parser.add_argument("--ground-truth", help="JSON file mapping clip names to [[start, end], ...] seconds")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="Seconds an event may fall outside a ground-truth interval (default: 0.5)")
+    parser.add_argument("--min-recall", type=float, default=1.0,
+                        help="Recall the recommended configuration must reach (default: 1.0)")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    parser.add_argument("--max-frames", type=int, default=None, help="Only replay the first N frames of each clip")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    set_global_log_level("WARNING")
+
+    base = load_config(args.config).get('motion_detection', {}) if args.config else {}
+    # Never prime from or overwrite the deployment's reference frames, and replay
+    # every variant cold; --param warm_start_dir=... opts back in
+    base['warm_start_dir'] = None
+    grid: Dict[str, List[Any]] = {}
+    try:
+        if args.grid:
+            grid.update(_grid_entry(name, values) for name, values in load_config(args.grid).items())
+        for spec in args.param:
+            grid.update([parse_param(spec)])
+    except ValueError as e:
+        parser.error(str(e))
+
+    clips = find_clips(args.clips)
+    if not clips:
+        parser.error(f"No video clips found in {args.clips}")
+
+    ground_truth = None
+    if args.ground_truth:
+        with open(args.ground_truth, 'r', encoding='utf-8') as file:
+            ground_truth = json.load(file)
+
+    variants = build_variants(base, grid)
+    print(f"Sweeping {len(variants)} configurations over {len(clips)} clips")
+    results = run_sweep(variants, clips, list(grid), ground_truth, args.tolerance,
+                        args.workers, args.max_frames)
+    print_results(results)
+
+    if ground_truth is not None:
+        best = pick_cheapest(results, args.min_recall)
+        if best is not None:
+            print(f"\nCheapest configuration with recall >= {args.min_recall}: {best.params} "
+                  f"({best.mean_latency_ms:.2f} ms/frame)")
+        else:
+            print(f"\nNo configuration reached recall {args.min_recall}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump([asdict(result) for result in results], file, indent=2)
+        print(f"Results written to {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Motion Blob Tracker for Nutflix Common
+Associates motion boxes across frames into tracks with stable IDs
+"""
+
+import itertools
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from .logger import get_motion_logger
+from .motion_utils import MotionEvent
+
+# Get logger for this module
+logger = get_motion_logger()
+
+
+@dataclass
+class Track:
+    """A blob followed across frames."""
+    track_id: int
+    camera_id: str
+    box: np.ndarray                        # Latest (x, y, width, height) in capture pixels
+    enter_timestamp: float
+    last_seen: float
+    exit_timestamp: Optional[float] = None  # Set when the track expires
+    hits: int = 1                          # Frames the blob was matched in
+
+    @property
+    def centroid(self) -> np.ndarray:
+        """Centre of the latest box."""
+        return self.box[:2] + self.box[2:] / 2.0
+
+    @property
+    def active(self) -> bool:
+        """Whether the track is still being followed."""
+        return self.exit_timestamp is None
+
+    @property
+    def duration(self) -> float:
+        """Seconds between entering and the last sighting."""
+        return self.last_seen - self.enter_timestamp
+
+
+def iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Pairwise intersection-over-union of two sets of (x, y, width, height) boxes.
+
+    Returns:
+        (len(a), len(b)) float array
+    """
+    a = a.astype(np.float64).reshape(-1, 1, 4)
+    b = b.astype(np.float64).reshape(1, -1, 4)
+    overlap_w = np.clip(np.minimum(a[..., 0] + a[..., 2], b[..., 0] + b[..., 2])
+                        - np.maximum(a[..., 0], b[..., 0]), 0, None)
+    overlap_h = np.clip(np.minimum(a[..., 1] + a[..., 3], b[..., 1] + b[..., 3])
+                        - np.maximum(a[..., 1], b[..., 1]), 0, None)
+    intersection = overlap_w * overlap_h
+    union = a[..., 2] * a[..., 3] + b[..., 2] * b[..., 3] - intersection
+    return np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
+
+
+def centroid_distance_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Pairwise distances between the centres of two sets of (x, y, width, height) boxes.
+
+    Returns:
+        (len(a), len(b)) float array
+    """
+    a = a.astype(np.float64).reshape(-1, 4)
+    b = b.astype(np.float64).reshape(-1, 4)
+    centres_a = a[:, :2] + a[:, 2:] / 2.0
+    centres_b = b[:, :2] + b[:, 2:] / 2.0
+    return np.linalg.norm(centres_a[:, None, :] - centres_b[None, :, :], axis=2)
+
+
+class CentroidTracker:
+    """
+    Greedy IoU/centroid tracker for one camera.
+
+    Each update builds a cost matrix between active tracks and the new boxes:
+    overlapping pairs cost 1 - IoU, non-overlapping pairs whose centres are
+    within max_distance cost 1 + distance / max_distance (so any overlap wins),
+    anything else cannot match. Pairs are assigned cheapest first, unmatched
+    boxes start new tracks, and tracks unseen for max_idle_seconds exit.
+    """
+
+    def __init__(self, camera_id: str = "", max_distance: float = 100.0, min_iou: float = 0.1,
+                 max_idle_seconds: float = 5.0,
+                 on_enter: Optional[Callable[[Track], None]] = None,
+                 on_exit: Optional[Callable[[Track], None]] = None,
+                 id_source: Optional[Iterator[int]] = None):
+        """
+        Args:
+            camera_id: Camera the tracked boxes come from
+            max_distance: Largest centroid jump (capture pixels) between sightings
+            min_iou: Smallest overlap that counts as the same blob
+            max_idle_seconds: Seconds without a sighting before a track exits. Should
+                exceed the detector cooldown, since no events arrive during it.
+            on_enter: Called with each new track
+            on_exit: Called with each track when it exits
+            id_source: Iterator of track IDs (share one to keep IDs unique across cameras)
+        """
+        self.camera_id = camera_id
+        self.max_distance = max_distance
+        self.min_iou = min_iou
+        self.max_idle_seconds = max_idle_seconds
+        self.on_enter = on_enter
+        self.on_exit = on_exit
+        self._ids = id_source if id_source is not None else itertools.count(1)
+        self._tracks: List[Track] = []
+
+    @property
+    def active_tracks(self) -> List[Track]:
+        """Tracks currently being followed."""
+        return list(self._tracks)
+
+    def update(self, boxes: Optional[np.ndarray], timestamp: float) -> List[Track]:
+        """
+        Associate a frame's motion boxes with the active tracks.
+
+        Args:
+            boxes: (N, 4) array of (x, y, width, height), e.g. MotionEvent.boxes
+            timestamp: Capture time of the frame
+
+        Returns:
+            The tracks matched or started by this frame, one per box
+        """
+        self.expire(timestamp)
+        boxes = np.empty((0, 4), dtype=np.int32) if boxes is None else np.asarray(boxes).reshape(-1, 4)
+        if len(boxes) == 0:
+            return []
+
+        matches = self._match(boxes)
+        current: List[Track] = []
+        for box_index, box in enumerate(boxes):
+            track = matches.get(box_index)
+            if track is None:
+                track = Track(next(self._ids), self.camera_id, box.copy(), timestamp, timestamp)
+                self._tracks.append(track)
+                logger.debug(f"Track {track.track_id} entered {self.camera_id} at {tuple(box)}")
+                if self.on_enter is not None:
+                    self.on_enter(track)
+            else:
+                track.box = box.copy()
+                track.last_seen = timestamp
+                track.hits += 1
+            current.append(track)
+        return current
+
+    def _match(self, boxes: np.ndarray) -> Dict[int, Track]:
+        """Greedily assign boxes to active tracks. Returns box index -> track."""
+        if not self._tracks:
+            return {}
+
+        track_boxes = np.stack([track.box for track in self._tracks])
+        iou = iou_matrix(track_boxes, boxes)
+        distance = centroid_distance_matrix(track_boxes, boxes)
+
+        cost = np.where(iou >= self.min_iou, 1.0 - iou, 1.0 + distance / max(self.max_distance, 1e-6))
+        cost[(iou < self.min_iou) & (distance > self.max_distance)] = np.inf
+
+        matches: Dict[int, Track] = {}
+        used_tracks = set()
+        for flat_index in np.argsort(cost, axis=None):
+            track_index, box_index = divmod(int(flat_index), cost.shape[1])
+            if not np.isfinite(cost[track_index, box_index]):
+                break
+            if track_index in used_tracks or box_index in matches:
+                continue
+            used_tracks.add(track_index)
+            matches[box_index] = self._tracks[track_index]
+            if len(used_tracks) == len(self._tracks) or len(matches) == len(boxes):
+                break
+        return matches
+
+    def expire(self, timestamp: float) -> List[Track]:
+        """
+        End tracks that have not been seen for max_idle_seconds.
+
+        Call periodically when no motion events arrive, so tracks still exit.
+
+        Returns:
+            Tracks that exited, with exit_timestamp set to their last sighting
+        """
+        expired = [t for t in self._tracks if timestamp - t.last_seen > self.max_idle_seconds]
+        if expired:
+            self._tracks = [t for t in self._tracks if timestamp - t.last_seen <= self.max_idle_seconds]
+            for track in expired:
+                track.exit_timestamp = track.last_seen
+                logger.debug(f"Track {track.track_id} left {self.camera_id} after "
+                             f"{track.duration:.1f}s ({track.hits} sightings)")
+                if self.on_exit is not None:
+                    self.on_exit(track)
+        return expired
+
+    def close(self) -> List[Track]:
+        """End all active tracks at their last sighting."""
+        return self.expire(float("inf"))
+
+
+class MotionTracker:
+    """
+    Per-camera trackers fed with MotionEvents.
+
+    handle_event() can be registered directly as a MotionDetector subscriber:
+        detector.subscribe(tracker.handle_event, name="tracker")
+    """
+
+    def __init__(self, **tracker_options):
+        """
+        Args:
+            **tracker_options: CentroidTracker options shared by all cameras
+                (max_distance, min_iou, max_idle_seconds, on_enter, on_exit)
+        """
+        self._options = tracker_options
+        self._ids = itertools.count(1)
+        self._trackers: Dict[str, CentroidTracker] = {}
+        self._lock = threading.Lock()
+
+    def _get_tracker(self, camera_id: str) -> CentroidTracker:
+        """Get or create the tracker for a camera."""
+        tracker = self._trackers.get(camera_id)
+        if tracker is None:
+            tracker = CentroidTracker(camera_id, id_source=self._ids, **self._options)
+            self._trackers[camera_id] = tracker
+        return tracker
+
+    def handle_event(self, event: MotionEvent) -> List[Track]:
+        """Update the event's camera with its boxes. Returns the tracks it touched."""
+        with self._lock:
+            return self._get_tracker(event.camera_id).update(event.boxes, event.timestamp)
+
+    def expire(self, timestamp: float) -> List[Track]:
+        """Expire idle tracks on every camera."""
+        with self._lock:
+            return [track for tracker in self._trackers.values() for track in tracker.expire(timestamp)]
+
+    def get_active_tracks(self, camera_id: Optional[str] = None) -> List[Track]:
+        """Get active tracks for one camera or all cameras."""
+        with self._lock:
+            if camera_id is None:
+                trackers = list(self._trackers.values())
+            else:
+                trackers = [self._trackers[camera_id]] if camera_id in self._trackers else []
+            return [track for tracker in trackers for track in tracker.active_tracks]
+
+    def close(self) -> List[Track]:
+        """End all active tracks."""
+        with self._lock:
+            return [track for tracker in self._trackers.values() for track in tracker.close()]
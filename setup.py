@@ -51,7 +51,9 @@ setup(
     },
     entry_points={
         'console_scripts': [
-            # Add CLI scripts here if needed
+            'nutflix-ai-bench=nutflix_common.ai_bench:main',
+            'nutflix-bench=nutflix_common.bench:main',
+            'nutflix-sweep=nutflix_common.param_sweep:main',
         ],
     },
     include_package_data=True,
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test script for bench.py
+Tests the nutflix-bench JSON report
+"""
+
+import json
+import os
+import tempfile
+import yaml
+from nutflix_common.bench import compare_buffer_reuse, main, synthetic_frames
+from nutflix_common.motion_utils import MotionConfig
+
+
+def test_synthetic_frames():
+    """Test that synthetic frames are repeatable."""
+    print("Testing synthetic frames...")
+
+    first = list(synthetic_frames(5, 64, 48, seed=3))
+    second = list(synthetic_frames(5, 64, 48, seed=3))
+    assert len(first) == 5 and first[0].shape == (48, 64, 3)
+    assert all((a == b).all() for a, b in zip(first, second))
+
+    print("✅ Synthetic frames test completed")
+
+
+def test_bench_report():
+    """Test a short synthetic benchmark run."""
+    print("Testing nutflix-bench report...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output = os.path.join(tmp_dir, "bench.json")
+        assert main(["--synthetic", "150", "--cameras", "2", "--width", "160", "--height", "120",
+                     "--warmup", "10", "--set", "cooldown=0.0", "--output", output]) == 0
+        with open(output, 'r', encoding='utf-8') as file:
+            report = json.load(file)
+
+    results = report['results']
+    print(f"  {results['frames']} frames, {results['detect_fps']} fps, "
+          f"p95 {results['latency_ms']['p95']} ms, {results['motion_events']} events")
+    assert results['frames'] == 300 and results['measured_frames'] == 280
+    assert results['detect_fps'] > 0 and results['wall_fps'] > 0
+    latency = results['latency_ms']
+    assert latency['p50'] <= latency['p95'] <= latency['p99'] <= latency['max']
+    assert results['motion_events'] > 0
+    assert set(results['cameras']) == {"synthetic_0", "synthetic_1"}
+    assert report['config']['cooldown'] == 0.0
+    assert 'opencv' in report['environment']
+    if results['peak_rss_mb'] is not None:
+        assert results['peak_rss_mb'] > 0
+
+    print("✅ Bench report test completed")
+
+
+def test_bench_measures_analyzed_frames():
+    """Test that cooldown-skipped frames are left out of the latency statistics."""
+    print("Testing nutflix-bench latency with cooldowns...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output = os.path.join(tmp_dir, "bench.json")
+        assert main(["--synthetic", "200", "--width", "160", "--height", "120", "--warmup", "0",
+                     "--set", "cooldown=1.0", "--output", output]) == 0
+        with open(output, 'r', encoding='utf-8') as file:
+            results = json.load(file)['results']
+
+    print(f"  {results['analyzed_frames']} of {results['frames']} frames analysed, "
+          f"p50 {results['latency_ms']['p50']} ms")
+    assert results['analyzed_frames'] < results['frames']
+    assert results['measured_frames'] == results['analyzed_frames']
+    assert results['cameras']['synthetic_0']['stage_timing']['total']['count'] == results['measured_frames']
+
+    print("✅ Analysed frame latency test completed")
+
+
+def test_bench_ignores_warm_start_dir():
+    """Test that a production config's warm start directory is left alone."""
+    print("Testing nutflix-bench with a warm start config...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        reference_dir = os.path.join(tmp_dir, "background")
+        config_path = os.path.join(tmp_dir, "config.yaml")
+        with open(config_path, 'w', encoding='utf-8') as file:
+            yaml.safe_dump({'motion_detection': {'warm_start_dir': reference_dir}}, file)
+        output = os.path.join(tmp_dir, "bench.json")
+        assert main(["--synthetic", "20", "--width", "160", "--height", "120", "--warmup", "0",
+                     "--config", config_path, "--output", output]) == 0
+        with open(output, 'r', encoding='utf-8') as file:
+            assert json.load(file)['config']['warm_start_dir'] is None
+        assert not os.path.exists(reference_dir), "Benchmark must not write reference frames"
+
+    print("✅ Warm start isolation test completed")
+
+
+def test_compare_buffer_reuse():
+    """Test that reused work buffers cut per-frame allocations."""
+    print("Testing buffer reuse comparison...")
+
+    report = compare_buffer_reuse(MotionConfig(), list(synthetic_frames(40, 320, 240)), warmup=10)
+    fresh, reused = report['fresh'], report['reused']
+    print(f"  fresh {fresh['mean_ms']} ms, {fresh['transient_alloc_kb_per_frame']} KB/frame; "
+          f"reused {reused['mean_ms']} ms, {reused['transient_alloc_kb_per_frame']} KB/frame")
+    assert report['frames'] == 30
+    assert reused['transient_alloc_kb_per_frame'] < fresh['transient_alloc_kb_per_frame'] / 4
+
+    # Without any stream the CLI reports a usage error instead of crashing
+    try:
+        main(["--synthetic", "0", "--compare-buffers"])
+        assert False, "Expected a usage error"
+    except SystemExit as e:
+        assert e.code == 2
+
+    print("✅ Buffer reuse comparison test completed")
+
+
+if __name__ == "__main__":
+    test_synthetic_frames()
+    test_bench_report()
+    test_bench_measures_analyzed_frames()
+    test_bench_ignores_warm_start_dir()
+    test_compare_buffer_reuse()
+    print("\n🎉 All bench tests passed!")
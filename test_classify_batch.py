@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test script for ImageClassifier.classify_batch() and classify_regions()
+Runs the model comparison only when PyTorch is installed
+"""
+
+import numpy as np
+from nutflix_common.ai_utils import (ImageClassifier, TORCH_AVAILABLE, classify_batch, crop_square_region,
+                                     load_model)
+
+
+def test_batch_without_model():
+    """Test the batch API's edge cases without ML dependencies."""
+    print("Testing classify_batch edge cases...")
+
+    frames = [np.zeros((120, 160, 3), dtype=np.uint8) for _ in range(3)]
+    assert classify_batch(None, frames) == [[("error", 0.0)]] * 3
+
+    classifier = ImageClassifier(model_type="unknown")
+    assert classifier.classify_batch([]) == []
+    assert classifier.classify_batch(frames, top_k=2) == [[("error", 0.0)]] * 3
+
+    assert classifier._get_label(281) == "tabby cat"
+    assert classifier._get_label(7) == "class_7"
+
+    print("✅ Edge case test completed")
+
+
+def test_batch_matches_single():
+    """Test that batched results match per-frame results (PyTorch only)."""
+    if not TORCH_AVAILABLE:
+        print("PyTorch not available, skipping batch comparison")
+        return
+    print("Testing classify_batch against classify_frame...")
+
+    classifier = load_model("torch", device="cpu")
+    assert classifier is not None
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 255, (h, w, 3), dtype=np.uint8) for h, w in [(240, 320), (100, 80), (224, 224)]]
+
+    results = classifier.classify_batch(frames, top_k=3, batch_size=2)
+    assert len(results) == 3 and all(len(top) == 3 for top in results)
+    for frame, top in zip(frames, results):
+        label, confidence = classifier.classify_frame(frame)
+        assert top[0][0] == label and abs(top[0][1] - confidence) < 1e-4
+        assert top[0][1] >= top[1][1] >= top[2][1]
+
+    print("✅ Batch comparison test completed")
+
+
+def test_crop_square_region():
+    """Test that region crops are square and keep the whole box."""
+    print("Testing crop_square_region...")
+
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    frame[200:230, 300:340] = 255  # 40x30 blob
+
+    crop = crop_square_region(frame, (300, 200, 40, 30), padding=0.25)
+    assert crop.shape == (60, 60, 3)
+    assert crop.sum() == frame.sum(), "Box pixels must all be inside the crop"
+
+    # Near the corner the square shifts inside the frame instead of shrinking
+    crop = crop_square_region(frame, (0, 0, 50, 20), padding=0.1)
+    assert crop.shape == (60, 60, 3)
+
+    # Taller than the frame: pad with black to stay square
+    crop = crop_square_region(frame, (100, 0, 600, 480), padding=0.0)
+    assert crop.shape == (600, 600, 3)
+    assert crop[:60].sum() == 0 and crop[-60:].sum() == 0
+
+    # Tiny boxes are grown to min_size
+    assert crop_square_region(frame, (10, 10, 2, 3), min_size=32).shape == (32, 32, 3)
+
+    classifier = ImageClassifier(model_type="unknown")
+    assert classifier.classify_regions(frame, None) == []
+    boxes = np.array([[300, 200, 40, 30]] * 6, dtype=np.int32)
+    assert len(classifier.classify_regions(frame, boxes, max_regions=4)) == 4
+
+    print("✅ Region crop test completed")
+
+
+if __name__ == "__main__":
+    test_batch_without_model()
+    test_crop_square_region()
+    test_batch_matches_single()
+    print("\n🎉 All classify_batch tests passed!")
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Test script for clip_recorder.py
+Tests motion-triggered clips with a JPEG pre-roll
+"""
+
+import os
+import tempfile
+import time
+import cv2
+import numpy as np
+from nutflix_common.clip_recorder import ClipRecorder
+from nutflix_common.motion_utils import MotionEvent
+
+
+def make_frame(index: int) -> np.ndarray:
+    """Create a textured frame with a moving bar so every frame is distinct."""
+    frame = np.full((240, 320, 3), 60, dtype=np.uint8)
+    frame[:, (index * 7) % 300:(index * 7) % 300 + 20] = 200
+    return frame
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    """Poll a condition until it holds or the timeout expires."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_clip_recorder():
+    """Test that a motion event writes the pre-roll plus post-roll to a clip."""
+    print("Testing ClipRecorder...")
+
+    saved = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        recorder = ClipRecorder(tmp_dir, pre_roll_seconds=1.0, post_roll_seconds=0.5, fps=10.0,
+                                max_pending_frames=64, on_clip_saved=lambda cam, path: saved.append(path))
+
+        # 30 fps input is sampled down to the 10 fps clip rate
+        accepted = [recorder.add_frame("nut/cam", make_frame(i), timestamp=i / 30) for i in range(60)]
+        assert sum(accepted) == 20
+        assert wait_for(lambda: recorder._frames.empty())
+        time.sleep(0.1)  # Let the encoder finish the last frame
+        stats = recorder.get_stats()["nut/cam"]
+        print(f"  Pre-roll: {stats['pre_roll_frames']} frames, {stats['pre_roll_bytes'] / 1024:.0f} KB")
+        assert stats['pre_roll_frames'] <= 11
+        assert stats['pre_roll_bytes'] < stats['pre_roll_frames'] * 240 * 320 * 3 / 5
+
+        recorder.on_motion_event(MotionEvent("nut/cam", 2.0, 1, 500.0, (320, 240)))
+        for i in range(20, 40):
+            recorder.add_frame("nut/cam", make_frame(i), timestamp=i / 10)
+        assert wait_for(lambda: len(saved) == 1)
+        recorder.close()
+
+        path = saved[0]
+        print(f"  Clip: {os.path.relpath(path, tmp_dir)}")
+        assert os.path.dirname(path) == os.path.join(tmp_dir, "nut_cam")
+        capture = cv2.VideoCapture(path)
+        frame_count = 0
+        while capture.read()[0]:
+            frame_count += 1
+        capture.release()
+        print(f"  Clip frames: {frame_count}")
+        # ~1 s of pre-roll plus the trigger frame and 0.5 s of post-roll at 10 fps
+        assert 15 <= frame_count <= 18
+        assert recorder.get_stats()["nut/cam"]['clips_saved'] == 1
+
+    print("✅ ClipRecorder test completed")
+
+
+def test_pre_roll_budget():
+    """Test that the pre-roll never exceeds its byte budget."""
+    print("Testing pre-roll memory bound...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with ClipRecorder(tmp_dir, pre_roll_seconds=60.0, fps=30.0, max_pre_roll_bytes=100_000,
+                          max_pending_frames=128) as recorder:
+            rng = np.random.default_rng(0)
+            for i in range(60):
+                frame = rng.integers(0, 255, (240, 320, 3), dtype=np.uint8)
+                recorder.add_frame("cam", frame, timestamp=i / 30)
+            assert wait_for(lambda: recorder._frames.empty())
+            time.sleep(0.05)
+            stats = recorder.get_stats()["cam"]
+            print(f"  Pre-roll: {stats['pre_roll_frames']} frames, {stats['pre_roll_bytes']} bytes")
+            assert 0 < stats['pre_roll_bytes'] <= 100_000
+            assert not stats['recording']
+
+    print("✅ Pre-roll budget test completed")
+
+
+class SlowWriter:
+    """VideoWriter stand-in for a disk that cannot keep up."""
+
+    def __init__(self):
+        self.frames = 0
+
+    def write(self, frame):
+        time.sleep(0.05)
+        self.frames += 1
+
+    def release(self):
+        pass
+
+
+def test_slow_writer_drops_frames():
+    """Test that a slow writer drops clip frames instead of blocking the encoder."""
+    print("Testing slow writer backpressure...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        recorder = ClipRecorder(tmp_dir, pre_roll_seconds=0.5, post_roll_seconds=5.0, fps=10.0,
+                                max_pending_frames=8)
+        writer = SlowWriter()
+        recorder._open_writer = lambda path, shape: writer
+
+        recorder.on_motion_event(MotionEvent("cam", 0.0, 1, 500.0, (320, 240)))
+        start = time.monotonic()
+        for i in range(50):
+            recorder.add_frame("cam", make_frame(i), timestamp=i / 10)
+            time.sleep(0.002)
+        assert wait_for(lambda: recorder._frames.empty(), timeout=2.0), "Encoder should never block"
+        elapsed = time.monotonic() - start
+        stats = recorder.get_stats()["cam"]
+        print(f"  Queued 50 frames in {elapsed:.2f}s, {stats['frames_dropped']} dropped by the writer queue")
+        assert stats['frames_dropped'] > 0
+        recorder.close(timeout=5.0)
+        assert not recorder._writer.is_alive()
+
+    print("✅ Slow writer test completed")
+
+
+def test_writer_survives_bad_frame():
+    """Test that an undecodable frame does not kill the writer thread."""
+    print("Testing writer robustness...")
+
+    saved = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with ClipRecorder(tmp_dir, pre_roll_seconds=0.2, post_roll_seconds=0.3, fps=10.0,
+                          on_clip_saved=lambda cam, path: saved.append(path)) as recorder:
+            recorder._clips.put(("open", 999, ("cam", os.path.join(tmp_dir, "bad.avi"))))
+            recorder._clips.put(("frame", 999, b"not a jpeg"))
+            recorder._clips.put(("close", 999, None))
+
+            recorder.on_motion_event(MotionEvent("cam", 0.0, 1, 500.0, (320, 240)))
+            for i in range(10):
+                recorder.add_frame("cam", make_frame(i), timestamp=i / 10)
+            assert wait_for(lambda: len(saved) == 1)
+            assert recorder._writer.is_alive()
+
+    print("✅ Writer robustness test completed")
+
+
+def test_unopenable_writer_skips_clip():
+    """Test that a clip whose VideoWriter cannot open is skipped, not counted as saved."""
+    print("Testing unopenable writer...")
+
+    saved = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # No OpenCV backend writes this extension, so the writer fails to open
+        with ClipRecorder(tmp_dir, pre_roll_seconds=0.2, post_roll_seconds=0.3, fps=10.0, extension=".nope",
+                          on_clip_saved=lambda cam, path: saved.append(path)) as recorder:
+            recorder.on_motion_event(MotionEvent("cam", 0.0, 1, 500.0, (320, 240)))
+            for i in range(10):
+                recorder.add_frame("cam", make_frame(i), timestamp=i / 10)
+            assert wait_for(lambda: recorder._frames.empty() and recorder._clips.empty())
+            time.sleep(0.1)
+            assert recorder._writer.is_alive()
+
+        stats = recorder.get_stats()["cam"]
+        print(f"  Clips saved: {stats['clips_saved']}, callbacks: {len(saved)}")
+        assert stats['clips_saved'] == 0 and not saved
+
+    print("✅ Unopenable writer test completed")
+
+
+if __name__ == "__main__":
+    test_clip_recorder()
+    test_pre_roll_budget()
+    test_slow_writer_drops_frames()
+    test_writer_survives_bad_frame()
+    test_unopenable_writer_skips_clip()
+    print("\n🎉 All clip_recorder tests passed!")
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test script for event_bus.py
+Tests non-blocking delivery of motion events to subscribers
+"""
+
+import threading
+import time
+import numpy as np
+from nutflix_common.event_bus import MotionEventBus
+from nutflix_common.motion_utils import MotionDetector, MotionConfig, MotionEvent
+
+
+def make_event(camera_id: str, timestamp: float) -> MotionEvent:
+    """Create a minimal motion event."""
+    return MotionEvent(camera_id, timestamp, 1, 500.0, (640, 480))
+
+
+def test_backpressure_policies():
+    """Test that a blocked subscriber drops events without stalling publish()."""
+    print("Testing event bus backpressure...")
+
+    release = threading.Event()
+    fast_events, oldest_events, newest_events = [], [], []
+
+    def slow(events):
+        def callback(event):
+            release.wait(5.0)
+            events.append(event.timestamp)
+        return callback
+
+    with MotionEventBus() as bus:
+        bus.subscribe(fast_events.append, name="fast", max_queue=100)
+        bus.subscribe(slow(oldest_events), name="oldest", max_queue=3, policy="drop_oldest")
+        bus.subscribe(slow(newest_events), name="newest", max_queue=3, policy="drop_newest")
+        nut_only = []
+        bus.subscribe(nut_only.append, name="nut_only", camera_ids=["nut_cam"])
+
+        # Let the slow subscribers pick up (and block on) the first event
+        bus.publish(make_event("critter_cam", 0.0))
+        time.sleep(0.1)
+
+        start = time.perf_counter()
+        for i in range(1, 11):
+            bus.publish(make_event("critter_cam", float(i)))
+        elapsed = time.perf_counter() - start
+        print(f"  Published 10 events in {elapsed * 1000:.2f} ms with two blocked subscribers")
+        assert elapsed < 0.5
+
+        stats = bus.get_stats()
+        print(f"  Stats: {stats}")
+        assert stats["oldest"]["dropped"] == 7 and stats["newest"]["dropped"] == 7
+
+        bus.publish(make_event("nut_cam", 11.0))
+        release.set()
+
+    assert [e.timestamp for e in fast_events] == [float(i) for i in range(12)]
+    assert oldest_events == [0.0, 9.0, 10.0, 11.0]
+    assert newest_events == [0.0, 1.0, 2.0, 3.0]
+    assert [e.camera_id for e in nut_only] == ["nut_cam"]
+
+    print("✅ Backpressure test completed")
+
+
+def test_detector_subscribers():
+    """Test that MotionDetector publishes recorded events to subscribers."""
+    print("Testing MotionDetector subscribers...")
+
+    received = []
+    failing_calls = []
+
+    def failing(event):
+        failing_calls.append(event)
+        raise RuntimeError("subscriber bug")
+
+    detector = MotionDetector(MotionConfig(threshold=300, cooldown=0.0))
+    detector.subscribe(received.append, name="collector")
+    broken = detector.subscribe(failing, name="broken")
+
+    static_frame = np.zeros((240, 320, 3), dtype=np.uint8)
+    motion_frame = static_frame.copy()
+    motion_frame[100:160, 100:160] = 255
+    for _ in range(3):
+        detector.process_frame(static_frame, "cam")
+    assert detector.process_frame(motion_frame, "cam")
+
+    bus = detector.event_bus
+    detector.close()
+    assert detector.event_bus is None
+    assert len(received) == len(detector.get_motion_events("cam"))
+    assert received[-1].largest_contour_area > 300
+    assert broken.errors == len(failing_calls) == len(received)
+    assert bus.get_stats() == {}
+
+    print("✅ Detector subscriber test completed")
+
+
+if __name__ == "__main__":
+    test_backpressure_policies()
+    test_detector_subscribers()
+    print("\n🎉 All event_bus tests passed!")
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test script for event_store.py
+Tests batched SQLite persistence of motion events
+"""
+
+import os
+import tempfile
+import time
+import numpy as np
+from nutflix_common.event_store import MotionEventStore
+from nutflix_common.motion_utils import MotionDetector, MotionConfig, MotionEvent
+
+
+def test_event_store():
+    """Test writing, flushing and querying motion events."""
+    print("Testing MotionEventStore...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "events", "motion.db")
+
+        with MotionEventStore(db_path, batch_size=10, flush_interval=60.0) as store:
+            for i in range(25):
+                camera_id = "critter_cam" if i % 2 else "nut_cam"
+                boxes = np.array([[i, i, 20, 10]], dtype=np.int32)
+                assert store.write(MotionEvent(camera_id, 1000.0 + i, 1, 200.0 + i, (640, 480), boxes))
+
+            assert store.flush(timeout=5.0)
+
+            events = store.query_events("critter_cam", start=1005.0, end=1011.0)
+            print(f"  critter_cam events in range: {[e.timestamp for e in events]}")
+            assert [e.timestamp for e in events] == [1005.0, 1007.0, 1009.0, 1011.0]
+            assert events[0].boxes.tolist() == [[5, 5, 20, 10]]
+            assert events[0].frame_shape == (640, 480)
+
+            counts = store.count_events()
+            print(f"  Counts: {counts}")
+            assert counts == {"critter_cam": 12, "nut_cam": 13}
+            assert store.count_events(start=1020.0) == {"critter_cam": 2, "nut_cam": 3}
+            assert len(store.query_events(limit=3)) == 3
+
+            conn = store._connect()
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            conn.close()
+
+        # Events survive reopening the database
+        with MotionEventStore(db_path) as store:
+            assert sum(store.count_events().values()) == 25
+
+    print("✅ MotionEventStore test completed")
+
+
+def test_detector_event_sink():
+    """Test that MotionDetector forwards recorded events to its sink."""
+    print("Testing MotionDetector event sink...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with MotionEventStore(os.path.join(tmp_dir, "motion.db")) as store:
+            detector = MotionDetector(MotionConfig(threshold=300, cooldown=0.0), event_sink=store)
+
+            static_frame = np.zeros((240, 320, 3), dtype=np.uint8)
+            motion_frame = static_frame.copy()
+            motion_frame[100:160, 100:160] = 255
+            for _ in range(3):
+                detector.process_frame(static_frame, "cam")
+            assert detector.process_frame(motion_frame, "cam")
+
+            store.flush(timeout=5.0)
+            stored = store.query_events("cam")
+            assert len(stored) == detector.get_camera_stats("cam")['motion_events_count']
+            assert stored[-1].largest_contour_area > 300
+
+    print("✅ Event sink test completed")
+
+
+def test_flush_without_writer():
+    """Test that flush() gives up instead of hanging when the writer has stopped."""
+    print("Testing flush with a stopped writer...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = MotionEventStore(os.path.join(tmp_dir, "motion.db"), max_queue=1)
+        store._queue.put(None)           # Stop the writer as if it had died
+        store._writer.join(5.0)
+        assert store.write(MotionEvent("cam", 1000.0, 1, 200.0, (640, 480)))
+
+        begin = time.monotonic()
+        assert store.flush() is False
+        assert store.flush(timeout=0.1) is False
+        print(f"  Flush returned after {time.monotonic() - begin:.3f}s")
+        assert time.monotonic() - begin < 1.0
+        store.close(timeout=0.1)
+
+    print("✅ Stopped writer flush test completed")
+
+
+if __name__ == "__main__":
+    test_event_store()
+    test_detector_event_sink()
+    test_flush_without_writer()
+    print("\n🎉 All event_store tests passed!")
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test script for FramePreprocessor
+Checks the fused cv2/NumPy path against the PIL transform chain
+"""
+
+import json
+import os
+import tempfile
+import numpy as np
+from nutflix_common.ai_bench import _reference_chain, compare_preprocessing, main
+from nutflix_common.ai_utils import IMAGENET_MEAN, IMAGENET_STD, FramePreprocessor
+from nutflix_common.bench import synthetic_frames
+
+
+def test_normalization_and_layout():
+    """Test channel order, normalisation and output layouts."""
+    print("Testing FramePreprocessor normalisation...")
+
+    frame = np.empty((480, 640, 3), dtype=np.uint8)
+    frame[:] = (10, 20, 30)  # BGR
+    expected = (np.array([30, 20, 10], dtype=np.float32) / 255.0 - IMAGENET_MEAN) / IMAGENET_STD
+
+    batch = FramePreprocessor()([frame, frame])
+    assert batch.shape == (2, 3, 224, 224) and batch.dtype == np.float32
+    assert np.allclose(batch[1, :, 100, 100], expected, atol=1e-5)
+
+    nhwc = FramePreprocessor(mean=(0, 0, 0), std=(1, 1, 1), channels_first=False, center_crop=False)([frame])
+    assert nhwc.shape == (1, 224, 224, 3)
+    assert np.allclose(nhwc[0, 5, 5], np.array([30, 20, 10]) / 255.0, atol=1e-6)
+
+    print("✅ Normalisation test completed")
+
+
+def test_buffer_reuse():
+    """Test that batches are written into one preallocated buffer."""
+    print("Testing buffer reuse...")
+
+    preprocessor = FramePreprocessor()
+    frames = list(synthetic_frames(4, 320, 240))
+    first = preprocessor(frames)
+    second = preprocessor(frames[:2])
+    assert np.shares_memory(first, second), "Smaller batches should reuse the buffer"
+    assert preprocessor(frames[:1]).shape == (1, 3, 224, 224)
+
+    print("✅ Buffer reuse test completed")
+
+
+def test_matches_pil_chain():
+    """Test the fused output against the PIL chain, with portrait, landscape and small frames."""
+    reference, name = _reference_chain()
+    if reference is None:
+        print("Pillow not available, skipping PIL comparison")
+        return
+    print(f"Testing against the {name} chain...")
+
+    frames = [frame for size in [(640, 480), (480, 640), (1280, 720), (120, 90)]
+              for frame in synthetic_frames(3, *size)]
+    preprocessor = FramePreprocessor()
+    for frame in frames:
+        difference = np.abs(preprocessor([frame])[0] - reference(frame)).mean()
+        assert difference < 0.05, f"{frame.shape}: mean difference {difference:.4f}"
+
+    report = compare_preprocessing(frames, repeats=1)
+    print(f"  fused {report['fused_ms_per_frame']} ms/frame, {name} {report['reference_ms_per_frame']} ms/frame")
+    assert report['reference'] == name and report['speedup'] > 0
+
+    print("✅ PIL comparison test completed")
+
+
+def test_preprocess_benchmark_cli():
+    """Test nutflix-ai-bench --preprocess-only."""
+    print("Testing preprocessing benchmark CLI...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output = os.path.join(tmp_dir, "preprocess.json")
+        assert main(["--preprocess-only", "--clips", tmp_dir, "--frames", "10", "--output", output]) == 0
+        with open(output, 'r', encoding='utf-8') as file:
+            report = json.load(file)
+    assert report['source'] == "synthetic"
+    assert report['preprocessing']['frames'] == 10
+
+    print("✅ Preprocessing benchmark CLI test completed")
+
+
+if __name__ == "__main__":
+    test_normalization_and_layout()
+    test_buffer_reuse()
+    test_matches_pil_chain()
+    test_preprocess_benchmark_cli()
+    print("\n🎉 All FramePreprocessor tests passed!")
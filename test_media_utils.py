@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Test script for media_utils.py
+Tests expanding clip paths for the offline tools
+"""
+
+import os
+import tempfile
+from nutflix_common.media_utils import find_clips
+
+
+def test_find_clips():
+    """Test that directories expand to their video files and missing paths are skipped."""
+    print("Testing find_clips...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name in ("b.mp4", "a.avi", "notes.txt"):
+            open(os.path.join(tmp_dir, name), 'w').close()
+        single = os.path.join(tmp_dir, "b.mp4")
+
+        clips = find_clips([tmp_dir, single, os.path.join(tmp_dir, "missing.mp4")])
+        print(f"  Found: {[os.path.basename(clip) for clip in clips]}")
+        assert clips == [os.path.join(tmp_dir, "a.avi"), single]
+
+    print("✅ find_clips test completed")
+
+
+if __name__ == "__main__":
+    test_find_clips()
+    print("\n🎉 All media_utils tests passed!")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test script for motion_engine.py
+Tests per-camera worker processes fed through shared memory
+"""
+
+import os
+import signal
+import time
+import numpy as np
+from nutflix_common.motion_engine import MultiprocessMotionEngine
+from nutflix_common.motion_utils import MotionConfig
+
+
+def test_multiprocess_engine():
+    """Test detection, slot back-pressure and worker restarts."""
+    print("Testing MultiprocessMotionEngine...")
+
+    static_frame = np.zeros((240, 320, 3), dtype=np.uint8)
+    motion_frame = static_frame.copy()
+    motion_frame[100:160, 100:160] = 255
+
+    with MultiprocessMotionEngine(MotionConfig(threshold=300, cooldown=0.0)) as engine:
+        for _ in range(3):
+            engine.process_frames({"cam_a": static_frame, "cam_b": static_frame})
+
+        results = engine.process_frames({"cam_a": motion_frame, "cam_b": static_frame, "cam_c": None})
+        print(f"  Results: {results}")
+        assert results == {"cam_a": True, "cam_b": False, "cam_c": False}
+
+        stats = engine.get_camera_stats("cam_a")
+        print(f"  cam_a stats: frames={stats['frames_processed']}, events={stats['motion_events_count']}")
+        assert stats['frames_processed'] >= 3
+        assert stats['motion_events_count'] >= 1
+        assert stats['frames_dropped'] == 0
+
+        # Each camera has two slots; a burst beyond that is dropped, not queued
+        accepted = [engine.submit("cam_b", static_frame) for _ in range(5)]
+        assert accepted[:2] == [True, True] and not any(accepted[2:])
+        deadline = time.monotonic() + 5.0
+        finished = []
+        while len(finished) < 2 and time.monotonic() < deadline:
+            finished.extend(engine.get_results(timeout=0.5))
+        assert len(finished) == 2
+        assert engine.get_camera_stats("cam_b")['frames_dropped'] == 3
+
+        # Results still queued from a replaced worker must not free the new worker's slots
+        assert engine.submit("cam_b", static_frame)
+        old_generation = engine._channels["cam_b"].generation
+        small_frame = np.zeros((120, 160, 3), dtype=np.uint8)
+        assert engine.submit("cam_b", small_frame)  # Shape change restarts the worker
+        channel = engine._channels["cam_b"]
+        assert channel.generation != old_generation
+        assert list(channel.free_slots) == [1]
+        finished = []
+        deadline = time.monotonic() + 5.0
+        while not finished and time.monotonic() < deadline:
+            finished.extend(engine.get_results(timeout=0.5))
+        time.sleep(0.2)
+        finished.extend(engine.get_results())
+        assert [result.sequence for result in finished] == [channel.sequence]
+        assert sorted(channel.free_slots) == [0, 1]
+
+        # A crashed worker is restarted without affecting the other camera
+        pid = engine._channels["cam_a"].process.pid
+        os.kill(pid, signal.SIGKILL)
+        engine._channels["cam_a"].process.join(5.0)
+        results = engine.process_frames({"cam_a": static_frame, "cam_b": motion_frame})
+        print(f"  After restart: {results}")
+        assert engine._channels["cam_a"].process.pid != pid
+        assert engine.get_camera_stats("cam_a")['worker_restarts'] == 1
+        assert results["cam_b"]
+
+    print("✅ MultiprocessMotionEngine test completed")
+
+
+if __name__ == "__main__":
+    test_multiprocess_engine()
+    print("\n🎉 All motion_engine tests passed!")
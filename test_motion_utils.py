@@ -4,7 +4,11 @@ Test script for motion_utils.py
 Tests the MotionDetector class without requiring OpenCV GUI
 """
 
+import cv2
 import numpy as np
+import os
+import tempfile
+import threading
 import time
 from nutflix_common.motion_utils import MotionDetector, MotionConfig, create_motion_detector
 
@@ -70,6 +74,445 @@ def test_motion_detector():
     print("🎉 All motion_utils tests passed!")
     return True
 
+def test_process_frames():
+    """Test batch processing of several cameras on the worker pool."""
+    print("Testing MotionDetector.process_frames...")
+    
+    detector = MotionDetector(MotionConfig(threshold=300, cooldown=0.0))
+    static_frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    motion_frame = static_frame.copy()
+    motion_frame[200:300, 300:400] = 255
+    
+    try:
+        # Let the background models settle on the static scene
+        for _ in range(3):
+            detector.process_frames({"cam_a": static_frame, "cam_b": static_frame, "cam_c": None})
+        events_before = detector.get_camera_stats("cam_a")['motion_events_count']
+        
+        results = detector.process_frames({"cam_a": motion_frame, "cam_b": static_frame, "cam_c": None})
+        print(f"  Results: {results}")
+        assert results == {"cam_a": True, "cam_b": False, "cam_c": False}
+        
+        assert detector.get_camera_stats("cam_a")['motion_events_count'] == events_before + 1
+        assert detector.get_camera_stats("cam_b")['frames_processed'] == 4
+        assert detector.get_camera_stats("cam_c")['frames_processed'] == 0
+    finally:
+        detector.close()
+    
+    print("✅ process_frames test completed")
+
+def test_processing_width():
+    """Test that downscaled detection reports areas in full-resolution units."""
+    print("Testing MotionConfig.processing_width...")
+    
+    static_frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    motion_frame = static_frame.copy()
+    motion_frame[200:300, 300:400] = 255
+    
+    areas = {}
+    for width in (None, 160):
+        detector = MotionDetector(MotionConfig(threshold=300, cooldown=0.0, processing_width=width))
+        for _ in range(3):
+            detector.process_frame(static_frame, "cam")
+        assert detector.process_frame(motion_frame, "cam")
+        areas[width] = detector.get_motion_events("cam")[-1].largest_contour_area
+    
+    print(f"  Largest area full-res={areas[None]:.1f}, 160px={areas[160]:.1f}")
+    assert abs(areas[160] - areas[None]) / areas[None] < 0.25
+    
+    print("✅ processing_width test completed")
+
+def test_adaptive_sampling():
+    """Test that idle cameras drop to reduced sampling and recover on motion."""
+    print("Testing adaptive frame sampling...")
+    
+    config = MotionConfig(threshold=300, cooldown=0.0, adaptive_sampling=True,
+                          idle_after=1.0, idle_sample_interval=4)
+    detector = MotionDetector(config)
+    static_frame = np.zeros((240, 320, 3), dtype=np.uint8)
+    motion_frame = static_frame.copy()
+    motion_frame[100:150, 100:150] = 255
+    
+    # Two seconds of an empty scene at 10 fps
+    timestamp = 0.0
+    for _ in range(20):
+        detector.process_frame(static_frame, "cam", timestamp=timestamp)
+        timestamp += 0.1
+    
+    stats = detector.get_camera_stats("cam")
+    print(f"  Idle: interval={stats['sampling_interval']}, analyzed={stats['frames_analyzed']}, "
+          f"skipped={stats['frames_skipped_idle']}")
+    assert stats['sampling_interval'] == 4
+    assert stats['frames_skipped_idle'] > 0
+    
+    # Motion is picked up within one sampling interval and restores full rate
+    detected = []
+    for _ in range(4):
+        detected.append(detector.process_frame(motion_frame, "cam", timestamp=timestamp))
+        timestamp += 0.1
+    
+    stats = detector.get_camera_stats("cam")
+    assert any(detected)
+    assert stats['sampling_interval'] == 1
+    
+    print("✅ Adaptive sampling test completed")
+
+def test_regions_of_interest():
+    """Test that motion outside a camera's ROI is ignored."""
+    print("Testing per-camera regions of interest...")
+    
+    tray = [[50, 50], [250, 50], [250, 200], [50, 200]]
+    roi_mask = np.zeros((480, 640), dtype=np.uint8)
+    roi_mask[300:450, 400:600] = 255
+    config = MotionConfig(threshold=300, cooldown=0.0,
+                          regions_of_interest={"polygon_cam": tray, "mask_cam": roi_mask})
+    detector = MotionDetector(config)
+    
+    static_frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    inside_frame = static_frame.copy()
+    inside_frame[100:160, 100:160] = 255      # Inside the polygon, outside the mask
+    outside_frame = static_frame.copy()
+    outside_frame[0:40, 300:640] = 255        # Outside both regions
+    
+    for camera_id in ("polygon_cam", "mask_cam"):
+        for _ in range(3):
+            detector.process_frame(static_frame, camera_id)
+    
+    assert not detector.process_frame(outside_frame, "polygon_cam")
+    assert not detector.process_frame(outside_frame, "mask_cam")
+    assert not detector.process_frame(inside_frame, "mask_cam")
+    assert detector.process_frame(inside_frame, "polygon_cam")
+    
+    event = detector.get_motion_events("polygon_cam")[-1]
+    assert event.frame_shape == (640, 480)
+    
+    print("✅ Regions of interest test completed")
+
+def test_component_analysis():
+    """Test connected-component analysis and motion event boxes."""
+    print("Testing connected-component analysis mode...")
+    
+    static_frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    motion_frame = static_frame.copy()
+    motion_frame[200:300, 300:400] = 255
+    
+    # Boxes come back in capture pixels for both modes, even with downscaling and ROI
+    for mode in ("contours", "components"):
+        config = MotionConfig(threshold=300, cooldown=0.0, analysis_mode=mode, processing_width=320,
+                              regions_of_interest={"cam": [[200, 100], [600, 100], [600, 400], [200, 400]]})
+        detector = MotionDetector(config)
+        for _ in range(3):
+            detector.process_frame(static_frame, "cam")
+        assert detector.process_frame(motion_frame, "cam")
+        
+        event = detector.get_motion_events("cam")[-1]
+        x, y, w, h = event.boxes[0]
+        print(f"  {mode}: {event.contour_count} blobs, largest box=({x}, {y}, {w}, {h})")
+        # Allow for the blur spreading the blob edges
+        assert abs(x - 300) <= 10 and abs(y - 200) <= 10
+        assert abs(w - 100) <= 20 and abs(h - 100) <= 20
+    
+    # Noisy masks keep only the largest blobs, largest first
+    detector = MotionDetector(MotionConfig(analysis_mode="components", min_contour_area=4,
+                                           max_contours_to_check=3))
+    fg_mask = np.zeros((100, 100), dtype=np.uint8)
+    for i in range(10):
+        fg_mask[i * 10:i * 10 + 2 + (i % 5), 0:2 + i] = 255
+    motion, info = detector._analyze_components(fg_mask)
+    areas = [w * h for _, _, w, h in info['boxes']]
+    assert info['count'] == 10
+    assert len(areas) == 3 and areas == sorted(areas, reverse=True)
+    assert info['largest_area'] == max(areas)
+    
+    print("✅ Component analysis test completed")
+
+def test_background_backends():
+    """Test that every background backend detects motion and can be chosen per camera."""
+    print("Testing background model backends...")
+    from nutflix_common.background_models import available_backends
+    
+    backends = available_backends()
+    assert {"mog2", "knn", "running_average", "fixed_point"} <= set(backends)
+    
+    config = MotionConfig(threshold=300, cooldown=0.0, camera_backends={b: b for b in backends})
+    detector = MotionDetector(config)
+    
+    static_frame = np.full((240, 320, 3), 60, dtype=np.uint8)
+    motion_frame = static_frame.copy()
+    motion_frame[100:160, 100:160] = 220
+    
+    for backend in backends:
+        results = [detector.process_frame(static_frame, backend) for _ in range(10)]
+        motion = detector.process_frame(motion_frame, backend)
+        stats = detector.get_camera_stats(backend)
+        print(f"  {backend}: settled={not any(results[-3:])}, motion={motion}")
+        assert stats['background_backend'] == backend
+        assert not any(results[-3:])
+        assert motion
+    
+    # Unknown backends fall back to MOG2
+    detector = MotionDetector(MotionConfig(background_backend="nope"))
+    detector.process_frame(static_frame, "cam")
+    assert detector.get_camera_stats("cam")['background_backend'] == "mog2"
+    
+    print("✅ Background backends test completed")
+
+def test_event_ring_buffer():
+    """Test the fixed-capacity motion event history and time-range queries."""
+    print("Testing motion event ring buffer...")
+    from nutflix_common.motion_utils import MotionEvent, MotionEventBuffer
+    
+    buffer = MotionEventBuffer("cam", capacity=5, max_boxes=2)
+    for i in range(8):
+        boxes = np.array([[i, i, 10, 10], [0, 0, 5, 5], [1, 1, 2, 2]], dtype=np.int32)
+        buffer.append(MotionEvent("cam", float(i), 3, 100.0 + i, (640, 480), boxes))
+    
+    assert len(buffer) == 5 and buffer.total == 8
+    events = buffer.query()
+    assert [e.timestamp for e in events] == [3.0, 4.0, 5.0, 6.0, 7.0]
+    assert events[-1].largest_contour_area == 107.0
+    assert events[0].boxes.tolist() == [[3, 3, 10, 10], [0, 0, 5, 5]]
+    assert [e.timestamp for e in buffer.query(4.5, 6.0)] == [5.0, 6.0]
+    assert len(buffer.query(start=100.0)) == 0
+    assert [e.timestamp for e in events[1:3]] == [4.0, 5.0]
+    
+    # Detector history honours the configured capacity
+    detector = MotionDetector(MotionConfig(threshold=300, cooldown=0.0, event_history_size=3))
+    for i in range(10):
+        frame = np.zeros((120, 160, 3), dtype=np.uint8)
+        frame[40:80, i * 12:i * 12 + 40] = 255    # Square moving across the frame
+        detector.process_frame(frame, "cam", timestamp=float(i))
+    
+    stats = detector.get_camera_stats("cam")
+    recent = detector.get_motion_events("cam", since_timestamp=8.0)
+    print(f"  Stored={stats['motion_events_count']}, total={stats['motion_events_total']}, recent={len(recent)}")
+    assert stats['motion_events_count'] == 3
+    assert stats['motion_events_total'] > 3
+    assert all(e.timestamp >= 8.0 for e in recent)
+    assert len(detector.get_motion_events("unknown")) == 0
+    
+    print("✅ Event ring buffer test completed")
+
+def test_motion_heatmap():
+    """Test that the heatmap concentrates where motion happens."""
+    print("Testing motion heatmap...")
+    
+    config = MotionConfig(cooldown=0.0, heatmap_enabled=True, heatmap_width=32, heatmap_decay=0.1)
+    detector = MotionDetector(config)
+    assert detector.get_heatmap("cam") is None
+    
+    rng = np.random.default_rng(0)
+    for i in range(40):
+        frame = np.zeros((240, 320, 3), dtype=np.uint8)
+        x = int(rng.integers(20, 80))
+        frame[40:100, x:x + 40] = 255    # Activity jitters around the top-left
+        detector.process_frame(frame, "cam")
+    
+    heatmap = detector.get_heatmap("cam")
+    assert heatmap.shape == (24, 32) and heatmap.dtype == np.uint8
+    assert heatmap.max() == 255
+    row, col = np.unravel_index(np.argmax(heatmap), heatmap.shape)
+    print(f"  Hottest cell: row={row}, col={col}")
+    assert row < 12 and col < 16
+    assert heatmap[20:, 20:].max() < 64
+    
+    colored = detector.get_heatmap("cam", size=(320, 240), colormap=cv2.COLORMAP_JET)
+    assert colored.shape == (240, 320, 3)
+    
+    print("✅ Motion heatmap test completed")
+
+def test_reused_buffers():
+    """Test that work buffers are kept per camera and only reallocated on shape changes."""
+    print("Testing reusable work buffers...")
+    
+    detector = MotionDetector(MotionConfig(cooldown=0.0, processing_width=160))
+    frame = np.zeros((240, 320, 3), dtype=np.uint8)
+    
+    detector.process_frame(frame, "cam")
+    buffers = detector._buffers["cam"]
+    assert buffers.blurred.shape == (120, 160)
+    detector.process_frame(frame, "cam")
+    assert detector._buffers["cam"] is buffers
+    
+    detector.process_frame(np.zeros((480, 640, 3), dtype=np.uint8), "cam")
+    assert detector._buffers["cam"] is not buffers
+    
+    # Results match the allocating path
+    results = []
+    for reuse in (True, False):
+        detector = MotionDetector(MotionConfig(threshold=300, cooldown=0.0, reuse_buffers=reuse))
+        for _ in range(3):
+            detector.process_frame(frame, "cam")
+        moved = frame.copy()
+        moved[100:160, 100:160] = 255
+        detector.process_frame(moved, "cam")
+        results.append(detector.get_motion_events("cam")[-1].largest_contour_area)
+    assert results[0] == results[1]
+    
+    print("✅ Reusable buffers test completed")
+
+def test_grid_mode():
+    """Test the grid motion-energy analysis mode."""
+    print("Testing grid analysis mode...")
+    
+    config = MotionConfig(threshold=300, cooldown=0.0, analysis_mode="grid", grid_size=(4, 4))
+    detector = MotionDetector(config)
+    assert detector.get_motion_grid("cam") is None
+    
+    static_frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    motion_frame = static_frame.copy()
+    motion_frame[0:120, 480:640] = 255       # Exactly the top-right cell
+    for _ in range(3):
+        detector.process_frame(static_frame, "cam")
+    assert not detector.process_frame(static_frame, "cam")
+    assert detector.get_motion_grid("cam").max() == 0
+    
+    assert detector.process_frame(motion_frame, "cam")
+    grid = detector.get_motion_grid("cam")
+    print(f"  Grid:\n{np.round(grid, 2)}")
+    assert grid.shape == (4, 4) and grid.dtype == np.float32
+    assert np.unravel_index(np.argmax(grid), grid.shape) == (0, 3)
+    assert grid[0, 3] > 0.8 and grid[2:, :2].max() == 0
+    
+    event = detector.get_motion_events("cam")[-1]
+    assert tuple(event.boxes[0]) == (480, 0, 160, 120)
+    
+    print("✅ Grid mode test completed")
+
+def test_warm_start():
+    """Test priming a new background model from saved reference frames."""
+    print("Testing background warm start...")
+    
+    rng = np.random.default_rng(0)
+    scene = cv2.GaussianBlur(rng.integers(0, 255, (240, 320, 3), dtype=np.uint8), (21, 21), 0)
+    motion_frame = scene.copy()
+    motion_frame[100:160, 100:160] = 255
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config = MotionConfig(threshold=300, cooldown=0.0, warm_start_dir=tmp_dir,
+                              warm_start_frames=3, warm_start_interval=1.0)
+        detector = MotionDetector(config)
+        write_threads = []
+        write_reference_frame = detector._write_reference_frame
+        def record_thread(*args):
+            write_threads.append(threading.current_thread().name)
+            return write_reference_frame(*args)
+        detector._write_reference_frame = record_thread
+        for i in range(30):
+            detector.process_frame(scene, "cam/1", timestamp=1000.0 + i * 0.1)
+        detector._reference_saves["cam/1"].result(timeout=5.0)
+        # PNG writes run on the reference writer thread, never on the detection thread
+        assert write_threads and all(name.startswith("nutflix-reference") for name in write_threads)
+        saved = sorted(os.listdir(os.path.join(tmp_dir, "cam_1")))
+        print(f"  Reference frames after 3s: {saved}")
+        assert saved == ["reference_00.png", "reference_01.png"]
+        detector.close()
+        assert len(os.listdir(os.path.join(tmp_dir, "cam_1"))) == 3
+        
+        # A cold MOG2 model flags its first frame as motion, a warm one does not
+        cold = MotionDetector(MotionConfig(threshold=300, cooldown=0.0))
+        assert cold.process_frame(scene, "cam/1")
+        
+        warm = MotionDetector(config)
+        assert not warm.process_frame(scene, "cam/1")
+        assert warm.get_camera_stats("cam/1")['warm_started']
+        assert warm.process_frame(motion_frame, "cam/1")
+        
+        # Reference frames from a different resolution are ignored
+        other = MotionDetector(config)
+        other.process_frame(cv2.resize(scene, (160, 120)), "cam/1")
+        assert not other.get_camera_stats("cam/1")['warm_started']
+    
+    print("✅ Warm start test completed")
+
+def test_stage_timings():
+    """Test per-stage latency histograms in the camera stats."""
+    print("Testing stage timings...")
+    
+    from nutflix_common.latency import LatencyHistogram
+    histogram = LatencyHistogram()
+    assert histogram.percentile(0.5) is None
+    for ms in range(1, 101):
+        histogram.record(ms / 1000)
+    summary = histogram.summary()
+    print(f"  Histogram of 1..100 ms: {summary}")
+    assert summary['count'] == 100 and summary['max_ms'] == 100.0
+    assert 50 <= summary['p50_ms'] <= 50 * 1.26
+    assert 95 <= summary['p95_ms'] <= 100
+    
+    detector = MotionDetector(MotionConfig(threshold=300, cooldown=0.0))
+    static_frame = np.zeros((240, 320, 3), dtype=np.uint8)
+    motion_frame = static_frame.copy()
+    motion_frame[100:160, 100:160] = 255
+    for _ in range(5):
+        detector.process_frame(static_frame, "cam")
+    detector.process_frame(motion_frame, "cam")
+    
+    timing = detector.get_camera_stats("cam")['timing']
+    print(f"  Total: {timing['total']}, throughput {timing['throughput_fps']} fps")
+    for stage in ('preprocess', 'background', 'analysis', 'total'):
+        assert timing[stage]['count'] == 6
+        assert timing[stage]['p50_ms'] <= timing[stage]['p95_ms'] <= timing[stage]['p99_ms']
+    assert timing['record']['count'] == 2    # MOG2's first frame plus the moving square
+    assert timing['total']['mean_ms'] >= timing['background']['mean_ms']
+    assert timing['throughput_fps'] > 0
+    
+    # A frame that fails mid-pipeline still closes its timing, so totals match the stages
+    def fail(*args, **kwargs):
+        raise RuntimeError("analysis failed")
+    detector._analyze_foreground = fail
+    assert not detector.process_frame(motion_frame, "cam")
+    timing = detector.get_camera_stats("cam")['timing']
+    assert timing['background']['count'] == timing['total']['count'] == 7
+    
+    untimed = MotionDetector(MotionConfig(collect_timings=False))
+    untimed.process_frame(static_frame, "cam")
+    assert untimed.get_camera_stats("cam")['timing'] is None
+    
+    print("✅ Stage timings test completed")
+
+def test_lighting_change():
+    """Test that frame-wide brightness changes are not reported as motion."""
+    print("Testing lighting change fast path...")
+    
+    rng = np.random.default_rng(1)
+    scene = cv2.GaussianBlur(rng.integers(0, 200, (240, 320, 3), dtype=np.uint8), (21, 21), 0)
+    brighter = cv2.add(scene, 50)
+    
+    results = {}
+    for lighting_check in (False, True):
+        detector = MotionDetector(MotionConfig(threshold=300, cooldown=0.0, lighting_check=lighting_check,
+                                               lighting_adapt_frames=10))
+        for _ in range(20):
+            detector.process_frame(scene, "cam")
+        results[lighting_check] = detector.process_frame(brighter, "cam")
+    print(f"  Brightness step reported as motion: without check={results[False]}, with check={results[True]}")
+    assert results[False] and not results[True]
+    
+    stats = detector.get_camera_stats("cam")
+    assert stats['lighting_changes'] == 1
+    assert stats['last_lighting_change_timestamp'] is not None
+    
+    # Re-adapting frames are skipped, then detection resumes under the new lighting
+    assert not any(detector.process_frame(brighter, "cam") for _ in range(10))
+    assert not detector.process_frame(brighter, "cam")
+    critter = brighter.copy()
+    critter[40:200, 20:140] = 255        # A large blob (25% of the frame) is still motion
+    assert detector.process_frame(critter, "cam")
+    assert detector.get_camera_stats("cam")['lighting_changes'] == 1
+    
+    # Off by default: an animal right in front of the lens filling most of the view is still motion
+    assert not MotionConfig().lighting_check
+    detector = MotionDetector(MotionConfig(threshold=300, cooldown=0.0))
+    for _ in range(20):
+        detector.process_frame(scene, "cam")
+    close_up = scene.copy()
+    close_up[5:235, 10:310] = 230
+    assert detector.process_frame(close_up, "cam")
+    assert detector.get_camera_stats("cam")['lighting_changes'] == 0
+    
+    print("✅ Lighting change test completed")
+
 def test_imports():
     """Test that motion utilities can be imported from nutflix_common."""
     print("Testing imports...")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test script for the ONNX ImageClassifier backend
+Builds a tiny MobileNet-shaped ONNX model so no download or torch is needed
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import numpy as np
+from nutflix_common.ai_utils import ONNXRUNTIME_AVAILABLE, ImageClassifier, load_model
+
+try:
+    import onnx
+    from onnx import TensorProto, helper
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+
+def write_test_model(path, batch="batch", classes=1000):
+    """Write an (N, 3, 224, 224) -> (N, classes) logits model: channel means times fixed weights."""
+    rng = np.random.default_rng(0)
+    weights = rng.normal(size=(classes, 3)).astype(np.float32)
+    graph = helper.make_graph(
+        [helper.make_node("GlobalAveragePool", ["input"], ["pooled"]),
+         helper.make_node("Flatten", ["pooled"], ["flat"]),
+         helper.make_node("Gemm", ["flat", "weights"], ["logits"], transB=1)],
+        "test_classifier",
+        [helper.make_tensor_value_info("input", TensorProto.FLOAT, [batch, 3, 224, 224])],
+        [helper.make_tensor_value_info("logits", TensorProto.FLOAT, [batch, classes])],
+        [helper.make_tensor("weights", TensorProto.FLOAT, weights.shape, weights.flatten())])
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 8
+    onnx.save(model, path)
+
+
+def test_missing_model_file():
+    """Test that a missing ONNX file fails cleanly."""
+    print("Testing missing ONNX model...")
+
+    assert load_model("onnx", model_path="/nonexistent/mobilenet_v2.onnx") is None
+    classifier = ImageClassifier(model_type="onnx")
+    assert classifier.classify_frame(np.zeros((10, 10, 3), dtype=np.uint8)) == ("error", 0.0)
+
+    print("✅ Missing model test completed")
+
+
+def test_import_is_lightweight():
+    """Test that importing the package does not import the ML frameworks."""
+    print("Testing nutflix_common import cost...")
+
+    code = "import sys, nutflix_common; print(sorted({'torch', 'tensorflow'} & set(sys.modules)))"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == "[]", output.stdout
+
+    print("✅ Import test completed")
+
+
+def test_onnx_backends():
+    """Test both ONNX backends against each other and without importing torch."""
+    if not ONNX_AVAILABLE:
+        print("onnx not installed, skipping ONNX backend test")
+        return
+    print("Testing ONNX backends...")
+
+    rng = np.random.default_rng(1)
+    frames = [rng.integers(0, 255, (h, w, 3), dtype=np.uint8) for h, w in [(480, 640), (90, 120), (224, 224)]]
+    backends = ["opencv"] + (["onnxruntime"] if ONNXRUNTIME_AVAILABLE else [])
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "model.onnx")
+        write_test_model(path)
+
+        results = {}
+        for backend in backends:
+            classifier = ImageClassifier(model_type="onnx", device="cpu", model_path=path, onnx_backend=backend)
+            assert classifier.load_model(), f"{backend} failed to load"
+            results[backend] = classifier.classify_batch(frames, top_k=3)
+            print(f"  {backend}: {results[backend][0]}")
+
+            assert len(results[backend]) == 3 and all(len(top) == 3 for top in results[backend])
+            for frame, top in zip(frames, results[backend]):
+                label, confidence = classifier.classify_frame(frame)
+                assert top[0][0] == label and abs(top[0][1] - confidence) < 1e-4
+                assert 0.0 < top[2][1] <= top[1][1] <= top[0][1] <= 1.0
+
+        for top_a, top_b in zip(*results.values()):
+            assert [label for label, _ in top_a] == [label for label, _ in top_b]
+
+        if ONNXRUNTIME_AVAILABLE:
+            # A model exported with a fixed batch of 1 is run one frame at a time
+            fixed_path = os.path.join(tmp_dir, "fixed.onnx")
+            write_test_model(fixed_path, batch=1)
+            classifier = ImageClassifier(model_type="onnx", model_path=fixed_path, onnx_backend="onnxruntime")
+            assert classifier.load_model()
+            assert classifier.classify_batch(frames, top_k=3) == results["onnxruntime"]
+
+    print("✅ ONNX backend test completed")
+
+
+if __name__ == "__main__":
+    test_missing_model_file()
+    test_import_is_lightweight()
+    test_onnx_backends()
+    print("\n🎉 All ONNX classifier tests passed!")
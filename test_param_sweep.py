@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test script for param_sweep.py
+Tests replaying a recorded clip through several MotionConfig variants
+"""
+
+import os
+import tempfile
+import cv2
+import numpy as np
+import yaml
+from nutflix_common.param_sweep import (
+    build_variants, main, parse_param, pick_cheapest, run_sweep, score_events
+)
+
+
+def write_clip(path: str, fps: float = 20.0) -> None:
+    """Write a 3 second clip with a square moving through it between 1.0s and 1.5s."""
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), fps, (160, 120))
+    for i in range(int(3 * fps)):
+        frame = np.full((120, 160, 3), 40, dtype=np.uint8)
+        if fps <= i < 1.5 * fps:
+            x = 10 + (i - int(fps)) * 8
+            frame[40:80, x:x + 40] = 230
+        writer.write(frame)
+    writer.release()
+
+
+def test_parse_and_variants():
+    """Test sweep argument parsing and grid expansion."""
+    print("Testing sweep grid...")
+
+    assert parse_param("threshold=[300, 500]") == ("threshold", [300, 500])
+    assert parse_param("cooldown=1.5") == ("cooldown", [1.5])
+    assert parse_param("gaussian_blur_kernel=[[11, 11], [21, 21]]")[1] == [[11, 11], [21, 21]]
+    for bad in ("threshold", "not_a_field=[1]"):
+        try:
+            parse_param(bad)
+            assert False, f"{bad} should be rejected"
+        except ValueError:
+            pass
+
+    variants = build_variants({'cooldown': 0.0}, {'threshold': [1, 2, 3], 'sensitivity': [10, 20]})
+    assert len(variants) == 6
+    assert all(v['cooldown'] == 0.0 for v in variants)
+
+    assert score_events([0.0, 1.2, 1.4, 2.9], [[1.0, 1.5], [2.0, 2.5]]) == (2, 1)
+    assert score_events([], [[1.0, 1.5]]) == (0, 0)
+
+    print("✅ Sweep grid test completed")
+
+
+def test_run_sweep():
+    """Test a parallel sweep over a synthetic clip with ground truth."""
+    print("Testing parameter sweep...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        clip = os.path.join(tmp_dir, "clip.avi")
+        write_clip(clip)
+
+        variants = build_variants({'cooldown': 0.0}, {'threshold': [300, 10 ** 7]})
+        results = run_sweep(variants, [clip], ['threshold'], ground_truth={"clip.avi": [[1.0, 1.5]]},
+                            workers=2)
+        for result in results:
+            print(f"  {result.params}: {result.events} events, recall {result.recall}, "
+                  f"{result.mean_latency_ms:.2f} ms/frame")
+
+        sensitive, blind = results
+        assert sensitive.frames == blind.frames == 60
+        assert sensitive.events > 0 and sensitive.recall == 1.0
+        assert blind.recall == 0.0
+        assert sensitive.mean_latency_ms > 0
+        assert pick_cheapest(results, min_recall=1.0) is sensitive
+
+    print("✅ Parameter sweep test completed")
+
+
+def test_sweep_ignores_warm_start_dir():
+    """Test that a production config's warm start directory is left alone."""
+    print("Testing sweep with a warm start config...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        write_clip(os.path.join(tmp_dir, "clip.avi"))
+        reference_dir = os.path.join(tmp_dir, "background")
+        config_path = os.path.join(tmp_dir, "config.yaml")
+        with open(config_path, 'w', encoding='utf-8') as file:
+            yaml.safe_dump({'motion_detection': {'warm_start_dir': reference_dir}}, file)
+        assert main(["--clips", tmp_dir, "--config", config_path, "--param", "threshold=[300]",
+                     "--workers", "1"]) == 0
+        assert not os.path.exists(reference_dir), "Sweep must not write reference frames"
+
+    print("✅ Warm start isolation test completed")
+
+
+if __name__ == "__main__":
+    test_parse_and_variants()
+    test_run_sweep()
+    test_sweep_ignores_warm_start_dir()
+    print("\n🎉 All param_sweep tests passed!")
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test script for INT8 classification support
+Runs the FP32/INT8 comparison only when PyTorch is installed
+"""
+
+import os
+import tempfile
+import cv2
+import numpy as np
+from nutflix_common.ai_bench import compare_precisions, main, top1_agreement
+from nutflix_common.ai_utils import TORCH_AVAILABLE, ImageClassifier, calibration_key, load_calibration_frames
+
+
+def write_clip(path: str, frames: int = 30) -> None:
+    """Write a short clip whose brightness encodes the frame index."""
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 10.0, (160, 120))
+    for i in range(frames):
+        writer.write(np.full((120, 160, 3), 5 * i, dtype=np.uint8))
+    writer.release()
+
+
+def test_precision_validation():
+    """Test that INT8 is only accepted for PyTorch and always runs on CPU."""
+    print("Testing precision validation...")
+
+    assert not ImageClassifier(model_type="onnx", precision="int8").load_model()
+    assert not ImageClassifier(model_type="torch", precision="int4").load_model()
+    assert ImageClassifier(model_type="torch", device="cuda", precision="int8").device == "cpu"
+
+    print("✅ Precision validation test completed")
+
+
+def test_calibration_frames():
+    """Test sampling calibration frames evenly across clips."""
+    print("Testing calibration frame sampling...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        write_clip(os.path.join(tmp_dir, "a.avi"))
+        write_clip(os.path.join(tmp_dir, "b.avi"))
+        frames = load_calibration_frames([tmp_dir], count=7)
+        assert len(frames) == 7
+        assert frames[0].shape == (120, 160, 3)
+        # First clip gets 4 frames spread from its start to its end
+        brightness = [int(frame.mean()) for frame in frames[:4]]
+        assert brightness[0] < 10 and brightness[-1] > 130, brightness
+        assert load_calibration_frames([os.path.join(tmp_dir, "missing")], count=5) == []
+
+    print("✅ Calibration frame test completed")
+
+
+def test_calibration_key():
+    """Test that the INT8 cache key changes with the calibration set."""
+    print("Testing calibration cache key...")
+
+    frames = [np.full((48, 64, 3), i, dtype=np.uint8) for i in range(4)]
+    key = calibration_key(frames)
+    assert key.startswith("4x") and key == calibration_key([frame.copy() for frame in frames])
+    assert calibration_key(frames[:3]) != key
+    changed = [frame.copy() for frame in frames]
+    changed[2][0, 0, 0] = 255
+    assert calibration_key(changed) != key
+
+    print("✅ Calibration key test completed")
+
+
+def test_top1_agreement():
+    """Test the agreement metric used by the benchmark."""
+    a = [[("cat", 0.9)], [("dog", 0.8)], [("bird", 0.5)], [("cat", 0.4)]]
+    b = [[("cat", 0.7)], [("cat", 0.6)], [("bird", 0.5)], [("cat", 0.9)]]
+    assert top1_agreement(a, b) == 0.75
+    assert top1_agreement([], []) == 0.0
+
+
+def test_int8_benchmark():
+    """Test FP32 vs INT8 on a few frames (PyTorch only)."""
+    if not TORCH_AVAILABLE:
+        print("PyTorch not available, skipping INT8 benchmark")
+        assert main(["--frames", "4"]) == 1
+        return
+    print("Testing FP32 vs INT8 benchmark...")
+
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 255, (240, 320, 3), dtype=np.uint8) for _ in range(8)]
+    with tempfile.TemporaryDirectory() as cache_dir:
+        report = compare_precisions(frames[4:], calibration_frames=frames[:4], cache_dir=cache_dir)
+        assert os.listdir(cache_dir), "Quantized weights should be cached"
+        cached = ImageClassifier(model_type="torch", precision="int8", calibration_frames=frames[:4],
+                                 cache_dir=cache_dir)
+        assert cached.load_model()
+    print(f"  speedup {report['speedup']}x, top-1 agreement {report['top1_agreement']}")
+    assert report['quantization'] == "static"
+    assert 0.0 <= report['top1_agreement'] <= 1.0
+    assert report['int8']['frames'] == 4
+
+    print("✅ INT8 benchmark test completed")
+
+
+if __name__ == "__main__":
+    test_precision_validation()
+    test_calibration_frames()
+    test_calibration_key()
+    test_top1_agreement()
+    test_int8_benchmark()
+    print("\n🎉 All quantized classifier tests passed!")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script for tracker.py
+Tests associating motion boxes across frames into tracks
+"""
+
+import numpy as np
+from nutflix_common.motion_utils import MotionDetector, MotionConfig, MotionEvent
+from nutflix_common.tracker import CentroidTracker, MotionTracker, iou_matrix
+
+
+def test_iou_matrix():
+    """Test the vectorized IoU computation."""
+    print("Testing IoU matrix...")
+
+    a = np.array([[0, 0, 10, 10], [100, 100, 10, 10]])
+    b = np.array([[5, 0, 10, 10], [0, 0, 10, 10], [50, 50, 5, 5]])
+    iou = iou_matrix(a, b)
+    assert iou.shape == (2, 3)
+    assert np.isclose(iou[0, 0], 50 / 150)
+    assert iou[0, 1] == 1.0 and iou[0, 2] == 0.0 and iou[1].max() == 0.0
+
+    print("✅ IoU matrix test completed")
+
+
+def test_centroid_tracker():
+    """Test stable IDs, crossing blobs and enter/exit timestamps."""
+    print("Testing CentroidTracker...")
+
+    entered, exited = [], []
+    tracker = CentroidTracker("feeder", max_distance=50, max_idle_seconds=1.0,
+                              on_enter=entered.append, on_exit=exited.append)
+
+    # Two blobs moving towards each other 20 px per frame, one jumping into view later
+    for frame in range(5):
+        t = 100.0 + frame * 0.1
+        boxes = np.array([[10 + 20 * frame, 50, 30, 30], [200 - 20 * frame, 120, 30, 30]])
+        if frame >= 3:
+            boxes = np.vstack([boxes, [400, 300, 40, 40]])
+        current = tracker.update(boxes, t)
+        print(f"  Frame {frame}: track IDs {[track.track_id for track in current]}")
+        assert [track.track_id for track in current][:2] == [1, 2]
+
+    assert [track.track_id for track in entered] == [1, 2, 3]
+    assert entered[2].enter_timestamp == 100.3
+    assert tracker.active_tracks[0].hits == 5
+
+    # Only blob 1 keeps moving; the others expire after a second without sightings
+    tracker.update(np.array([[110, 50, 30, 30]]), 101.0)
+    tracker.update(np.array([[130, 50, 30, 30]]), 101.5)
+    assert sorted(track.track_id for track in exited) == [2, 3]
+    assert all(not track.active for track in exited)
+    assert exited[0].exit_timestamp == 100.4
+
+    # A box too far from every track starts a new one
+    assert tracker.update(np.array([[600, 400, 20, 20]]), 101.6)[0].track_id == 4
+
+    closed = tracker.close()
+    assert sorted(track.track_id for track in closed) == [1, 4]
+    assert tracker.active_tracks == []
+    assert exited[-1].duration >= 0
+
+    print("✅ CentroidTracker test completed")
+
+
+def test_motion_tracker_subscriber():
+    """Test tracking a moving blob from MotionDetector events."""
+    print("Testing MotionTracker as a detector subscriber...")
+
+    tracker = MotionTracker(max_distance=60, max_idle_seconds=2.0)
+    detector = MotionDetector(MotionConfig(threshold=300, cooldown=0.0, analysis_mode="components",
+                                           min_contour_area=500))
+    detector.subscribe(tracker.handle_event, name="tracker")
+
+    static_frame = np.zeros((240, 320, 3), dtype=np.uint8)
+    for i in range(3):
+        detector.process_frame(static_frame, "cam", timestamp=10.0 + i * 0.1)
+    tracker.close()  # Forget MOG2's all-foreground first frame
+
+    for i in range(6):
+        frame = static_frame.copy()
+        frame[100:140, 20 + 15 * i:60 + 15 * i] = 255
+        assert detector.process_frame(frame, "cam", timestamp=11.0 + i * 0.1)
+    detector.close()
+
+    tracks = tracker.get_active_tracks("cam")
+    print(f"  Tracks: {[(t.track_id, t.hits, round(t.duration, 2)) for t in tracks]}")
+    assert len(tracks) == 1 and tracks[0].hits == 6
+    assert tracks[0].enter_timestamp == 11.0
+    assert tracker.get_active_tracks("other_cam") == []
+
+    exited = tracker.expire(20.0)
+    assert len(exited) == 1 and exited[0].exit_timestamp == 11.5
+
+    print("✅ MotionTracker test completed")
+
+
+if __name__ == "__main__":
+    test_iou_matrix()
+    test_centroid_tracker()
+    test_motion_tracker_subscriber()
+    print("\n🎉 All tracker tests passed!")